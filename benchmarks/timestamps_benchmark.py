@@ -0,0 +1,73 @@
+"""
+sync date decoding, the regex parser it replaced against the slicing and
+native ISO fast paths and the per vehicle memo
+
+    python benchmarks/timestamps_benchmark.py
+"""
+
+import importlib.util
+import re
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+# loaded by path, the package itself needs home assistant
+MODULE_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "custom_components"
+    / "ha_kia_hyundai"
+    / "timestamps.py"
+)
+spec = importlib.util.spec_from_file_location("timestamps", MODULE_PATH)
+timestamps = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(timestamps)
+
+COMPACT = "20211205143211"
+ISO = "2021-12-05T14:32:11Z"
+NUMBER = 200_000
+
+
+def regex_compact(last_updated_str: str) -> datetime:
+    m = re.match(
+        r"(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})",
+        last_updated_str,
+    )
+    return datetime(
+        year=int(m.group(1)),
+        month=int(m.group(2)),
+        day=int(m.group(3)),
+        hour=int(m.group(4)),
+        minute=int(m.group(5)),
+        second=int(m.group(6)),
+        tzinfo=timezone.utc,
+    )
+
+
+def regex_iso(value: str) -> datetime:
+    return regex_compact(
+        value.replace("-", "").replace("T", "").replace(":", "").replace("Z", "")
+    )
+
+
+def main() -> None:
+    assert regex_compact(COMPACT) == timestamps.decode_compact(COMPACT)
+    assert regex_iso(ISO) == timestamps.decode_iso(ISO)
+
+    memo = timestamps.TimestampMemo()
+    cases = [
+        ("compact, regex", lambda: regex_compact(COMPACT)),
+        ("compact, slicing", lambda: timestamps.decode_compact(COMPACT)),
+        (
+            "compact, memo hit",
+            lambda: memo.decode(COMPACT, timestamps.decode_compact),
+        ),
+        ("iso, replace + regex", lambda: regex_iso(ISO)),
+        ("iso, fromisoformat", lambda: timestamps.decode_iso(ISO)),
+    ]
+    for name, case in cases:
+        seconds = min(timeit.repeat(case, number=NUMBER, repeat=5))
+        print(f"{name:<24}{seconds / NUMBER * 1e9:>10.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ import logging
 
 import voluptuous as vol
 import asyncio
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from homeassistant.core import HomeAssistant
 from homeassistant.const import (
@@ -10,14 +10,14 @@ from homeassistant.const import (
     CONF_PASSWORD,
     CONF_USERNAME,
     CONF_REGION,
+    EVENT_HOMEASSISTANT_STOP,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers import device_registry as dr
 import homeassistant.helpers.config_validation as cv
 from aiohttp.client_exceptions import ClientError
-from asyncio import sleep
 
 from .const import (
     DOMAIN,
@@ -25,6 +25,13 @@ from .const import (
     DATA_VEHICLE_INSTANCE,
     DATA_CONFIG_UPDATE_LISTENER,
     DATA_VEHICLE_LISTENER,
+    DATA_API_CLOUD_REGISTRY,
+    DATA_POLL_SCHEDULER,
+    DATA_STORAGE,
+    DATA_SETUP_SEMAPHORE,
+    DATA_GEOCODER,
+    DATA_KNOWN_PLACES,
+    MAX_CONCURRENT_SETUPS,
     DEFAULT_SCAN_INTERVAL,
     CONF_FORCE_SCAN_INTERVAL,
     CONF_NO_FORCE_SCAN_HOUR_FINISH,
@@ -34,6 +41,11 @@ from .const import (
     DEFAULT_NO_FORCE_SCAN_HOUR_FINISH,
     DEFAULT_NO_FORCE_SCAN_HOUR_START,
     DEFAULT_FORCE_SCAN_INTERVAL,
+    CONF_RETAIN_RAW_RESPONSES,
+    DEFAULT_RETAIN_RAW_RESPONSES,
+    CONF_CONFIRM_COMMANDS,
+    DEFAULT_CONFIRM_COMMANDS,
+    CONF_DAILY_REQUEST_LIMIT,
     CONF_BRAND,
     REGION_CANADA,
     CONF_PIN,
@@ -46,6 +58,8 @@ from .const import (
     SERVICE_NAME_START_CHARGE,
     SERVICE_NAME_STOP_CHARGE,
     SERVICE_NAME_SET_CHARGE_LIMITS,
+    SERVICE_NAME_ADD_NAMED_PLACE,
+    SERVICE_NAME_REMOVE_NAMED_PLACE,
     SERVICE_ATTRIBUTE_TEMPERATURE,
     SERVICE_ATTRIBUTE_DEFROST,
     SERVICE_ATTRIBUTE_CLIMATE,
@@ -53,8 +67,20 @@ from .const import (
     SERVICE_ATTRIBUTE_DURATION,
     SERVICE_ATTRIBUTE_AC_LIMIT,
     SERVICE_ATTRIBUTE_DC_LIMIT,
+    SERVICE_ATTRIBUTE_NAME,
+    SERVICE_ATTRIBUTE_LATITUDE,
+    SERVICE_ATTRIBUTE_LONGITUDE,
+    SERVICE_ATTRIBUTE_RADIUS,
+    DEFAULT_NAMED_PLACE_RADIUS,
 )
-from .api_cloud_util import api_cloud_for_region_and_brand
+from .api_cloud import ApiCloud
+from .api_cloud_registry import ApiCloudRegistry
+from .geocode_cache import GeocodeCache
+from .geocoder import Geocoder
+from .places import KnownPlaces, Place
+from .raw_responses import RawResponseBuffer
+from .scheduler import PollScheduler
+from .storage import IntegrationStorage
 from .vehicle import Vehicle
 
 _LOGGER = logging.getLogger(__name__)
@@ -72,11 +98,41 @@ CONFIG_SCHEMA = vol.Schema(
 )
 
 
+def _vehicle_identifiers(hass: HomeAssistant) -> list[str]:
+    return [
+        key
+        for key, value in hass.data[DOMAIN].items()
+        if isinstance(value, dict) and DATA_VEHICLE_INSTANCE in value
+    ]
+
+
 async def async_setup(hass: HomeAssistant, config_entry: ConfigType) -> bool:
     hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][DATA_API_CLOUD_REGISTRY] = ApiCloudRegistry(hass)
+    poll_scheduler = PollScheduler(hass)
+    hass.data[DOMAIN][DATA_POLL_SCHEDULER] = poll_scheduler
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, poll_scheduler.shutdown)
+    storage = IntegrationStorage(hass)
+    await storage.async_load()
+    hass.data[DOMAIN][DATA_STORAGE] = storage
+    geocode_cache = GeocodeCache(hass)
+    await geocode_cache.async_load()
+    known_places = KnownPlaces(hass)
+    await known_places.async_load()
+    hass.data[DOMAIN][DATA_KNOWN_PLACES] = known_places
+    geocoder = Geocoder(hass, geocode_cache, known_places)
+    geocoder.async_start()
+    hass.data[DOMAIN][DATA_GEOCODER] = geocoder
+
+    async def async_stop_geocoder(event):
+        known_places.async_stop()
+        await geocoder.async_stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_geocoder)
+    hass.data[DOMAIN][DATA_SETUP_SEMAPHORE] = asyncio.Semaphore(MAX_CONCURRENT_SETUPS)
 
     def convert_call_to_vehicle(call) -> Vehicle:
-        vehicle_identifiers = list(hass.data[DOMAIN].keys())
+        vehicle_identifiers = _vehicle_identifiers(hass)
         if len(vehicle_identifiers) == 1:
             vehicle_identifier = vehicle_identifiers[0]
         else:
@@ -140,6 +196,21 @@ async def async_setup(hass: HomeAssistant, config_entry: ConfigType) -> bool:
         hass_vehicle: Vehicle = convert_call_to_vehicle(call)
         await hass.async_create_task(hass_vehicle.set_charge_limits(ac_limit, dc_limit))
 
+    async def async_handle_add_named_place(call):
+        known_places.add_named_place(
+            Place(
+                name=call.data[SERVICE_ATTRIBUTE_NAME],
+                latitude=call.data[SERVICE_ATTRIBUTE_LATITUDE],
+                longitude=call.data[SERVICE_ATTRIBUTE_LONGITUDE],
+                radius=call.data[SERVICE_ATTRIBUTE_RADIUS],
+            )
+        )
+
+    async def async_handle_remove_named_place(call):
+        name = call.data[SERVICE_ATTRIBUTE_NAME]
+        if not known_places.remove_named_place(name):
+            _LOGGER.warning(f"no named place called {name}")
+
     hass.services.async_register(
         DOMAIN, SERVICE_NAME_REQUEST_SYNC, async_handle_request_sync
     )
@@ -199,6 +270,27 @@ async def async_setup(hass: HomeAssistant, config_entry: ConfigType) -> bool:
         async_handle_set_charge_limits,
         vol.Schema(charge_limit_schema),
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_NAME_ADD_NAMED_PLACE,
+        async_handle_add_named_place,
+        vol.Schema(
+            {
+                vol.Required(SERVICE_ATTRIBUTE_NAME): cv.string,
+                vol.Required(SERVICE_ATTRIBUTE_LATITUDE): cv.latitude,
+                vol.Required(SERVICE_ATTRIBUTE_LONGITUDE): cv.longitude,
+                vol.Optional(
+                    SERVICE_ATTRIBUTE_RADIUS, default=DEFAULT_NAMED_PLACE_RADIUS
+                ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+            }
+        ),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_NAME_REMOVE_NAMED_PLACE,
+        async_handle_remove_named_place,
+        vol.Schema({vol.Required(SERVICE_ATTRIBUTE_NAME): cv.string}),
+    )
 
     return True
 
@@ -225,31 +317,55 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         )
     )
 
-    api_cloud_class = api_cloud_for_region_and_brand(region=region, brand=brand)
-    api_cloud_instance = api_cloud_class(
+    api_cloud_registry: ApiCloudRegistry = hass.data[DOMAIN][DATA_API_CLOUD_REGISTRY]
+    api_cloud_instance = api_cloud_registry.acquire(
+        region=region,
+        brand=brand,
         username=username,
         password=password,
-        hass=hass,
-        update_interval=scan_interval,
-        force_scan_interval=force_scan_interval,
-        no_force_scan_hour_start=no_force_scan_hour_start,
-        no_force_scan_hour_finish=no_force_scan_hour_finish,
+        pin=config_entry.data.get(CONF_PIN),
+    )
+    # the newest entry wins when entries of one account differ, as with the password
+    api_cloud_instance.budget.set_daily_limit(
+        config_entry.options.get(CONF_DAILY_REQUEST_LIMIT)
     )
-    if CONF_PIN in config_entry.data and config_entry.data[CONF_PIN] is not None:
-        pin = config_entry.data[CONF_PIN]
-        api_cloud_instance.pin = pin
+    storage: IntegrationStorage = hass.data[DOMAIN][DATA_STORAGE]
+    snapshot = storage.vehicle_data(vehicle_identifier).get("snapshot")
+    hass_vehicle: Vehicle | None = None
+    if snapshot is not None:
+        try:
+            hass_vehicle = api_cloud_instance.restore_vehicle(
+                identifier=vehicle_identifier, snapshot=snapshot
+            )
+        except Exception as error:
+            # a record in an older layout is dropped, the vehicle is fetched
+            _LOGGER.warning(
+                f"discarding stored state of {vehicle_identifier}, restore failed:{error}"
+            )
+            storage.remove_vehicle(vehicle_identifier)
     try:
-        hass_vehicle: Vehicle = await api_cloud_instance.get_vehicle(
-            identifier=vehicle_identifier
-        )
-    except ClientError as error:
-        _LOGGER.warning(
-            f"error during setup: {error}, waiting 1 minute and trying again."
-        )
-        sleep(60)
-        hass_vehicle: Vehicle = await api_cloud_instance.get_vehicle(
-            identifier=vehicle_identifier
-        )
+        if hass_vehicle is None:
+            hass_vehicle = await _async_fetch_vehicle(
+                hass, api_cloud_instance, vehicle_identifier
+            )
+    except Exception:
+        await api_cloud_registry.release(api_cloud_instance)
+        raise
+    hass_vehicle.update_interval = scan_interval
+    hass_vehicle.force_scan_interval = force_scan_interval
+    hass_vehicle.no_force_scan_hour_start = no_force_scan_hour_start
+    hass_vehicle.no_force_scan_hour_finish = no_force_scan_hour_finish
+    hass_vehicle.geocoder = hass.data[DOMAIN][DATA_GEOCODER]
+    hass_vehicle.confirm_commands = config_entry.options.get(
+        CONF_CONFIRM_COMMANDS, DEFAULT_CONFIRM_COMMANDS
+    )
+    if config_entry.options.get(
+        CONF_RETAIN_RAW_RESPONSES, DEFAULT_RETAIN_RAW_RESPONSES
+    ):
+        if hass_vehicle.raw_response_buffer is None:
+            hass_vehicle.raw_response_buffer = RawResponseBuffer()
+    else:
+        hass_vehicle.raw_response_buffer = None
 
     data = {
         DATA_VEHICLE_INSTANCE: hass_vehicle,
@@ -257,24 +373,32 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         DATA_CONFIG_UPDATE_LISTENER: None,
     }
 
-    _LOGGER.debug("first update start")
-    await hass_vehicle.coordinator.async_config_entry_first_refresh()
-    _LOGGER.debug("first update finished")
+    storage.track_vehicle(hass_vehicle)
+    api_cloud_instance.register_vehicle(hass_vehicle)
+    if hass_vehicle.restored_from_snapshot:
+        # entities come up from the snapshot, fresh data follows with the
+        # first scheduled poll, one budgeted cycle for the whole account
+        _LOGGER.debug(f"restored {vehicle_identifier} from snapshot")
+    else:
+        _LOGGER.debug("first update start")
+        async with hass.data[DOMAIN][DATA_SETUP_SEMAPHORE]:
+            await api_cloud_instance.refresh(requested_by=hass_vehicle)
+        _LOGGER.debug("first update finished")
+        if hass_vehicle.last_updated_from_cloud is None:
+            api_cloud_registry.mark_setup_failed(api_cloud_instance)
+            api_cloud_instance.unregister_vehicle(hass_vehicle)
+            storage.untrack_vehicle(hass_vehicle)
+            await api_cloud_registry.release(api_cloud_instance)
+            raise ConfigEntryNotReady(f"first update failed for {vehicle_identifier}")
+        api_cloud_registry.mark_setup_succeeded(api_cloud_instance)
 
     for platform in PLATFORMS:
         hass.async_create_task(
             hass.config_entries.async_forward_entry_setup(config_entry, platform)
         )
 
-    async def update(_event_time_utc: datetime):
-        try:
-            await hass.async_create_task(hass_vehicle.update(interval=True))
-        except Exception as ex:
-            _LOGGER.error(f"Exception in interval update : %s", str(ex))
-
-    data[DATA_VEHICLE_LISTENER] = async_track_time_interval(
-        hass, update, timedelta(minutes=1)
-    )
+    poll_scheduler: PollScheduler = hass.data[DOMAIN][DATA_POLL_SCHEDULER]
+    data[DATA_VEHICLE_LISTENER] = poll_scheduler.add_vehicle(hass_vehicle)
     data[DATA_CONFIG_UPDATE_LISTENER] = config_entry.add_update_listener(
         async_update_options
     )
@@ -283,6 +407,30 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     return True
 
 
+async def _async_fetch_vehicle(
+    hass: HomeAssistant, api_cloud: ApiCloud, vehicle_identifier: str
+) -> Vehicle:
+    """
+    failures raise ConfigEntryNotReady so home assistant retries with its own
+    backoff; the semaphore keeps an outage from turning into a login storm
+    """
+    api_cloud_registry: ApiCloudRegistry = hass.data[DOMAIN][DATA_API_CLOUD_REGISTRY]
+    if vehicle_identifier in api_cloud.vehicles:
+        return api_cloud.vehicles[vehicle_identifier]
+    if api_cloud_registry.setup_recently_failed(api_cloud):
+        raise ConfigEntryNotReady(
+            "setup of another vehicle on this account just failed, retrying later"
+        )
+    async with hass.data[DOMAIN][DATA_SETUP_SEMAPHORE]:
+        try:
+            vehicle = await api_cloud.get_vehicle(identifier=vehicle_identifier)
+        except (ClientError, asyncio.TimeoutError) as error:
+            api_cloud_registry.mark_setup_failed(api_cloud)
+            raise ConfigEntryNotReady(f"error during setup: {error}") from error
+    api_cloud_registry.mark_setup_succeeded(api_cloud)
+    return vehicle
+
+
 async def async_update_options(hass: HomeAssistant, config_entry: ConfigEntry):
     await hass.config_entries.async_reload(config_entry.entry_id)
 
@@ -300,7 +448,13 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         vehicle_identifier = config_entry.data[CONF_VEHICLE_IDENTIFIER]
         hass_vehicle = hass.data[DOMAIN][vehicle_identifier][DATA_VEHICLE_INSTANCE]
         if hass_vehicle is not None:
-            await hass_vehicle.api_cloud.cleanup()
+            hass_vehicle.api_cloud.unregister_vehicle(hass_vehicle)
+            storage: IntegrationStorage = hass.data[DOMAIN][DATA_STORAGE]
+            storage.untrack_vehicle(hass_vehicle)
+            api_cloud_registry: ApiCloudRegistry = hass.data[DOMAIN][
+                DATA_API_CLOUD_REGISTRY
+            ]
+            await api_cloud_registry.release(hass_vehicle.api_cloud)
 
         vehicle_listener = hass.data[DOMAIN][vehicle_identifier][DATA_VEHICLE_LISTENER]
         vehicle_listener()
@@ -310,6 +464,31 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         ]
         config_update_listener()
 
-        hass.data[DOMAIN][vehicle_identifier] = None
+        hass.data[DOMAIN].pop(vehicle_identifier)
+        if not _vehicle_identifiers(hass):
+            poll_scheduler: PollScheduler = hass.data[DOMAIN][DATA_POLL_SCHEDULER]
+            poll_scheduler.shutdown()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry):
+    """
+    forgets what was stored for a deleted vehicle, and the account's request
+    budget once no other entry uses that account
+    """
+    storage: IntegrationStorage = hass.data[DOMAIN][DATA_STORAGE]
+    storage.remove_vehicle(config_entry.data[CONF_VEHICLE_IDENTIFIER])
+
+    account = (
+        config_entry.data[CONF_REGION],
+        config_entry.data[CONF_BRAND],
+        config_entry.data[CONF_USERNAME],
+    )
+    if not any(
+        (entry.data[CONF_REGION], entry.data[CONF_BRAND], entry.data[CONF_USERNAME])
+        == account
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id != config_entry.entry_id
+    ):
+        storage.remove_account(*account)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+from asyncio import sleep
+from collections import deque
+from statistics import median
+from typing import Awaitable, Callable
+
+from .const import (
+    INITIAL_STATUS_DELAY_AFTER_COMMAND,
+    RECHECK_STATUS_DELAY_AFTER_COMMAND,
+    ACTION_MIN_INITIAL_DELAY,
+    ACTION_MAX_INITIAL_DELAY,
+    ACTION_MAX_RECHECK_DELAY,
+    ACTION_COMPLETION_DEADLINE,
+    ACTION_COMPLETION_SAMPLES,
+    ACTION_EARLY_COMPLETION_FACTOR,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CompletionTracker:
+    """
+    waits for actions to complete; the first status check comes after the
+    median time the action type took before, later ones back off
+    exponentially with jitter until a hard deadline
+    """
+
+    def __init__(self):
+        self._durations: dict[str, deque[float]] = {}
+
+    def initial_delay(self, action_name: str) -> float:
+        durations = self._durations.get(action_name)
+        if not durations:
+            return INITIAL_STATUS_DELAY_AFTER_COMMAND
+        return min(
+            max(median(durations), ACTION_MIN_INITIAL_DELAY), ACTION_MAX_INITIAL_DELAY
+        )
+
+    def record(self, action_name: str, seconds: float) -> None:
+        self._durations.setdefault(
+            action_name, deque(maxlen=ACTION_COMPLETION_SAMPLES)
+        ).append(seconds)
+
+    async def wait(
+        self, action_name: str, check_completed: Callable[[], Awaitable[bool]]
+    ) -> bool:
+        """
+        returns whether the action completed before the deadline
+        """
+        started = time.monotonic()
+        deadline = started + ACTION_COMPLETION_DEADLINE
+        checked_at = None
+        delay = self.initial_delay(action_name)
+        attempt = 0
+        while True:
+            await sleep(delay)
+            previous_check = checked_at
+            checked_at = time.monotonic() - started
+            if await check_completed():
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                _LOGGER.warning(
+                    f"{action_name} didn't complete within {ACTION_COMPLETION_DEADLINE} seconds, giving up on it"
+                )
+                return False
+            backoff = min(
+                RECHECK_STATUS_DELAY_AFTER_COMMAND * 2**attempt,
+                ACTION_MAX_RECHECK_DELAY,
+            )
+            delay = min(random.uniform(backoff / 2, backoff), remaining)
+            attempt += 1
+        # the action completed somewhere since the previous check; done on the
+        # first one says only that it was quicker, so aim a bit earlier next time
+        if previous_check is None:
+            duration = checked_at * ACTION_EARLY_COMPLETION_FACTOR
+        else:
+            duration = (previous_check + checked_at) / 2
+        self.record(action_name, duration)
+        _LOGGER.debug(
+            f"{action_name} completed after {checked_at:.0f}s, {attempt + 1} status checks"
+        )
+        return True
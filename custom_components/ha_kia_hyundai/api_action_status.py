@@ -6,6 +6,8 @@ from .const import ACTION_LOCK_TIMEOUT_IN_SECONDS
 class ApiActionStatus:
     xid = None
     _completed = False
+    # only set once completion polling saw the command go through
+    confirmed = False
 
     def __init__(self, name: str):
         self.name = name
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from abc import ABC, abstractmethod
 from datetime import timedelta
+from typing import Awaitable, Callable
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
 
 from .vehicle import Vehicle
-from .api_action_status import ApiActionStatus
+from .action_completion import CompletionTracker
 from .callbacks import CallbacksMixin
+from .request_budget import RequestBudget
 from .const import (
     VEHICLE_LOCK_ACTION,
 )
@@ -17,26 +25,37 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class ApiCloud(CallbacksMixin, ABC):
-    _current_action: ApiActionStatus | None = None
     hvac_on_force_scan_interval: timedelta = timedelta(minutes=10)
+    # default daily limit, each region sets its own
+    # requests one vehicle update makes against the daily limit
+    update_request_cost: int = 1
 
     def __init__(
         self,
         username: str,
         password: str,
         hass: HomeAssistant,
-        update_interval: timedelta = None,
-        force_scan_interval: timedelta = None,
-        no_force_scan_hour_start: int = None,
-        no_force_scan_hour_finish: int = None,
     ):
         self.hass: HomeAssistant = hass
-        self.update_interval: timedelta = update_interval
-        self.force_scan_interval: timedelta = force_scan_interval
-        self.no_force_scan_hour_start: int = no_force_scan_hour_start
-        self.no_force_scan_hour_finish: int = no_force_scan_hour_finish
         self.username: str = username
         self.password: str = password
+        self.vehicles: dict[str, Vehicle] = {}
+        self._registered_vehicles: dict[str, Vehicle] = {}
+        self._login_lock: asyncio.Lock = asyncio.Lock()
+        self._vehicles_lock: asyncio.Lock = asyncio.Lock()
+        self._refresh_lock: asyncio.Lock = asyncio.Lock()
+        self._refresh_generation: int = 0
+        self._refreshed_identifiers: set[str] = set()
+        self._requested_identifier: str | None = None
+        self.action_completion: CompletionTracker = CompletionTracker()
+        self.budget: RequestBudget = RequestBudget()
+
+        self.coordinator: DataUpdateCoordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            name=f"Account {self.region} {self.brand}",
+            update_method=self._async_update_registered_vehicles,
+        )
 
     async def cleanup(self):
         pass
@@ -46,16 +65,108 @@ class ApiCloud(CallbacksMixin, ABC):
         pass
 
     async def get_vehicle(self, identifier: str) -> Vehicle:
-        vehicles = await self.get_vehicles()
-        for vehicle in vehicles:
-            if vehicle.identifier == identifier:
-                return vehicle
+        async with self._vehicles_lock:
+            if identifier not in self.vehicles:
+                for vehicle in await self.get_vehicles():
+                    self.vehicles.setdefault(vehicle.identifier, vehicle)
+        if identifier in self.vehicles:
+            return self.vehicles[identifier]
         raise RuntimeError(f"vehicle with identifier:{identifier} missing")
 
     @abstractmethod
     async def get_vehicles(self) -> list[Vehicle]:
         pass
 
+    def restore_vehicle(self, identifier: str, snapshot: dict) -> Vehicle:
+        if identifier not in self.vehicles:
+            vehicle = Vehicle(
+                api_cloud=self,
+                identifier=identifier,
+                api_unsupported_keys=snapshot["api_unsupported_keys"],
+            )
+            vehicle.restore_snapshot(snapshot)
+            self.vehicles[identifier] = vehicle
+        return self.vehicles[identifier]
+
+    def register_vehicle(self, vehicle: Vehicle) -> None:
+        self._registered_vehicles[vehicle.identifier] = vehicle
+
+    def unregister_vehicle(self, vehicle: Vehicle) -> None:
+        self._registered_vehicles.pop(vehicle.identifier, None)
+
+    async def refresh(self, requested_by: Vehicle | None = None) -> None:
+        """
+        one update cycle for the account; requested_by is the vehicle a user
+        asked for, the only one charged without waiting until it is due
+        """
+        requested_generation = self._refresh_generation
+        requested_identifiers = set(self._registered_vehicles)
+        async with self._refresh_lock:
+            if (
+                requested_generation != self._refresh_generation
+                and requested_identifiers <= self._refreshed_identifiers
+            ):
+                _LOGGER.debug(f"joined refresh cycle already in flight")
+                return
+            self._requested_identifier = (
+                requested_by.identifier if requested_by is not None else None
+            )
+            await self.coordinator.async_refresh()
+            self._refresh_generation += 1
+
+    def _budget_allows_update(self, vehicle: Vehicle) -> bool:
+        if vehicle.identifier == self._requested_identifier or (
+            vehicle.last_updated_from_cloud is None
+            and not vehicle.restored_from_snapshot
+        ):
+            self.budget.consume(cost=self.update_request_cost)
+            return True
+        return self.budget.try_consume(
+            cost=self.update_request_cost, priority=vehicle.refresh_staleness()
+        )
+
+    async def _async_update_registered_vehicles(self) -> None:
+        vehicles = [
+            vehicle
+            for vehicle in self._registered_vehicles.values()
+            if self._budget_allows_update(vehicle)
+        ]
+        self._refreshed_identifiers = {vehicle.identifier for vehicle in vehicles}
+        if not vehicles:
+            return
+        previous_positions = [vehicle.position() for vehicle in vehicles]
+        for vehicle in vehicles:
+            if vehicle.calls_today_for_update is not None:
+                vehicle.calls_today_for_update.mark_used()
+        results = await self.update_vehicles(vehicles=vehicles)
+        failures = []
+        for vehicle, previous_position, result in zip(
+            vehicles, previous_positions, results
+        ):
+            if isinstance(result, ConfigEntryAuthFailed):
+                raise result
+            if isinstance(result, Exception):
+                _LOGGER.error(f"update failed for {vehicle.identifier}: {result}")
+                failures.append(vehicle.identifier)
+                vehicle.coordinator.async_set_update_error(result)
+                continue
+            vehicle.mark_updated_from_cloud(previous_position=previous_position)
+            vehicle.coordinator.async_set_updated_data(vehicle)
+        if failures:
+            raise UpdateFailed(f"update failed for vehicles: {failures}")
+
+    async def update_vehicles(self, vehicles: list[Vehicle]) -> list:
+        return await asyncio.gather(
+            *[self._update_snapshot(vehicle=vehicle) for vehicle in vehicles],
+            return_exceptions=True,
+        )
+
+    async def _update_snapshot(self, vehicle: Vehicle) -> None:
+        # readers keep the previous snapshot until the whole update is parsed
+        with vehicle.updating_snapshot():
+            await self.update(vehicle=vehicle)
+            vehicle.reconcile_optimistic_state()
+
     @abstractmethod
     async def update(self, vehicle: Vehicle) -> None:
         pass
@@ -98,27 +209,17 @@ class ApiCloud(CallbacksMixin, ABC):
     ) -> None:
         pass
 
-    def _start_action(self, name: str) -> None:
-        if self.action_in_progress():
-            raise RuntimeError(
-                f"Existing Action in progress: {self._current_action.name}; started at {self._current_action.start_time}"
+    async def _wait_for_action(
+        self, vehicle: Vehicle, check_completed: Callable[[], Awaitable[bool]]
+    ) -> None:
+        action = vehicle.commands.current
+        try:
+            action.confirmed = await self.action_completion.wait(
+                action.name, check_completed
             )
-        else:
-            self._current_action = ApiActionStatus(name)
-            self.publish_updates()
-
-    def action_in_progress(self) -> bool:
-        return not (
-            self._current_action is None
-            or self._current_action.completed()
-            or self._current_action.expired()
-        )
-
-    def current_action_name(self) -> str:
-        if self.action_in_progress():
-            return self._current_action.name
-        else:
-            "None"
+        finally:
+            action.complete()
+            vehicle.commands.publish_updates()
 
     @property
     @abstractmethod
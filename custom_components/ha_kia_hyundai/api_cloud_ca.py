@@ -2,39 +2,236 @@ from __future__ import annotations
 
 import logging
 
-from asyncio import sleep
 from kia_hyundai_api import CaKia, CaHyundai, AuthError
 from homeassistant.const import TEMP_CELSIUS
+from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.util import dt as dt_util
 from datetime import timedelta
 
 from .api_cloud import ApiCloud
+from .pin_token_cache import PinTokenCache
 from .vehicle import Vehicle
 from .const import (
     VEHICLE_LOCK_ACTION,
-    INITIAL_STATUS_DELAY_AFTER_COMMAND,
-    RECHECK_STATUS_DELAY_AFTER_COMMAND,
     CA_TEMP_RANGE,
     REGION_CANADA,
 )
-from .util import (
-    convert_last_updated_str_to_datetime,
-    safely_get_json_value,
-    convert_api_unit_to_ha_unit_of_distance,
+from .util import convert_api_unit_to_ha_unit_of_distance
+from .timestamps import decode_compact
+from .field_mapping import (
+    FieldMapping,
+    MappingTable,
+    KEEP_PREVIOUS,
+    COORDINATE_MAPPING,
+    sort_list_at,
+    first_present_with_unit,
+    sync_date,
+    keep_previous_when,
+    charge_level,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+STATUS = "status.status"
+EV_STATUS = f"{STATUS}.evStatus"
+RANGE_BY_FUEL = f"{EV_STATUS}.drvDistance.0.rangeByFuel"
+MAINTENANCE = "next_service.maintenanceInfo"
+
+
+def _temperature(value: str | None):
+    if value is None:
+        return KEEP_PREVIOUS
+    return CA_TEMP_RANGE[int(value.replace("H", ""), 16)]
+
+
+CA_STATUS_MAPPING = MappingTable(
+    fields=[
+        FieldMapping("doors_locked", f"{STATUS}.doorLock", bool),
+        FieldMapping("door_hood_open", f"{STATUS}.hoodOpen", bool),
+        FieldMapping("door_trunk_open", f"{STATUS}.trunkOpen", bool),
+        FieldMapping("door_front_left_open", f"{STATUS}.doorOpen.frontLeft", bool),
+        FieldMapping("door_front_right_open", f"{STATUS}.doorOpen.frontRight", bool),
+        FieldMapping("door_back_left_open", f"{STATUS}.doorOpen.backLeft", bool),
+        FieldMapping("door_back_right_open", f"{STATUS}.doorOpen.backRight", bool),
+        FieldMapping("engine_on", f"{STATUS}.engine", bool),
+        FieldMapping(
+            "tire_all_on", f"{STATUS}.tirePressureLamp.tirePressureLampAll", bool
+        ),
+        FieldMapping(
+            "tire_front_left_on", f"{STATUS}.tirePressureLamp.tirePressureLampFL", bool
+        ),
+        FieldMapping(
+            "tire_front_right_on", f"{STATUS}.tirePressureLamp.tirePressureLampFR", bool
+        ),
+        FieldMapping(
+            "tire_rear_left_on", f"{STATUS}.tirePressureLamp.tirePressureLampRL", bool
+        ),
+        FieldMapping(
+            "tire_rear_right_on", f"{STATUS}.tirePressureLamp.tirePressureLampRR", bool
+        ),
+        FieldMapping("climate_hvac_on", f"{STATUS}.airCtrlOn", bool),
+        FieldMapping("climate_defrost_on", f"{STATUS}.defrost", bool),
+        FieldMapping(
+            "climate_heated_rear_window_on", f"{STATUS}.sideBackWindowHeat", bool
+        ),
+        FieldMapping("climate_heated_side_mirror_on", f"{STATUS}.sideMirrorHeat", bool),
+        FieldMapping(
+            "climate_heated_steering_wheel_on", f"{STATUS}.steerWheelHeat", bool
+        ),
+        FieldMapping(
+            "climate_heated_seat_front_right_on",
+            f"{STATUS}.seatHeaterVentState.frSeatHeatState",
+            bool,
+        ),
+        FieldMapping(
+            "climate_heated_seat_front_left_on",
+            f"{STATUS}.seatHeaterVentState.flSeatHeatState",
+            bool,
+        ),
+        FieldMapping(
+            "climate_heated_seat_rear_right_on",
+            f"{STATUS}.seatHeaterVentState.rrSeatHeatState",
+            bool,
+        ),
+        FieldMapping(
+            "climate_heated_seat_rear_left_on",
+            f"{STATUS}.seatHeaterVentState.rlSeatHeatState",
+            bool,
+        ),
+        FieldMapping("low_fuel_light_on", f"{STATUS}.lowFuelLight", bool),
+        FieldMapping("ev_battery_charging", f"{EV_STATUS}.batteryCharge", bool),
+        FieldMapping("ev_plugged_in", f"{EV_STATUS}.batteryPlugin", bool),
+        FieldMapping(
+            "ev_battery_level",
+            f"{EV_STATUS}.batteryStatus",
+            int,
+            keep_previous_when(lambda value: value == 0),
+        ),
+        FieldMapping(
+            "ev_remaining_range_value", f"{RANGE_BY_FUEL}.evModeRange.value", float
+        ),
+        FieldMapping(
+            "ev_remaining_range_unit",
+            f"{RANGE_BY_FUEL}.evModeRange.unit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping(
+            "total_range_value", f"{RANGE_BY_FUEL}.totalAvailableRange.value", float
+        ),
+        FieldMapping(
+            "total_range_unit",
+            f"{RANGE_BY_FUEL}.totalAvailableRange.unit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping(
+            "ev_charge_current_remaining_duration",
+            f"{EV_STATUS}.remainTime2.atc.value",
+            int,
+        ),
+        FieldMapping(
+            "ev_charge_fast_duration", f"{EV_STATUS}.remainTime2.etc1.value", int
+        ),
+        FieldMapping(
+            "ev_charge_portable_duration", f"{EV_STATUS}.remainTime2.etc2.value", int
+        ),
+        FieldMapping(
+            "ev_charge_station_duration", f"{EV_STATUS}.remainTime2.etc3.value", int
+        ),
+        FieldMapping(
+            "ev_max_dc_charge_level",
+            f"{EV_STATUS}.targetSOC.0.targetSOClevel",
+            int,
+            charge_level,
+        ),
+        FieldMapping(
+            "ev_max_ac_charge_level",
+            f"{EV_STATUS}.targetSOC.1.targetSOClevel",
+            int,
+            charge_level,
+        ),
+        FieldMapping(
+            "ev_max_range_dc_charge_value",
+            f"{EV_STATUS}.targetSOC.0.dte.rangeByFuel.totalAvailableRange.value",
+            float,
+        ),
+        FieldMapping(
+            "ev_max_range_dc_charge_unit",
+            f"{EV_STATUS}.targetSOC.0.dte.rangeByFuel.totalAvailableRange.unit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping(
+            "ev_max_range_ac_charge_value",
+            f"{EV_STATUS}.targetSOC.1.dte.rangeByFuel.totalAvailableRange.value",
+            float,
+        ),
+        FieldMapping(
+            "ev_max_range_ac_charge_unit",
+            f"{EV_STATUS}.targetSOC.1.dte.rangeByFuel.totalAvailableRange.unit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping("battery_level", f"{STATUS}.battery.batSoc", int),
+        FieldMapping(
+            "climate_temperature_value",
+            f"{STATUS}.airTemp.value",
+            convert=_temperature,
+        ),
+        FieldMapping("odometer_value", f"{MAINTENANCE}.currentOdometer", float),
+        FieldMapping(
+            "odometer_unit",
+            f"{MAINTENANCE}.currentOdometerUnit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping("next_service_value", f"{MAINTENANCE}.imatServiceOdometer", float),
+        FieldMapping(
+            "next_service_unit",
+            f"{MAINTENANCE}.imatServiceOdometerUnit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping("last_service_value", f"{MAINTENANCE}.msopServiceOdometer", float),
+        FieldMapping(
+            "last_service_unit",
+            f"{MAINTENANCE}.msopServiceOdometerUnit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+    ],
+    constants={"climate_temperature_unit": TEMP_CELSIUS},
+    prepare=sort_list_at(f"{EV_STATUS}.targetSOC", sort_key=lambda x: x["plugType"]),
+    derive=[
+        sync_date(f"{STATUS}.lastStatusDate", decode_compact),
+        first_present_with_unit(
+            "fuel_range_value",
+            "fuel_range_unit",
+            candidates=[
+                (f"{STATUS}.dte.value", f"{STATUS}.dte.unit"),
+                (
+                    f"{RANGE_BY_FUEL}.gasModeRange.value",
+                    f"{RANGE_BY_FUEL}.gasModeRange.unit",
+                ),
+            ],
+            cast=float,
+            convert_unit=convert_api_unit_to_ha_unit_of_distance,
+        ),
+    ],
+)
+
 
 def request_with_active_session(func):
     async def request_with_active_session_wrapper(*args, **kwargs):
+        self = args[0]
+        access_token = self._access_token
         try:
             return await func(*args, **kwargs)
         except AuthError:
             _LOGGER.debug(f"got invalid session, attempting to repair and resend")
-            self = args[0]
-            await self.login()
+            await self._renew_access_token(failed_access_token=access_token)
             response = await func(*args, **kwargs)
             return response
 
@@ -45,13 +242,47 @@ class ApiCloudCa(ApiCloud):
     pin: str = None
     api: CaKia | CaHyundai = None
     _access_token: str = None
+    update_request_cost: int = 2
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        hass: HomeAssistant,
+    ):
+        super().__init__(
+            username=username,
+            password=password,
+            hass=hass,
+        )
+        self._pin_tokens: PinTokenCache = PinTokenCache(hass, self._fetch_pin_token)
+
+    async def cleanup(self):
+        self._pin_tokens.invalidate()
+        await super().cleanup()
+
+    async def _fetch_pin_token(self):
+        access_token = await self._get_access_token()
+        return await self.api.get_pin_token(access_token=access_token, pin=self.pin)
 
     async def _get_access_token(self):
-        if self._access_token is None:
-            await self.login()
+        async with self._login_lock:
+            if self._access_token is None:
+                await self.login()
         return self._access_token
 
+    async def _renew_access_token(self, failed_access_token: str | None) -> None:
+        """
+        requests of every vehicle share the access token; only the first to
+        find it expired logs in, the others retry with the token it got
+        """
+        async with self._login_lock:
+            if self._access_token is None or self._access_token == failed_access_token:
+                await self.login()
+
     async def login(self):
+        # a pin token belongs to the session it was issued in
+        self._pin_tokens.invalidate()
         try:
             self._access_token, _ = await self.api.login(self.username, self.password)
         except AuthError as err:
@@ -88,235 +319,10 @@ class ApiCloudCa(ApiCloud):
             "status": api_vehicle_status,
             "next_service": api_vehicle_next_service,
         }
+        CA_STATUS_MAPPING.apply(vehicle, vehicle.raw_responses)
 
-        vehicle.last_synced_to_cloud = convert_last_updated_str_to_datetime(
-            last_updated_str=api_vehicle_status["status"]["lastStatusDate"],
-            timezone_of_str=dt_util.UTC,
-        )
-
-        target_soc = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.targetSOC"
-        )
-        if target_soc is not None:
-            target_soc.sort(key=lambda x: x["plugType"])
-
-        vehicle.doors_locked = safely_get_json_value(
-            api_vehicle_status, "status.doorLock", bool
-        )
-        vehicle.door_hood_open = safely_get_json_value(
-            api_vehicle_status, "status.hoodOpen", bool
-        )
-        vehicle.door_trunk_open = safely_get_json_value(
-            api_vehicle_status, "status.trunkOpen", bool
-        )
-        vehicle.door_front_left_open = safely_get_json_value(
-            api_vehicle_status, "status.doorOpen.frontLeft", bool
-        )
-        vehicle.door_front_right_open = safely_get_json_value(
-            api_vehicle_status, "status.doorOpen.frontRight", bool
-        )
-        vehicle.door_back_left_open = safely_get_json_value(
-            api_vehicle_status, "status.doorOpen.backLeft", bool
-        )
-        vehicle.door_back_right_open = safely_get_json_value(
-            api_vehicle_status, "status.doorOpen.backRight", bool
-        )
-        vehicle.engine_on = safely_get_json_value(
-            api_vehicle_status, "status.engine", bool
-        )
-        vehicle.tire_all_on = safely_get_json_value(
-            api_vehicle_status, "status.tirePressureLamp.tirePressureLampAll", bool
-        )
-        vehicle.tire_front_left_on = safely_get_json_value(
-            api_vehicle_status, "status.tirePressureLamp.tirePressureLampFL", bool
-        )
-        vehicle.tire_front_right_on = safely_get_json_value(
-            api_vehicle_status, "status.tirePressureLamp.tirePressureLampFR", bool
-        )
-        vehicle.tire_rear_left_on = safely_get_json_value(
-            api_vehicle_status, "status.tirePressureLamp.tirePressureLampRL", bool
-        )
-        vehicle.tire_rear_right_on = safely_get_json_value(
-            api_vehicle_status, "status.tirePressureLamp.tirePressureLampRR", bool
-        )
-        vehicle.climate_hvac_on = safely_get_json_value(
-            api_vehicle_status, "status.airCtrlOn", bool
-        )
-        vehicle.climate_defrost_on = safely_get_json_value(
-            api_vehicle_status, "status.defrost", bool
-        )
-        vehicle.climate_heated_rear_window_on = safely_get_json_value(
-            api_vehicle_status, "status.sideBackWindowHeat", bool
-        )
-        vehicle.climate_heated_side_mirror_on = safely_get_json_value(
-            api_vehicle_status, "status.sideMirrorHeat", bool
-        )
-        vehicle.climate_heated_steering_wheel_on = safely_get_json_value(
-            api_vehicle_status, "status.steerWheelHeat", bool
-        )
-        vehicle.climate_heated_seat_front_right_on = safely_get_json_value(
-            api_vehicle_status, "status.seatHeaterVentState.frSeatHeatState", bool
-        )
-        vehicle.climate_heated_seat_front_left_on = safely_get_json_value(
-            api_vehicle_status, "status.seatHeaterVentState.flSeatHeatState", bool
-        )
-        vehicle.climate_heated_seat_rear_right_on = safely_get_json_value(
-            api_vehicle_status, "status.seatHeaterVentState.rrSeatHeatState", bool
-        )
-        vehicle.climate_heated_seat_rear_left_on = safely_get_json_value(
-            api_vehicle_status, "status.seatHeaterVentState.rlSeatHeatState", bool
-        )
-        vehicle.low_fuel_light_on = safely_get_json_value(
-            api_vehicle_status, "status.lowFuelLight", bool
-        )
-        vehicle.ev_battery_charging = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.batteryCharge", bool
-        )
-        vehicle.ev_plugged_in = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.batteryPlugin", bool
-        )
-
-        ev_battery_level = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.batteryStatus", int
-        )
-        if ev_battery_level != 0:
-            vehicle.ev_battery_level = ev_battery_level
-        vehicle.ev_remaining_range_value = safely_get_json_value(
-            api_vehicle_status,
-            "status.evStatus.drvDistance.0.rangeByFuel.evModeRange.value",
-            float,
-        )
-        vehicle.ev_remaining_range_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_status,
-                "status.evStatus.drvDistance.0.rangeByFuel.evModeRange.unit",
-                int,
-            )
-        )
-        vehicle.total_range_value = safely_get_json_value(
-            api_vehicle_status,
-            "status.evStatus.drvDistance.0.rangeByFuel.totalAvailableRange.value",
-            float,
-        )
-        vehicle.total_range_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_status,
-                "status.evStatus.drvDistance.0.rangeByFuel.totalAvailableRange.unit",
-                int,
-            )
-        )
-        vehicle.ev_charge_current_remaining_duration = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.remainTime2.atc.value", int
-        )
-        vehicle.ev_charge_fast_duration = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.remainTime2.etc1.value", int
-        )
-        vehicle.ev_charge_portable_duration = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.remainTime2.etc2.value", int
-        )
-        vehicle.ev_charge_station_duration = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.remainTime2.etc3.value", int
-        )
-        ev_max_dc_charge_level = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.targetSOC.0.targetSOClevel", int
-        )
-        if ev_max_dc_charge_level is not None and ev_max_dc_charge_level <= 100:
-            vehicle.ev_max_dc_charge_level = ev_max_dc_charge_level
-        ev_max_ac_charge_level = safely_get_json_value(
-            api_vehicle_status, "status.evStatus.targetSOC.1.targetSOClevel", int
-        )
-        if ev_max_ac_charge_level is not None and ev_max_ac_charge_level <= 100:
-            vehicle.ev_max_ac_charge_level = ev_max_ac_charge_level
-        vehicle.ev_max_range_dc_charge_value = safely_get_json_value(
-            api_vehicle_status,
-            "status.evStatus.targetSOC.0.dte.rangeByFuel.totalAvailableRange.value",
-            float,
-        )
-        vehicle.ev_max_range_dc_charge_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_status,
-                "status.evStatus.targetSOC.0.dte.rangeByFuel.totalAvailableRange.unit",
-                int,
-            )
-        )
-        vehicle.ev_max_range_ac_charge_value = safely_get_json_value(
-            api_vehicle_status,
-            "status.evStatus.targetSOC.1.dte.rangeByFuel.totalAvailableRange.value",
-            float,
-        )
-        vehicle.ev_max_range_ac_charge_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_status,
-                "status.evStatus.targetSOC.1.dte.rangeByFuel.totalAvailableRange.unit",
-                int,
-            )
-        )
-        vehicle.battery_level = safely_get_json_value(
-            api_vehicle_status, "status.battery.batSoc", int
-        )
-
-        temp_value = safely_get_json_value(api_vehicle_status, "status.airTemp.value")
-        if temp_value is not None:
-            temp_value = temp_value.replace("H", "")
-            vehicle.climate_temperature_value = CA_TEMP_RANGE[int(temp_value, 16)]
-        vehicle.climate_temperature_unit = TEMP_CELSIUS
-
-        non_ev_fuel_distance = safely_get_json_value(
-            api_vehicle_status, "status.dte.value", float
-        )
-        if non_ev_fuel_distance is not None:
-            vehicle.fuel_range_value = safely_get_json_value(
-                api_vehicle_status, "status.dte.value", float
-            )
-            vehicle.fuel_range_unit = convert_api_unit_to_ha_unit_of_distance(
-                safely_get_json_value(api_vehicle_status, "status.dte.unit", int)
-            )
-        else:
-            vehicle.fuel_range_value = safely_get_json_value(
-                api_vehicle_status,
-                "status.evStatus.drvDistance.0.rangeByFuel.gasModeRange.value",
-                float,
-            )
-            vehicle.fuel_range_unit = convert_api_unit_to_ha_unit_of_distance(
-                safely_get_json_value(
-                    api_vehicle_status,
-                    "status.evStatus.drvDistance.0.rangeByFuel.gasModeRange.unit",
-                    int,
-                )
-            )
-
-        previous_odometer_value = vehicle.odometer_value
-        vehicle.odometer_value = safely_get_json_value(
-            api_vehicle_next_service, "maintenanceInfo.currentOdometer", float
-        )
-        vehicle.odometer_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_next_service, "maintenanceInfo.currentOdometerUnit", int
-            )
-        )
-
-        vehicle.next_service_value = safely_get_json_value(
-            api_vehicle_next_service, "maintenanceInfo.imatServiceOdometer", float
-        )
-        vehicle.next_service_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_next_service, "maintenanceInfo.imatServiceOdometerUnit", int
-            )
-        )
-
-        vehicle.last_service_value = safely_get_json_value(
-            api_vehicle_next_service, "maintenanceInfo.msopServiceOdometer", float
-        )
-        vehicle.last_service_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_next_service, "maintenanceInfo.msopServiceOdometerUnit", int
-            )
-        )
-
-        if previous_odometer_value != vehicle.odometer_value:
-            pin_token = await self.api.get_pin_token(
-                access_token=access_token, pin=self.pin
-            )
+        if vehicle.location_fix_due():
+            pin_token = await self._pin_tokens.get()
             api_vehicle_location = await self.api.get_location(
                 access_token=access_token,
                 vehicle_id=vehicle.identifier,
@@ -326,21 +332,8 @@ class ApiCloudCa(ApiCloud):
             vehicle.raw_responses["location"] = api_vehicle_location
             previous_latitude = vehicle.latitude
             previous_longitude = vehicle.longitude
-            vehicle.latitude = safely_get_json_value(
-                api_vehicle_location, "coord.lat", float
-            )
-            vehicle.longitude = safely_get_json_value(
-                api_vehicle_location, "coord.lon", float
-            )
-            if (
-                (
-                    vehicle.latitude != previous_latitude
-                    or vehicle.longitude != previous_longitude
-                )
-                and vehicle.latitude is not None
-                and vehicle.longitude is not None
-            ):
-                await vehicle.update_location_name()
+            COORDINATE_MAPPING.apply(vehicle, api_vehicle_location)
+            vehicle.update_position(previous_latitude, previous_longitude)
 
     @request_with_active_session
     async def request_sync(self, vehicle: Vehicle) -> None:
@@ -352,11 +345,8 @@ class ApiCloudCa(ApiCloud):
 
     @request_with_active_session
     async def lock(self, vehicle: Vehicle, action: VEHICLE_LOCK_ACTION) -> None:
-        self._start_action(f"Lock {action.value}")
         access_token = await self._get_access_token()
-        pin_token = await self.api.get_pin_token(
-            access_token=access_token, pin=self.pin
-        )
+        pin_token = await self._pin_tokens.get()
         if action == VEHICLE_LOCK_ACTION.LOCK:
             xid = await self.api.lock(
                 access_token=access_token,
@@ -366,12 +356,12 @@ class ApiCloudCa(ApiCloud):
             )
         else:
             xid = await self.api.unlock(
-                saccess_token=access_token,
+                access_token=access_token,
                 vehicle_id=vehicle.identifier,
                 pin=self.pin,
                 pin_token=pin_token,
             )
-        self._current_action.set_xid(xid)
+        vehicle.commands.current.set_xid(xid)
         await self._check_action_completed(vehicle=vehicle, pin_token=pin_token)
 
     @request_with_active_session
@@ -384,14 +374,11 @@ class ApiCloudCa(ApiCloud):
         heating: bool,
         duration: int,
     ) -> None:
-        self._start_action(f"Start Climate")
         access_token = await self._get_access_token()
-        pin_token = await self.api.get_pin_token(
-            access_token=access_token, pin=self.pin
-        )
+        pin_token = await self._pin_tokens.get()
         if vehicle.ev_plugged_in is None:
             xid = await self.api.start_climate(
-                saccess_token=access_token,
+                access_token=access_token,
                 vehicle_id=vehicle.identifier,
                 pin=self.pin,
                 pin_token=pin_token,
@@ -403,7 +390,7 @@ class ApiCloudCa(ApiCloud):
             )
         else:
             xid = await self.api.start_climate_ev(
-                saccess_token=access_token,
+                access_token=access_token,
                 vehicle_id=vehicle.identifier,
                 pin=self.pin,
                 pin_token=pin_token,
@@ -413,64 +400,55 @@ class ApiCloudCa(ApiCloud):
                 heating=heating,
                 duration=duration,
             )
-        self._current_action.set_xid(xid)
+        vehicle.commands.current.set_xid(xid)
         await self._check_action_completed(vehicle=vehicle, pin_token=pin_token)
-        self.hvac_on_force_scan_interval = timedelta(minutes=int(duration) + 1)
+        vehicle.hvac_on_force_scan_interval = timedelta(minutes=int(duration) + 1)
 
     @request_with_active_session
     async def stop_climate(self, vehicle: Vehicle) -> None:
-        self._start_action(f"Stop Climate")
         access_token = await self._get_access_token()
-        pin_token = await self.api.get_pin_token(
-            access_token=access_token, pin=self.pin
-        )
+        pin_token = await self._pin_tokens.get()
         if vehicle.ev_plugged_in is None:
             xid = await self.api.stop_climate(
-                saccess_token=access_token,
+                access_token=access_token,
                 vehicle_id=vehicle.identifier,
                 pin=self.pin,
                 pin_token=pin_token,
             )
         else:
             xid = await self.api.stop_climate_ev(
-                saccess_token=access_token,
+                access_token=access_token,
                 vehicle_id=vehicle.identifier,
                 pin=self.pin,
                 pin_token=pin_token,
             )
-        self._current_action.set_xid(xid)
+        vehicle.commands.current.set_xid(xid)
         await self._check_action_completed(vehicle=vehicle, pin_token=pin_token)
 
     @request_with_active_session
     async def start_charge(self, vehicle: Vehicle) -> None:
-        self._start_action(f"Start Charge")
         access_token = await self._get_access_token()
-        pin_token = await self.api.get_pin_token(
-            access_token=access_token, pin=self.pin
-        )
+        pin_token = await self._pin_tokens.get()
         xid = await self.api.start_charge(
-            saccess_token=access_token,
+            access_token=access_token,
             vehicle_id=vehicle.identifier,
             pin=self.pin,
             pin_token=pin_token,
         )
-        self._current_action.set_xid(xid)
+        vehicle.commands.current.set_xid(xid)
         await self._check_action_completed(vehicle=vehicle, pin_token=pin_token)
 
     @request_with_active_session
     async def stop_charge(self, vehicle: Vehicle) -> None:
-        self._start_action(f"Stop Charge")
         access_token = await self._get_access_token()
-        pin_token = await self.api.get_pin_token(
-            access_token=access_token, pin=self.pin
-        )
+        pin_token = await self._pin_tokens.get()
         xid = await self.api.stop_charge(
-            saccess_token=access_token,
+            access_token=access_token,
             vehicle_id=vehicle.identifier,
             pin=self.pin,
             pin_token=pin_token,
         )
-        self._current_action.set_xid(xid)
+        vehicle.commands.current.set_xid(xid)
         await self._check_action_completed(vehicle=vehicle, pin_token=pin_token)
 
     @request_with_active_session
@@ -481,28 +459,20 @@ class ApiCloudCa(ApiCloud):
 
     async def _check_action_completed(self, vehicle: Vehicle, pin_token: str) -> None:
         access_token = await self._get_access_token()
-        await sleep(INITIAL_STATUS_DELAY_AFTER_COMMAND)
-        try:
-            completed = await self.api.check_last_action_status(
+        xid = vehicle.commands.current.xid
+
+        async def check_completed() -> bool:
+            return await self.api.check_last_action_status(
                 access_token=access_token,
                 vehicle_id=vehicle.identifier,
                 pin=self.pin,
-                xid=self._current_action.xid,
+                xid=xid,
                 pin_token=pin_token,
             )
-            while not completed:
-                await sleep(RECHECK_STATUS_DELAY_AFTER_COMMAND)
-                completed = await self.api.check_last_action_status(
-                    access_token=access_token,
-                    vehicle_id=vehicle.identifier,
-                    pin=self.pin,
-                    xid=self._current_action.xid,
-                    pin_token=pin_token,
-                )
-        finally:
-            self._current_action.complete()
-            self.publish_updates()
-        await vehicle.update()
+
+        await self._wait_for_action(vehicle, check_completed)
+        if vehicle.confirm_commands:
+            await vehicle.update()
 
     @property
     def region(self) -> str:
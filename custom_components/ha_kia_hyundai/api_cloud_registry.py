@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+
+from datetime import datetime
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .api_cloud import ApiCloud
+from .api_cloud_util import api_cloud_for_region_and_brand
+from .const import SETUP_FAILURE_COOLDOWN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ApiCloudRegistry:
+    """
+    hands every config entry of one owner account the same ApiCloud, so the
+    account logs in once and the vehicles share one session
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass: HomeAssistant = hass
+        self._api_clouds: dict[tuple[str, str, str], ApiCloud] = {}
+        self._reference_counts: dict[tuple[str, str, str], int] = {}
+        self._setup_failed_at: dict[tuple[str, str, str], datetime] = {}
+
+    def acquire(
+        self,
+        region: str,
+        brand: str,
+        username: str,
+        password: str,
+        pin: str = None,
+    ) -> ApiCloud:
+        key = (region, brand, username)
+        api_cloud = self._api_clouds.get(key)
+        if api_cloud is None:
+            _LOGGER.debug(f"creating shared api cloud for {region} {brand}")
+            api_cloud_class = api_cloud_for_region_and_brand(region=region, brand=brand)
+            api_cloud = api_cloud_class(
+                username=username,
+                password=password,
+                hass=self.hass,
+            )
+            self._api_clouds[key] = api_cloud
+            self._reference_counts[key] = 0
+        else:
+            # the newest entry wins when credentials differ between entries
+            api_cloud.password = password
+        if pin is not None:
+            api_cloud.pin = pin
+        self._reference_counts[key] += 1
+        return api_cloud
+
+    async def release(self, api_cloud: ApiCloud) -> None:
+        key = (api_cloud.region, api_cloud.brand, api_cloud.username)
+        if self._api_clouds.get(key) is not api_cloud:
+            return
+        self._reference_counts[key] -= 1
+        if self._reference_counts[key] > 0:
+            return
+        _LOGGER.debug(f"last entry released, cleaning up shared api cloud")
+        del self._api_clouds[key]
+        del self._reference_counts[key]
+        await api_cloud.cleanup()
+
+    def mark_setup_failed(self, api_cloud: ApiCloud) -> None:
+        key = (api_cloud.region, api_cloud.brand, api_cloud.username)
+        self._setup_failed_at[key] = dt_util.utcnow()
+
+    def mark_setup_succeeded(self, api_cloud: ApiCloud) -> None:
+        key = (api_cloud.region, api_cloud.brand, api_cloud.username)
+        self._setup_failed_at.pop(key, None)
+
+    def setup_recently_failed(self, api_cloud: ApiCloud) -> bool:
+        """
+        lets the other entries of an account back off without each of them
+        trying the cloud again
+        """
+        key = (api_cloud.region, api_cloud.brand, api_cloud.username)
+        failed_at = self._setup_failed_at.get(key)
+        return (
+            failed_at is not None
+            and dt_util.utcnow() - failed_at < SETUP_FAILURE_COOLDOWN
+        )
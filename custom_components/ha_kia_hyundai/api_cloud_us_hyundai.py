@@ -8,7 +8,7 @@ from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.util import dt as dt_util
-from datetime import timedelta, datetime
+from datetime import timedelta
 
 from .api_cloud import ApiCloud
 from .vehicle import Vehicle
@@ -19,46 +19,226 @@ from .const import (
     REGION_USA,
 )
 from .util import (
-    convert_last_updated_str_to_datetime,
     safely_get_json_value,
     convert_api_unit_to_ha_unit_of_distance,
 )
+from .timestamps import decode_iso
+
+from .field_mapping import (
+    FieldMapping,
+    MappingTable,
+    KEEP_PREVIOUS,
+    COORDINATE_MAPPING,
+    sort_list_at,
+    first_present_with_unit,
+    sync_date,
+    keep_previous_when,
+    charge_level,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+STATUS = "vehicleStatus"
+EV_STATUS = f"{STATUS}.evStatus"
+RANGE_BY_FUEL = f"{EV_STATUS}.drvDistance.0.rangeByFuel"
+TIRE_LAMP = f"{STATUS}.tirePressureLamp"
+
+
+def _temperature(value: str | None):
+    if value is None:
+        return KEEP_PREVIOUS
+    if value == "LO":
+        return USA_TEMP_RANGE[0]
+    if value == "HI":
+        return USA_TEMP_RANGE[-1]
+    return USA_TEMP_RANGE[int(value.replace("H", ""), 16)]
+
+
+US_HYUNDAI_STATUS_MAPPING = MappingTable(
+    fields=[
+        FieldMapping("tire_all_on", f"{TIRE_LAMP}.tirePressureWarningLampAll", bool),
+        FieldMapping(
+            "tire_front_right_on",
+            f"{TIRE_LAMP}.tirePressureWarningLampFrontRight",
+            bool,
+        ),
+        FieldMapping(
+            "tire_front_left_on", f"{TIRE_LAMP}.tirePressureWarningLampFrontLeft", bool
+        ),
+        FieldMapping(
+            "tire_rear_right_on", f"{TIRE_LAMP}.tirePressureWarningLampRearRight", bool
+        ),
+        FieldMapping(
+            "tire_rear_left_on", f"{TIRE_LAMP}.tirePressureWarningLampRearLeft", bool
+        ),
+        FieldMapping("doors_locked", f"{STATUS}.doorLockStatus", bool),
+        FieldMapping("door_hood_open", f"{STATUS}.hoodOpen", bool),
+        FieldMapping("door_trunk_open", f"{STATUS}.trunkOpen", bool),
+        FieldMapping("door_front_left_open", f"{STATUS}.doorOpen.frontLeft", bool),
+        FieldMapping("door_front_right_open", f"{STATUS}.doorOpen.frontRight", bool),
+        FieldMapping("door_back_left_open", f"{STATUS}.doorOpen.backLeft", bool),
+        FieldMapping("door_back_right_open", f"{STATUS}.doorOpen.backRight", bool),
+        FieldMapping("engine_on", f"{STATUS}.engine", bool),
+        FieldMapping("climate_hvac_on", f"{STATUS}.airCtrlOn", bool),
+        FieldMapping("climate_defrost_on", f"{STATUS}.defrost", bool),
+        FieldMapping(
+            "climate_heated_rear_window_on", f"{STATUS}.sideBackWindowHeat", bool
+        ),
+        FieldMapping("climate_heated_side_mirror_on", f"{STATUS}.sideMirrorHeat", bool),
+        FieldMapping(
+            "climate_heated_steering_wheel_on", f"{STATUS}.steerWheelHeat", bool
+        ),
+        FieldMapping(
+            "climate_heated_seat_front_right_on",
+            f"{STATUS}.seatHeaterVentState.frSeatHeatState",
+            bool,
+        ),
+        FieldMapping(
+            "climate_heated_seat_front_left_on",
+            f"{STATUS}.seatHeaterVentState.flSeatHeatState",
+            bool,
+        ),
+        FieldMapping(
+            "climate_heated_seat_rear_right_on",
+            f"{STATUS}.seatHeaterVentState.rrSeatHeatState",
+            bool,
+        ),
+        FieldMapping(
+            "climate_heated_seat_rear_left_on",
+            f"{STATUS}.seatHeaterVentState.rlSeatHeatState",
+            bool,
+        ),
+        FieldMapping("low_fuel_light_on", f"{STATUS}.lowFuelLight", bool),
+        FieldMapping("ev_battery_charging", f"{EV_STATUS}.batteryCharge", bool),
+        FieldMapping("ev_plugged_in", f"{EV_STATUS}.batteryPlugin", bool),
+        FieldMapping(
+            "ev_battery_level",
+            f"{EV_STATUS}.batteryStatus",
+            int,
+            keep_previous_when(lambda value: value == 0),
+        ),
+        FieldMapping(
+            "ev_remaining_range_value", f"{RANGE_BY_FUEL}.evModeRange.value", float
+        ),
+        FieldMapping(
+            "ev_remaining_range_unit",
+            f"{RANGE_BY_FUEL}.evModeRange.unit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping(
+            "total_range_value", f"{RANGE_BY_FUEL}.totalAvailableRange.value", float
+        ),
+        FieldMapping(
+            "total_range_unit",
+            f"{RANGE_BY_FUEL}.totalAvailableRange.unit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping(
+            "ev_charge_current_remaining_duration",
+            f"{EV_STATUS}.remainTime2.atc.value",
+            int,
+        ),
+        FieldMapping(
+            "ev_charge_fast_duration", f"{EV_STATUS}.remainTime2.etc1.value", int
+        ),
+        FieldMapping(
+            "ev_charge_portable_duration", f"{EV_STATUS}.remainTime2.etc2.value", int
+        ),
+        FieldMapping(
+            "ev_charge_station_duration", f"{EV_STATUS}.remainTime2.etc3.value", int
+        ),
+        FieldMapping(
+            "ev_max_dc_charge_level",
+            f"{EV_STATUS}.targetSOC.0.targetSOClevel",
+            int,
+            charge_level,
+        ),
+        FieldMapping(
+            "ev_max_ac_charge_level",
+            f"{EV_STATUS}.targetSOC.1.targetSOClevel",
+            int,
+            charge_level,
+        ),
+        FieldMapping(
+            "ev_max_range_dc_charge_value",
+            f"{EV_STATUS}.targetSOC.0.dte.rangeByFuel.totalAvailableRange.value",
+            float,
+        ),
+        FieldMapping(
+            "ev_max_range_dc_charge_unit",
+            f"{EV_STATUS}.targetSOC.0.dte.rangeByFuel.totalAvailableRange.unit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping(
+            "ev_max_range_ac_charge_value",
+            f"{EV_STATUS}.targetSOC.1.dte.rangeByFuel.totalAvailableRange.value",
+            float,
+        ),
+        FieldMapping(
+            "ev_max_range_ac_charge_unit",
+            f"{EV_STATUS}.targetSOC.1.dte.rangeByFuel.totalAvailableRange.unit",
+            int,
+            convert_api_unit_to_ha_unit_of_distance,
+        ),
+        FieldMapping("battery_level", f"{STATUS}.battery.batSoc", int),
+        FieldMapping(
+            "climate_temperature_value",
+            f"{STATUS}.airTemp.value",
+            convert=_temperature,
+        ),
+    ],
+    constants={
+        "odometer_unit": LENGTH_MILES,
+        "climate_temperature_unit": TEMP_FAHRENHEIT,
+    },
+    prepare=sort_list_at(f"{EV_STATUS}.targetSOC", sort_key=lambda x: x["plugType"]),
+    derive=[
+        sync_date(f"{STATUS}.dateTime", decode_iso),
+        first_present_with_unit(
+            "fuel_range_value",
+            "fuel_range_unit",
+            candidates=[
+                (f"{STATUS}.dte.value", f"{STATUS}.dte.unit"),
+                (
+                    f"{RANGE_BY_FUEL}.gasModeRange.value",
+                    f"{RANGE_BY_FUEL}.gasModeRange.unit",
+                ),
+            ],
+            cast=float,
+            convert_unit=convert_api_unit_to_ha_unit_of_distance,
+        ),
+    ],
+)
+
 
 class ApiCloudUsHyundai(ApiCloud):
     pin: str = None
     api: UsHyundai = None
     _access_token: str = None
+    hvac_on_force_scan_interval: timedelta = None
+    _odometers: dict[str, float | None] | None = None
 
     def __init__(
         self,
         username: str,
         password: str,
         hass: HomeAssistant,
-        update_interval: timedelta = None,
-        force_scan_interval: timedelta = None,
-        no_force_scan_hour_start: int = None,
-        no_force_scan_hour_finish: int = None,
     ):
         super().__init__(
             username=username,
             password=password,
             hass=hass,
-            update_interval=update_interval,
-            force_scan_interval=force_scan_interval,
-            no_force_scan_hour_start=no_force_scan_hour_start,
-            no_force_scan_hour_finish=no_force_scan_hour_finish,
         )
         client_session = async_get_clientsession(hass)
         self.api: UsHyundai = UsHyundai(client_session=client_session)
-        self.hvac_on_force_scan_interval: timedelta = force_scan_interval
-        self.last_loc_timestamp = datetime.now() - timedelta(hours=3)
 
     async def _get_access_token(self):
-        if self._access_token is None:
-            await self.login()
+        async with self._login_lock:
+            if self._access_token is None:
+                await self.login()
         return self._access_token
 
     async def login(self):
@@ -69,13 +249,25 @@ class ApiCloudUsHyundai(ApiCloud):
         except AuthError as err:
             raise ConfigEntryAuthFailed(err) from err
 
-    async def get_vehicles(self) -> list[Vehicle]:
+    async def _get_enrolled_vehicles(self) -> list[dict]:
         access_token = await self._get_access_token()
         api_vehicles = await self.api.get_vehicles(
             username=self.username, pin=self.pin, access_token=access_token
         )
+        return api_vehicles["enrolledVehicleDetails"]
+
+    async def _get_odometers(self) -> dict[str, float | None]:
+        odometers = {}
+        for response_vehicle in await self._get_enrolled_vehicles():
+            vin = safely_get_json_value(response_vehicle, "vehicleDetails.vin")
+            odometers[vin] = safely_get_json_value(
+                response_vehicle, "vehicleDetails.odometer", float
+            )
+        return odometers
+
+    async def get_vehicles(self) -> list[Vehicle]:
         vehicles = []
-        for response_vehicle in api_vehicles["enrolledVehicleDetails"]:
+        for response_vehicle in await self._get_enrolled_vehicles():
             vehicle = Vehicle(
                 api_cloud=self,
                 identifier=safely_get_json_value(
@@ -94,11 +286,26 @@ class ApiCloudUsHyundai(ApiCloud):
                 response_vehicle, "vehicleDetails.nickName"
             )
             vehicle.odometer_value = safely_get_json_value(
-                response_vehicle, "vehicleDetails.odometer"
+                response_vehicle, "vehicleDetails.odometer", float
             )
             vehicles.append(vehicle)
         return vehicles
 
+    async def update_vehicles(self, vehicles: list[Vehicle]) -> list:
+        # one get_vehicles per cycle supplies the odometer for every vehicle;
+        # without it the status still updates, the odometer waits a cycle
+        try:
+            self._odometers = await self._get_odometers()
+        except ConfigEntryAuthFailed:
+            raise
+        except Exception as error:
+            _LOGGER.warning(f"vehicle list failed, odometers not updated:{error}")
+            self._odometers = {}
+        try:
+            return await super().update_vehicles(vehicles=vehicles)
+        finally:
+            self._odometers = None
+
     async def update(self, vehicle: Vehicle) -> None:
         access_token = await self._get_access_token()
         api_vehicle_status = await self.api.get_cached_vehicle_status(
@@ -109,241 +316,22 @@ class ApiCloudUsHyundai(ApiCloud):
         )
         vehicle.raw_responses = {"status": api_vehicle_status}
 
-        updated_vehicle = await self.get_vehicle(identifier=vehicle.identifier)
-
-        vehicle.last_synced_to_cloud = convert_last_updated_str_to_datetime(
-            last_updated_str=api_vehicle_status["vehicleStatus"]["dateTime"]
-            .replace("-", "")
-            .replace("T", "")
-            .replace(":", "")
-            .replace("Z", ""),
-            timezone_of_str=dt_util.UTC,
-        )
-        previous_odometer_value = vehicle.odometer_value
-        vehicle.odometer_value = updated_vehicle.odometer_value
-        vehicle.odometer_unit = LENGTH_MILES
-
-        vehicle.tire_all_on = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.tirePressureLamp.tirePressureWarningLampAll",
-            bool,
-        )
-        vehicle.tire_front_right_on = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.tirePressureLamp.tirePressureWarningLampFrontRight",
-            bool,
-        )
-        vehicle.tire_front_left_on = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.tirePressureLamp.tirePressureWarningLampFrontLeft",
-            bool,
-        )
-        vehicle.tire_rear_right_on = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.tirePressureLamp.tirePressureWarningLampRearRight",
-            bool,
-        )
-        vehicle.tire_rear_left_on = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.tirePressureLamp.tirePressureWarningLampRearLeft",
-            bool,
-        )
-        vehicle.doors_locked = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.doorLockStatus", bool
-        )
-
-        target_soc = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.targetSOC"
-        )
-        if target_soc is not None:
-            target_soc.sort(key=lambda x: x["plugType"])
-
-        vehicle.door_hood_open = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.hoodOpen", bool
-        )
-        vehicle.door_trunk_open = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.trunkOpen", bool
-        )
-        vehicle.door_front_left_open = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.doorOpen.frontLeft", bool
-        )
-        vehicle.door_front_right_open = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.doorOpen.frontRight", bool
-        )
-        vehicle.door_back_left_open = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.doorOpen.backLeft", bool
-        )
-        vehicle.door_back_right_open = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.doorOpen.backRight", bool
-        )
-        vehicle.engine_on = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.engine", bool
-        )
-        vehicle.climate_hvac_on = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.airCtrlOn", bool
-        )
-        vehicle.climate_defrost_on = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.defrost", bool
-        )
-        vehicle.climate_heated_rear_window_on = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.sideBackWindowHeat", bool
-        )
-        vehicle.climate_heated_side_mirror_on = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.sideMirrorHeat", bool
-        )
-        vehicle.climate_heated_steering_wheel_on = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.steerWheelHeat", bool
-        )
-        vehicle.climate_heated_seat_front_right_on = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.seatHeaterVentState.frSeatHeatState",
-            bool,
-        )
-        vehicle.climate_heated_seat_front_left_on = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.seatHeaterVentState.flSeatHeatState",
-            bool,
-        )
-        vehicle.climate_heated_seat_rear_right_on = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.seatHeaterVentState.rrSeatHeatState",
-            bool,
-        )
-        vehicle.climate_heated_seat_rear_left_on = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.seatHeaterVentState.rlSeatHeatState",
-            bool,
-        )
-        vehicle.low_fuel_light_on = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.lowFuelLight", bool
-        )
-        vehicle.ev_battery_charging = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.batteryCharge", bool
-        )
-        vehicle.ev_plugged_in = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.batteryPlugin", bool
-        )
-
-        ev_battery_level = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.batteryStatus", int
-        )
-        if ev_battery_level != 0:
-            vehicle.ev_battery_level = ev_battery_level
-        vehicle.ev_remaining_range_value = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.evModeRange.value",
-            float,
-        )
-        vehicle.ev_remaining_range_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_status,
-                "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.evModeRange.unit",
-                int,
-            )
-        )
-        vehicle.total_range_value = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.totalAvailableRange.value",
-            float,
-        )
-        vehicle.total_range_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_status,
-                "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.totalAvailableRange.unit",
-                int,
-            )
-        )
-        vehicle.ev_charge_current_remaining_duration = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.remainTime2.atc.value", int
-        )
-        vehicle.ev_charge_fast_duration = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.remainTime2.etc1.value", int
-        )
-        vehicle.ev_charge_portable_duration = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.remainTime2.etc2.value", int
-        )
-        vehicle.ev_charge_station_duration = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.remainTime2.etc3.value", int
-        )
-        ev_max_dc_charge_level = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.targetSOC.0.targetSOClevel", int
-        )
-        if ev_max_dc_charge_level is not None and ev_max_dc_charge_level <= 100:
-            vehicle.ev_max_dc_charge_level = ev_max_dc_charge_level
-        ev_max_ac_charge_level = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.evStatus.targetSOC.1.targetSOClevel", int
-        )
-        if ev_max_ac_charge_level is not None and ev_max_ac_charge_level <= 100:
-            vehicle.ev_max_ac_charge_level = ev_max_ac_charge_level
-        vehicle.ev_max_range_dc_charge_value = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.evStatus.targetSOC.0.dte.rangeByFuel.totalAvailableRange.value",
-            float,
-        )
-        vehicle.ev_max_range_dc_charge_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_status,
-                "vehicleStatus.evStatus.targetSOC.0.dte.rangeByFuel.totalAvailableRange.unit",
-                int,
-            )
-        )
-        vehicle.ev_max_range_ac_charge_value = safely_get_json_value(
-            api_vehicle_status,
-            "vehicleStatus.evStatus.targetSOC.1.dte.rangeByFuel.totalAvailableRange.value",
-            float,
-        )
-        vehicle.ev_max_range_ac_charge_unit = convert_api_unit_to_ha_unit_of_distance(
-            safely_get_json_value(
-                api_vehicle_status,
-                "vehicleStatus.evStatus.targetSOC.1.dte.rangeByFuel.totalAvailableRange.unit",
-                int,
-            )
-        )
-        vehicle.battery_level = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.battery.batSoc", int
-        )
+        odometers = self._odometers
+        if odometers is None:
+            odometers = await self._get_odometers()
 
-        temp_value = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.airTemp.value"
-        )
-        if temp_value is not None:
-            if temp_value == "LO":
-                vehicle.climate_temperature_value = USA_TEMP_RANGE[0]
-            elif temp_value == "HI":
-                vehicle.climate_temperature_value = USA_TEMP_RANGE[-1]
-            else:
-                temp_value = temp_value.replace("H", "")
-                vehicle.climate_temperature_value = USA_TEMP_RANGE[int(temp_value, 16)]
-        vehicle.climate_temperature_unit = TEMP_FAHRENHEIT
-
-        non_ev_fuel_distance = safely_get_json_value(
-            api_vehicle_status, "vehicleStatus.dte.value", float
-        )
-        if non_ev_fuel_distance is not None:
-            vehicle.fuel_range_value = safely_get_json_value(
-                api_vehicle_status, "vehicleStatus.dte.value", float
-            )
-            vehicle.fuel_range_unit = convert_api_unit_to_ha_unit_of_distance(
-                safely_get_json_value(api_vehicle_status, "vehicleStatus.dte.unit", int)
-            )
-        else:
-            vehicle.fuel_range_value = safely_get_json_value(
-                api_vehicle_status,
-                "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.gasModeRange.value",
-                float,
-            )
-            vehicle.fuel_range_unit = convert_api_unit_to_ha_unit_of_distance(
-                safely_get_json_value(
-                    api_vehicle_status,
-                    "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.gasModeRange.unit",
-                    int,
-                )
+        if vehicle.identifier in odometers:
+            vehicle.odometer_value = odometers[vehicle.identifier]
+        elif odometers:
+            # an empty one means the list failed, that was logged once already
+            _LOGGER.warning(
+                f"{vehicle.identifier} missing from the account's vehicles, odometer not updated"
             )
+        US_HYUNDAI_STATUS_MAPPING.apply(vehicle, api_vehicle_status)
 
-        if (
-            previous_odometer_value is None
-            or previous_odometer_value > vehicle.odometer_value
-            and (self.last_loc_timestamp < datetime.now() - timedelta(hours=1))
+        if vehicle.location_fix_due() and (
+            vehicle.last_loc_timestamp is None
+            or vehicle.last_loc_timestamp < dt_util.utcnow() - timedelta(hours=1)
         ):
             try:
                 previous_latitude = vehicle.latitude
@@ -356,25 +344,13 @@ class ApiCloudUsHyundai(ApiCloud):
                 )
                 vehicle.raw_responses["location"] = api_vehicle_location
 
-                vehicle.latitude = safely_get_json_value(
-                    api_vehicle_location, "coord.lat", float
-                )
-                vehicle.longitude = safely_get_json_value(
-                    api_vehicle_location, "coord.lon", float
-                )
-                if (
-                    (
-                        vehicle.latitude != previous_latitude
-                        or vehicle.longitude != previous_longitude
-                    )
-                    and vehicle.latitude is not None
-                    and vehicle.longitude is not None
-                ):
-                    await vehicle.update_location_name()
+                COORDINATE_MAPPING.apply(vehicle, api_vehicle_location)
+                vehicle.update_position(previous_latitude, previous_longitude)
             except RateError:
-                self.last_loc_timestamp = datetime.now() + timedelta(hours=11)
+                vehicle.last_loc_timestamp = dt_util.utcnow() + timedelta(hours=11)
+                vehicle.async_schedule_save()
                 _LOGGER.warning(
-                    f"get vehicle location rate limit exceeded.  Location will not be fetched until at least {self.last_loc_timestamp + timedelta(hours=1)}"
+                    f"get vehicle location rate limit exceeded.  Location will not be fetched until at least {vehicle.last_loc_timestamp + timedelta(hours=1)}"
                 )
 
     async def request_sync(self, vehicle: Vehicle) -> None:
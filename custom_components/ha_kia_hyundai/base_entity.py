@@ -1,4 +1,7 @@
+from __future__ import annotations
+
 import logging
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
@@ -23,10 +26,32 @@ class DeviceInfoMixin:
 
 
 class BaseEntity(CoordinatorEntity[Vehicle], DeviceInfoMixin, Entity):
+    # vehicle fields backing the state, None writes on every update
+    _tracked_fields: tuple[str, ...] | None = None
+    _written_available: bool | None = None
+
     def __init__(self, vehicle: Vehicle):
         super().__init__(vehicle.coordinator)
         self._vehicle: Vehicle = vehicle
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        available = self.available
+        if (
+            self._tracked_fields is not None
+            and available == self._written_available
+            and not self._vehicle.fields_changed(self._tracked_fields)
+        ):
+            return
+        self._written_available = available
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self):
+        if self._vehicle.restored_from_snapshot:
+            return {"restored_from_snapshot": True}
+        return None
+
     async def async_update(self) -> None:
         """
         disable generic update method ...
@@ -1,6 +1,6 @@
 import logging
-import json
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.components.binary_sensor import (
@@ -49,10 +49,30 @@ async def async_setup_entry(
 
     async_add_entities(binary_sensors, True)
     async_add_entities([DebugRawEntity(vehicle)], True)
+    _async_migrate_api_action_unique_id(hass, vehicle)
     async_add_entities([DebugMappedEntity(vehicle)], True)
     async_add_entities([APIActionInProgress(vehicle)], True)
 
 
+def _async_migrate_api_action_unique_id(hass: HomeAssistant, vehicle: Vehicle):
+    """
+    the api action sensor used to be one per install; the first vehicle
+    set up takes over its registry entry so history and customizations
+    carry over
+    """
+    registry = er.async_get(hass)
+    old_entity_id = registry.async_get_entity_id(
+        "binary_sensor", DOMAIN, f"{DOMAIN}-API-action-in-progress"
+    )
+    if old_entity_id is None:
+        return
+    new_unique_id = f"{DOMAIN}-{vehicle.identifier}-API-action-in-progress"
+    if registry.async_get_entity_id("binary_sensor", DOMAIN, new_unique_id):
+        return
+    _LOGGER.debug(f"migrating {old_entity_id} to unique id {new_unique_id}")
+    registry.async_update_entity(old_entity_id, new_unique_id=new_unique_id)
+
+
 class InstrumentSensor(BaseEntity):
     def __init__(
         self,
@@ -69,6 +89,7 @@ class InstrumentSensor(BaseEntity):
         self._attr_name = f"{vehicle.name} {description}"
 
         self._key = key
+        self._tracked_fields = (key,)
         self._on_icon = on_icon
         self._off_icon = off_icon
 
@@ -96,6 +117,7 @@ class DebugRawEntity(BaseEntity):
         super().__init__(vehicle)
         self._attr_unique_id = f"{DOMAIN}-{vehicle.identifier}-all-data-raw"
         self._attr_name = f"{vehicle.name} DEBUG DATA RAW"
+        self._tracked_fields = ("raw_responses",)
 
     @property
     def state(self):
@@ -107,7 +129,10 @@ class DebugRawEntity(BaseEntity):
 
     @property
     def state_attributes(self):
-        return {"raw_responses": json.dumps(self._vehicle.raw_responses)}
+        # payloads themselves are served through diagnostics
+        if self._vehicle.raw_response_buffer is None:
+            return {"retention": "off"}
+        return self._vehicle.raw_response_buffer.summary()
 
 
 class DebugMappedEntity(BaseEntity):
@@ -115,6 +140,7 @@ class DebugMappedEntity(BaseEntity):
         super().__init__(vehicle)
         self._attr_unique_id = f"{DOMAIN}-{vehicle.identifier}-all-data-mapped"
         self._attr_name = f"{vehicle.name} DEBUG DATA MAPPED"
+        self._tracked_fields = tuple(vehicle.__repr__())
 
     @property
     def state(self):
@@ -134,7 +160,7 @@ class APIActionInProgress(DeviceInfoMixin, Entity):
 
     def __init__(self, vehicle: Vehicle):
         self._vehicle = vehicle
-        self._attr_unique_id = f"{DOMAIN}-API-action-in-progress"
+        self._attr_unique_id = f"{DOMAIN}-{vehicle.identifier}-API-action-in-progress"
         self._attr_device_class = DEVICE_CLASS_CONNECTIVITY
         self._attr_available = False
         self._attr_name = None
@@ -142,14 +168,16 @@ class APIActionInProgress(DeviceInfoMixin, Entity):
         self._is_on = False
 
     async def async_added_to_hass(self) -> None:
-        self._vehicle.api_cloud.register_callback(self.async_write_ha_state)
+        self._vehicle.commands.register_callback(self.async_write_ha_state)
 
     async def async_will_remove_from_hass(self) -> None:
-        self._vehicle.api_cloud.remove_callback(self.async_write_ha_state)
+        self._vehicle.commands.remove_callback(self.async_write_ha_state)
 
     @property
     def name(self) -> str:
-        return f"API Action ({self._vehicle.api_cloud.current_action_name()})"
+        return (
+            f"{self._vehicle.name} API Action ({self._vehicle.commands.current_name()})"
+        )
 
     @property
     def available(self) -> bool:
@@ -165,4 +193,12 @@ class APIActionInProgress(DeviceInfoMixin, Entity):
 
     @property
     def is_on(self) -> bool:
-        return not not self._vehicle and self._vehicle.api_cloud.action_in_progress()
+        return not not self._vehicle and self._vehicle.commands.in_progress()
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "queue_depth": self._vehicle.commands.depth,
+            "current_command": self._vehicle.commands.current_name(),
+            "queued_commands": self._vehicle.commands.pending_names(),
+        }
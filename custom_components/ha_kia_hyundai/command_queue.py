@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .api_action_status import ApiActionStatus
+from .callbacks import CallbacksMixin
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandSuperseded(HomeAssistantError):
+    """
+    a newer command of the same group replaced this one before it was sent
+    """
+
+
+class QueuedCommand:
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[None]],
+        group: str | None,
+        arguments: tuple,
+        satisfied: Callable[[], bool] | None,
+    ):
+        self.name: str = name
+        self.run: Callable[[], Awaitable[None]] = run
+        self.group: str | None = group
+        self.key: tuple[str, tuple] = (name, arguments)
+        self.satisfied: Callable[[], bool] | None = satisfied
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def resolve(self, result: Any = None) -> None:
+        if not self.done.done():
+            self.done.set_result(result)
+
+    def fail(self, error: Exception) -> None:
+        if not self.done.done():
+            self.done.set_exception(error)
+
+
+class CommandQueue(CallbacksMixin):
+    """
+    commands for one vehicle, run one at a time in the order they came in;
+    queues of different vehicles run side by side. a command already
+    waiting or running is joined rather than queued twice, a newer command
+    of the same group (lock and unlock, start and stop climate) replaces a
+    waiting one, and a command whose outcome the vehicle already shows is
+    skipped. a running command of the group was already sent and can't be
+    taken back, so the newer one queues behind it
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str):
+        self.hass: HomeAssistant = hass
+        self.name: str = name
+        self.pending: deque[QueuedCommand] = deque()
+        self.current: ApiActionStatus | None = None
+        self._running: QueuedCommand | None = None
+        self._worker: asyncio.Task | None = None
+
+    async def run(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[None]],
+        group: str | None = None,
+        arguments: tuple = (),
+        satisfied: Callable[[], bool] | None = None,
+    ) -> None:
+        """
+        queues the command and waits for its turn and its result; raises
+        CommandSuperseded when a newer command replaced it before it was sent
+        """
+        command = QueuedCommand(name, run, group, arguments, satisfied)
+        for queued in [self._running, *self.pending]:
+            if queued is not None and queued.key == command.key:
+                _LOGGER.debug(f"{self.name} {name} already queued, joining it")
+                await asyncio.shield(queued.done)
+                return
+        if group is not None:
+            for pending in [
+                pending for pending in self.pending if pending.group == group
+            ]:
+                _LOGGER.debug(f"{self.name} {pending.name} superseded by {name}")
+                self.pending.remove(pending)
+                pending.fail(CommandSuperseded(f"{pending.name} superseded by {name}"))
+        self.pending.append(command)
+        _LOGGER.debug(f"{self.name} queued {name}, {self.depth} in queue")
+        if self._worker is None or self._worker.done():
+            self._worker = self.hass.async_create_task(self._async_work())
+        self.publish_updates()
+        # one caller giving up doesn't cancel the command for the others
+        await asyncio.shield(command.done)
+
+    async def _async_work(self) -> None:
+        while self.pending:
+            command = self.pending.popleft()
+            if command.satisfied is not None and command.satisfied():
+                _LOGGER.debug(f"{self.name} skipping {command.name}, already done")
+                command.resolve()
+                self.publish_updates()
+                continue
+            self.current = ApiActionStatus(command.name)
+            self._running = command
+            self.publish_updates()
+            try:
+                await command.run()
+            except Exception as error:
+                command.fail(error)
+            else:
+                command.resolve()
+            finally:
+                self.current = None
+                self._running = None
+                self.publish_updates()
+
+    def in_progress(self) -> bool:
+        return self.current is not None and not (
+            self.current.completed() or self.current.expired()
+        )
+
+    @property
+    def depth(self) -> int:
+        return len(self.pending) + (1 if self.current is not None else 0)
+
+    def current_name(self) -> str:
+        if self.in_progress():
+            return self.current.name
+        return "None"
+
+    def pending_names(self) -> list[str]:
+        return [command.name for command in self.pending]
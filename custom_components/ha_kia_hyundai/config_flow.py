@@ -20,6 +20,11 @@ from .const import (
     DEFAULT_NO_FORCE_SCAN_HOUR_START,
     CONF_NO_FORCE_SCAN_HOUR_FINISH,
     DEFAULT_NO_FORCE_SCAN_HOUR_FINISH,
+    CONF_RETAIN_RAW_RESPONSES,
+    DEFAULT_RETAIN_RAW_RESPONSES,
+    CONF_CONFIRM_COMMANDS,
+    DEFAULT_CONFIRM_COMMANDS,
+    CONF_DAILY_REQUEST_LIMIT,
     DOMAIN,
     CONFIG_FLOW_VERSION,
     CONF_VEHICLES,
@@ -68,6 +73,29 @@ class KiaUvoOptionFlowHandler(config_entries.OptionsFlow):
                         DEFAULT_NO_FORCE_SCAN_HOUR_FINISH,
                     ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=1, max=23)),
+                vol.Optional(
+                    CONF_RETAIN_RAW_RESPONSES,
+                    default=self.config_entry.options.get(
+                        CONF_RETAIN_RAW_RESPONSES,
+                        DEFAULT_RETAIN_RAW_RESPONSES,
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_CONFIRM_COMMANDS,
+                    default=self.config_entry.options.get(
+                        CONF_CONFIRM_COMMANDS,
+                        DEFAULT_CONFIRM_COMMANDS,
+                    ),
+                ): bool,
+                # left empty the account isn't budgeted
+                vol.Optional(
+                    CONF_DAILY_REQUEST_LIMIT,
+                    description={
+                        "suggested_value": self.config_entry.options.get(
+                            CONF_DAILY_REQUEST_LIMIT
+                        )
+                    },
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=10000)),
             }
         )
 
@@ -28,6 +28,9 @@ CONF_VEHICLES: str = "vehicles"
 CONF_VEHICLE_IDENTIFIER: str = "vehicle_identifier"
 CONF_BRAND: str = "brand"
 CONF_PIN: str = "pin"
+CONF_RETAIN_RAW_RESPONSES: str = "retain_raw_responses"
+CONF_CONFIRM_COMMANDS: str = "confirm_commands"
+CONF_DAILY_REQUEST_LIMIT: str = "daily_request_limit"
 
 # I have seen that many people can survive with receiving updates in every 30 minutes. Let's see how KIA will respond
 DEFAULT_SCAN_INTERVAL: int = 30
@@ -35,11 +38,16 @@ DEFAULT_SCAN_INTERVAL: int = 30
 DEFAULT_FORCE_SCAN_INTERVAL: int = 240
 DEFAULT_NO_FORCE_SCAN_HOUR_START: int = 18
 DEFAULT_NO_FORCE_SCAN_HOUR_FINISH: int = 6
+DEFAULT_RETAIN_RAW_RESPONSES: bool = False
+DEFAULT_CONFIRM_COMMANDS: bool = False
 
 # Integration Setting Constants
 CONFIG_FLOW_VERSION: int = 2
 PLATFORMS = ["binary_sensor", "device_tracker", "sensor", "lock"]
 
+# Event fired once per update with every vehicle field that changed
+EVENT_VEHICLE_CHANGED: str = f"{DOMAIN}_vehicle_changed"
+
 # Home Assistant Data Storage Constants
 DATA_VEHICLE_INSTANCE: str = "vehicle"  # Vehicle Instance
 DATA_VEHICLE_LISTENER: str = (
@@ -48,13 +56,93 @@ DATA_VEHICLE_LISTENER: str = (
 DATA_CONFIG_UPDATE_LISTENER: str = (
     "config_update_listener"  # Config Options Update Listener Unsubscribe Caller
 )
+DATA_API_CLOUD_REGISTRY: str = (
+    "api_cloud_registry"  # Shared ApiCloud per Account, across Config Entries
+)
+DATA_POLL_SCHEDULER: str = "poll_scheduler"  # Integration Wide Poll Scheduler
+
+DATA_STORAGE: str = "storage"  # Persisted Bookkeeping
+DATA_GEOCODER: str = "geocoder"  # Shared Rate Limited Reverse Geocoder
+DATA_KNOWN_PLACES: str = "known_places"  # Zones and Named Places
+DATA_SETUP_SEMAPHORE: str = "setup_semaphore"  # Caps Concurrent Cloud Setups
+
+# setup retry constants
+MAX_CONCURRENT_SETUPS: int = 2
+SETUP_FAILURE_COOLDOWN: timedelta = timedelta(minutes=1)
+
+# vehicle snapshots kept to diff against
+SNAPSHOT_HISTORY_SIZE: int = 5
+
+# raw api payloads kept for diagnostics when retention is turned on
+RAW_RESPONSE_BUFFER_MAX_BYTES: int = 256 * 1024
+RAW_RESPONSE_BUFFER_MAX_ENTRIES: int = 20
+
+# reverse geocoding constants, a cell is roughly 50m across
+GEOCODE_CACHE_SIZE: int = 1000
+GEOCODE_CELL_DEGREES: float = 0.0005
+NOMINATIM_REVERSE_URL: str = "https://nominatim.openstreetmap.org/reverse"
+NOMINATIM_USER_AGENT: str = "ha_kia_hyundai"
+GEOCODE_MIN_INTERVAL_SECONDS: float = 1.0
+GEOCODE_TIMEOUT_SECONDS: int = 10
+PLACE_INDEX_CELL_DEGREES: float = 0.01
+PLACE_INDEX_MAX_CELLS_PER_PLACE: int = 64
+DEFAULT_NAMED_PLACE_RADIUS: int = 100
+
+# motion detection constants, odometer in whatever unit the car reports
+MOTION_MIN_DISTANCE_METERS: float = 30.0
+MOTION_MAX_NOISE_METERS: float = 150.0
+MOTION_NOISE_FACTOR: float = 3.0
+MOTION_NOISE_SMOOTHING: float = 0.2
+MOTION_DWELL_TIME: timedelta = timedelta(minutes=10)
+MOTION_ODOMETER_THRESHOLD: float = 0.1
+
+# storage constants
+STORAGE_VERSION: int = 1
+STORAGE_SAVE_DELAY: int = 60
+
+# poll scheduling constants
+MIN_POLL_SPACING: timedelta = timedelta(minutes=1)
+POLL_JITTER_SECONDS: int = 90
+POLL_RETRY_BACKOFF: timedelta = timedelta(minutes=2)
+
+# request budget constants; none of these clouds publishes its quota, so
+# accounts are only budgeted once the daily request limit option is set
+REQUEST_BUDGET_RESERVE_FRACTION: float = 0.1
+# how early a scheduled call may come and still count as due, covers the jitter
+BUDGET_DUE_ALLOWANCE: float = 0.1
+REQUEST_SYNC_BUDGET_COST: int = 3
+ACTION_BUDGET_COST: int = 2
+
+# polling policy constants
+ACTIVE_REFRESH_INTERVAL: timedelta = timedelta(minutes=5)
+CHARGING_REFRESH_INTERVAL: timedelta = timedelta(minutes=15)
+CHARGING_FORCE_SCAN_INTERVAL: timedelta = timedelta(minutes=60)
+RECENT_ACTION_WINDOW: timedelta = timedelta(minutes=15)
+RECENT_MOVEMENT_WINDOW: timedelta = timedelta(minutes=30)
+DORMANT_AFTER: timedelta = timedelta(hours=2)
+DORMANT_INTERVAL_MULTIPLIER: int = 3
 
 # action status delay constants
 INITIAL_STATUS_DELAY_AFTER_COMMAND: int = 15
 RECHECK_STATUS_DELAY_AFTER_COMMAND: int = 10
 ACTION_LOCK_TIMEOUT_IN_SECONDS: int = 5 * 604
+ACTION_MIN_INITIAL_DELAY: int = 5
+ACTION_MAX_INITIAL_DELAY: int = 60
+ACTION_MAX_RECHECK_DELAY: int = 60
+ACTION_COMPLETION_DEADLINE: int = 5 * 60
+ACTION_COMPLETION_SAMPLES: int = 20
+ACTION_EARLY_COMPLETION_FACTOR: float = 0.8
+COMMAND_STATE_TRUST_WINDOW: timedelta = timedelta(minutes=10)
 REQUEST_TO_SYNC_COOLDOWN: timedelta = timedelta(minutes=15)
 
+# optimistic command state constants
+OPTIMISTIC_STATE_TTL: timedelta = timedelta(minutes=30)
+
+# canadian pin token constants
+PIN_TOKEN_LIFETIME: timedelta = timedelta(minutes=10)
+PIN_TOKEN_EXPIRY_MARGIN: timedelta = timedelta(seconds=30)
+PIN_TOKEN_REFRESH_AHEAD: timedelta = timedelta(minutes=1)
+
 # Sensor Specific Constants
 DATE_FORMAT: str = "%Y-%m-%d %H:%M:%S.%f"
 
@@ -414,6 +502,8 @@ SERVICE_NAME_STOP_CLIMATE = "stop_climate"
 SERVICE_NAME_START_CHARGE = "start_charge"
 SERVICE_NAME_STOP_CHARGE = "stop_charge"
 SERVICE_NAME_SET_CHARGE_LIMITS = "set_charge_limits"
+SERVICE_NAME_ADD_NAMED_PLACE = "add_named_place"
+SERVICE_NAME_REMOVE_NAMED_PLACE = "remove_named_place"
 
 SERVICE_ATTRIBUTE_TEMPERATURE = "temperature"
 SERVICE_ATTRIBUTE_DEFROST = "defrost"
@@ -422,3 +512,7 @@ SERVICE_ATTRIBUTE_HEATING = "heating"
 SERVICE_ATTRIBUTE_DURATION = "duration"
 SERVICE_ATTRIBUTE_AC_LIMIT = "ac_limit"
 SERVICE_ATTRIBUTE_DC_LIMIT = "dc_limit"
+SERVICE_ATTRIBUTE_NAME = "name"
+SERVICE_ATTRIBUTE_LATITUDE = "latitude"
+SERVICE_ATTRIBUTE_LONGITUDE = "longitude"
+SERVICE_ATTRIBUTE_RADIUS = "radius"
@@ -25,12 +25,22 @@ async def async_setup_entry(
 
 
 class LocationTracker(BaseEntity, TrackerEntity):
+    _tracked_fields = ("latitude", "longitude", "location_name")
+
     def __init__(self, vehicle: Vehicle):
         super().__init__(vehicle)
         self._attr_unique_id = f"{DOMAIN}-{vehicle.identifier}-location"
         self._attr_name = f"{vehicle.name} Location"
         self._attr_icon = "mdi:map-marker-outline"
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._vehicle.location_updates.register_callback(self.async_write_ha_state)
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        self._vehicle.location_updates.remove_callback(self.async_write_ha_state)
+
     @property
     def source_type(self):
         return SOURCE_TYPE_GPS
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .vehicle import Vehicle
+from .const import (
+    DOMAIN,
+    DATA_VEHICLE_INSTANCE,
+    CONF_VEHICLE_IDENTIFIER,
+    CONF_PIN,
+)
+
+TO_REDACT = {
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_PIN,
+    "vin",
+    "key",
+    "vehicleKey",
+    "regid",
+    "latitude",
+    "longitude",
+    "location_name",
+    "lat",
+    "lon",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict:
+    vehicle: Vehicle = hass.data[DOMAIN][config_entry.data[CONF_VEHICLE_IDENTIFIER]][
+        DATA_VEHICLE_INSTANCE
+    ]
+    raw_responses = None
+    if vehicle.raw_response_buffer is not None:
+        raw_responses = vehicle.raw_response_buffer.entries()
+    return async_redact_data(
+        {
+            "config_entry": {
+                "data": dict(config_entry.data),
+                "options": dict(config_entry.options),
+            },
+            "vehicle": vehicle.__repr__(),
+            "raw_responses": raw_responses,
+        },
+        TO_REDACT,
+    )
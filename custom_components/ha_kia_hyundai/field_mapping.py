@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import logging
+
+from typing import Any, Callable, NamedTuple
+
+_LOGGER = logging.getLogger(__name__)
+
+# returned by a converter to leave the vehicle field as it was
+KEEP_PREVIOUS = object()
+
+
+class FieldMapping(NamedTuple):
+    """
+    where a vehicle field lives in an api response; cast runs on present
+    values only, convert (unit conversion or any other post processing) runs
+    on every value including None
+    """
+
+    field: str
+    path: str
+    cast: Callable[[Any], Any] | None = None
+    convert: Callable[[Any], Any] | None = None
+
+
+class MappingTable:
+    """
+    a region's response layout, compiled once at import and applied to a
+    response in a single pass
+    """
+
+    def __init__(
+        self,
+        fields: list[FieldMapping],
+        constants: dict[str, Any] | None = None,
+        prepare: Callable[[dict], None] | None = None,
+        derive: list[Callable[[Any, dict], None]] | None = None,
+    ):
+        self.fields: tuple[str, ...] = tuple(mapping.field for mapping in fields)
+        self._accessors: tuple = tuple(
+            (
+                mapping.field,
+                compile_path(mapping.path),
+                mapping.cast,
+                mapping.convert,
+            )
+            for mapping in fields
+        )
+        self._constants: tuple = tuple((constants or {}).items())
+        self._prepare = prepare
+        self._derive: tuple = tuple(derive or ())
+
+    def apply(self, vehicle, response: dict) -> None:
+        if self._prepare is not None:
+            self._prepare(response)
+        for field, get_value, cast, convert in self._accessors:
+            value = get_value(response)
+            if value is not None and cast is not None:
+                value = cast(value)
+            if convert is not None:
+                value = convert(value)
+            if value is not KEEP_PREVIOUS:
+                setattr(vehicle, field, value)
+        for field, value in self._constants:
+            setattr(vehicle, field, value)
+        for derive in self._derive:
+            derive(vehicle, response)
+
+
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """
+    dotted path to an accessor; numeric parts index lists, a missing key or
+    index anywhere along the way gives None
+    """
+    steps = tuple(int(part) if part.isdigit() else part for part in path.split("."))
+
+    def get_value(data):
+        try:
+            for step in steps:
+                data = data[step]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return data
+
+    return get_value
+
+
+def sort_list_at(path: str, sort_key: Callable[[Any], Any]) -> Callable[[dict], None]:
+    get_list = compile_path(path)
+
+    def prepare(response: dict) -> None:
+        values = get_list(response)
+        if values is not None:
+            values.sort(key=sort_key)
+
+    return prepare
+
+
+def keep_previous_when(predicate: Callable[[Any], bool]) -> Callable[[Any], Any]:
+    def convert(value):
+        if predicate(value):
+            return KEEP_PREVIOUS
+        return value
+
+    return convert
+
+
+def first_present_with_unit(
+    field: str,
+    unit_field: str,
+    candidates: list[tuple[str, str]],
+    cast: Callable[[Any], Any],
+    convert_unit: Callable[[Any], Any],
+) -> Callable[[Any, dict], None]:
+    """
+    value and unit from the first (value path, unit path) pair with a value,
+    the last pair when none has one
+    """
+    accessors = [
+        (compile_path(value_path), compile_path(unit_path))
+        for value_path, unit_path in candidates
+    ]
+
+    def derive(vehicle, response: dict) -> None:
+        for get_value, get_unit in accessors:
+            value = get_value(response)
+            if value is not None:
+                break
+        unit = get_unit(response)
+        setattr(vehicle, field, cast(value) if value is not None else None)
+        setattr(
+            vehicle, unit_field, convert_unit(int(unit) if unit is not None else None)
+        )
+
+    return derive
+
+
+def sync_date(path: str, decoder: Callable[[str], Any]) -> Callable[[Any, dict], None]:
+    """
+    last_synced_to_cloud, decoded through the vehicle's memo; a missing sync
+    date keeps the previous one
+    """
+    get_value = compile_path(path)
+
+    def derive(vehicle, response: dict) -> None:
+        value = get_value(response)
+        if value is not None:
+            vehicle.last_synced_to_cloud = vehicle.sync_date_memo.decode(value, decoder)
+
+    return derive
+
+
+def charge_level(value: int | None) -> int | Any:
+    # out of range levels come from plug types the car doesn't report on
+    if value is None or value > 100:
+        return KEEP_PREVIOUS
+    return value
+
+
+# location responses look the same in every region that fetches them apart
+COORDINATE_MAPPING = MappingTable(
+    fields=[
+        FieldMapping("latitude", "coord.lat", float),
+        FieldMapping("longitude", "coord.lon", float),
+    ]
+)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import logging
+import math
+
+from collections import OrderedDict
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+    GEOCODE_CACHE_SIZE,
+    GEOCODE_CELL_DEGREES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GeocodeCache:
+    """
+    location names by grid cell, least recently used evicted first; a car
+    parked where it has been before resolves without a network call
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_entries: int = GEOCODE_CACHE_SIZE,
+        cell_degrees: float = GEOCODE_CELL_DEGREES,
+    ):
+        self.max_entries: int = max_entries
+        self.cell_degrees: float = cell_degrees
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.geocode_cache")
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if data is None or data.get("cell_degrees") != self.cell_degrees:
+            # cells of another size don't line up with ours
+            return
+        self._entries.update(data["entries"])
+        self._evict()
+
+    def cell(self, latitude: float, longitude: float) -> str:
+        return (
+            f"{math.floor(latitude / self.cell_degrees)}:"
+            f"{math.floor(longitude / self.cell_degrees)}"
+        )
+
+    def get(self, latitude: float, longitude: float) -> str | None:
+        cell = self.cell(latitude, longitude)
+        name = self._entries.get(cell)
+        if name is not None:
+            self._entries.move_to_end(cell)
+        return name
+
+    def put(self, latitude: float, longitude: float, name: str) -> None:
+        cell = self.cell(latitude, longitude)
+        self._entries[cell] = name
+        self._entries.move_to_end(cell)
+        self._evict()
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        # oldest first, so loading keeps the eviction order
+        return {
+            "cell_degrees": self.cell_degrees,
+            "entries": list(self._entries.items()),
+        }
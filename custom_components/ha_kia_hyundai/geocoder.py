@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from contextlib import suppress
+from aiohttp import ClientError, ClientSession, ClientTimeout
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .geocode_cache import GeocodeCache
+from .places import KnownPlaces
+from .vehicle import Vehicle
+from .const import (
+    NOMINATIM_REVERSE_URL,
+    NOMINATIM_USER_AGENT,
+    GEOCODE_MIN_INTERVAL_SECONDS,
+    GEOCODE_TIMEOUT_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Geocoder:
+    """
+    reverse geocoding for every vehicle and account; known places first,
+    then the cache, then nominatim over home assistant's shared session,
+    one request a second as its usage policy asks, with concurrent lookups
+    of a cell merged into one; vehicles are named by a background worker
+    so a slow lookup never holds up a refresh
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, cache: GeocodeCache, known_places: KnownPlaces
+    ):
+        self.hass: HomeAssistant = hass
+        self.cache: GeocodeCache = cache
+        self.known_places: KnownPlaces = known_places
+        self._session: ClientSession = async_get_clientsession(hass)
+        self._request_lock: asyncio.Lock = asyncio.Lock()
+        self._last_request_at: float = 0.0
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._queued: dict[str, Vehicle] = {}
+        self._worker: asyncio.Task | None = None
+
+    @callback
+    def async_start(self) -> None:
+        self._worker = self.hass.loop.create_task(self._async_work())
+
+    async def async_stop(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._worker
+        self._worker = None
+
+    @callback
+    def enqueue(self, vehicle: Vehicle) -> None:
+        """
+        names the vehicle's position in the background; a vehicle already
+        waiting keeps its place and is looked up where it is by then
+        """
+        if vehicle.identifier in self._queued:
+            return
+        self._queued[vehicle.identifier] = vehicle
+        self._queue.put_nowait(vehicle.identifier)
+
+    async def _async_work(self) -> None:
+        while True:
+            identifier = await self._queue.get()
+            vehicle = self._queued.pop(identifier)
+            latitude, longitude = vehicle.latitude, vehicle.longitude
+            if latitude is None or longitude is None:
+                continue
+            try:
+                location_name = await self.async_reverse(latitude, longitude)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                _LOGGER.exception(f"{identifier} location name lookup failed")
+                continue
+            if location_name is not None:
+                vehicle.set_location_name(latitude, longitude, location_name)
+
+    async def async_reverse(self, latitude: float, longitude: float) -> str | None:
+        place = self.known_places.find(latitude, longitude)
+        if place is not None:
+            return place.name
+        cached_name = self.cache.get(latitude, longitude)
+        if cached_name is not None:
+            return cached_name
+        cell = self.cache.cell(latitude, longitude)
+        lookup = self._in_flight.get(cell)
+        if lookup is None:
+            lookup = self.hass.async_create_task(
+                self._async_lookup(latitude, longitude)
+            )
+            self._in_flight[cell] = lookup
+            lookup.add_done_callback(lambda _: self._in_flight.pop(cell, None))
+        # one caller giving up doesn't cancel the lookup for the others
+        return await asyncio.shield(lookup)
+
+    async def _async_lookup(self, latitude: float, longitude: float) -> str | None:
+        # the lock queues lookups first come first served
+        async with self._request_lock:
+            wait = (
+                self._last_request_at + GEOCODE_MIN_INTERVAL_SECONDS - time.monotonic()
+            )
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                name = await self._async_request(latitude, longitude)
+            finally:
+                self._last_request_at = time.monotonic()
+        if name is not None:
+            self.cache.put(latitude, longitude, name)
+        return name
+
+    async def _async_request(self, latitude: float, longitude: float) -> str | None:
+        try:
+            async with self._session.get(
+                NOMINATIM_REVERSE_URL,
+                params={"format": "jsonv2", "lat": latitude, "lon": longitude},
+                headers={"User-Agent": NOMINATIM_USER_AGENT},
+                timeout=ClientTimeout(total=GEOCODE_TIMEOUT_SECONDS),
+            ) as response:
+                response.raise_for_status()
+                result = await response.json()
+        except (ClientError, asyncio.TimeoutError) as error:
+            _LOGGER.warning(f"Location name lookup failed:{error}")
+            return None
+        if "error" in result:
+            _LOGGER.debug(f"no location name for {latitude},{longitude}: {result}")
+            return None
+        return result.get("display_name")
@@ -26,6 +26,8 @@ async def async_setup_entry(
 
 
 class Lock(BaseEntity, LockEntity):
+    _tracked_fields = ("doors_locked",)
+
     def __init__(
         self,
         vehicle: Vehicle,
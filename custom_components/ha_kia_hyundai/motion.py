@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from .util import haversine_meters
+from .const import (
+    MOTION_MIN_DISTANCE_METERS,
+    MOTION_MAX_NOISE_METERS,
+    MOTION_NOISE_FACTOR,
+    MOTION_NOISE_SMOOTHING,
+    MOTION_DWELL_TIME,
+    MOTION_ODOMETER_THRESHOLD,
+)
+
+
+class MotionDetector:
+    """
+    where a vehicle is parked and whether a new fix means it left; fixes
+    within the gps noise radius of the anchor are the same spot, and the
+    scatter of those fixes once the car dwelled there tunes the radius
+    """
+
+    def __init__(self):
+        self.anchor_latitude: float | None = None
+        self.anchor_longitude: float | None = None
+        self.anchor_odometer: float | None = None
+        self.anchored_at: datetime | None = None
+        self.fixed_at: datetime | None = None
+        self.noise_meters: float = 0.0
+
+    @property
+    def anchored(self) -> bool:
+        return self.anchor_latitude is not None and self.anchor_longitude is not None
+
+    def noise_radius(self) -> float:
+        return min(
+            max(MOTION_NOISE_FACTOR * self.noise_meters, MOTION_MIN_DISTANCE_METERS),
+            MOTION_MAX_NOISE_METERS,
+        )
+
+    def dwelling(self, now: datetime) -> bool:
+        return (
+            self.anchored_at is not None and now - self.anchored_at >= MOTION_DWELL_TIME
+        )
+
+    def anchor(
+        self, latitude: float, longitude: float, odometer: float | None, at: datetime
+    ) -> None:
+        self.anchor_latitude = latitude
+        self.anchor_longitude = longitude
+        self.anchor_odometer = odometer
+        self.anchored_at = at
+        self.fixed_at = at
+
+    def needs_fix(
+        self, odometer: float | None, now: datetime, max_age: timedelta
+    ) -> bool:
+        """
+        whether a location request can tell us anything new; a car that
+        hasn't driven since its last fix is where it was. without an
+        odometer to tell, the fix is renewed once it is max_age old
+        """
+        if not self.anchored:
+            return True
+        if odometer is None or self.anchor_odometer is None:
+            return self.fixed_at is None or now - self.fixed_at >= max_age
+        return abs(odometer - self.anchor_odometer) >= MOTION_ODOMETER_THRESHOLD
+
+    def observe(
+        self, latitude: float, longitude: float, odometer: float | None, at: datetime
+    ) -> bool:
+        """
+        feeds a fix in, returns whether the car moved off its anchor
+        """
+        self.fixed_at = at
+        if not self.anchored:
+            self.anchor(latitude, longitude, odometer, at)
+            return True
+        distance = haversine_meters(
+            self.anchor_latitude, self.anchor_longitude, latitude, longitude
+        )
+        if distance > self.noise_radius():
+            self.anchor(latitude, longitude, odometer, at)
+            return True
+        if self.dwelling(at):
+            # only a settled car's scatter is noise, a creeping one's is travel
+            self.noise_meters += MOTION_NOISE_SMOOTHING * (distance - self.noise_meters)
+        # a drive that ends where it started doesn't need another fix
+        self.anchor_odometer = odometer
+        return False
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    PIN_TOKEN_LIFETIME,
+    PIN_TOKEN_EXPIRY_MARGIN,
+    PIN_TOKEN_REFRESH_AHEAD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PinTokenCache:
+    """
+    the pin token of one account, kept until shortly before it expires;
+    the response doesn't say how long a token lasts, so each is trusted
+    for the known lifetime. callers asking at the same time share one
+    request, and a used token is renewed in the background in time
+    """
+
+    def __init__(self, hass: HomeAssistant, fetch: Callable[[], Awaitable[Any]]):
+        self.hass: HomeAssistant = hass
+        self._fetch: Callable[[], Awaitable[Any]] = fetch
+        self._token: Any = None
+        self._expires_at: datetime | None = None
+        self._used: bool = False
+        self._in_flight: asyncio.Task | None = None
+        self._unsub_refresh: Callable | None = None
+
+    async def get(self) -> Any:
+        self._used = True
+        if (
+            self._token is not None
+            and dt_util.utcnow() < self._expires_at - PIN_TOKEN_EXPIRY_MARGIN
+        ):
+            return self._token
+        return await self._refresh()
+
+    @callback
+    def invalidate(self) -> None:
+        self._token = None
+        self._expires_at = None
+        self._cancel_scheduled_refresh()
+
+    async def _refresh(self) -> Any:
+        if self._in_flight is None:
+            self._in_flight = self.hass.async_create_task(self._async_fetch())
+            self._in_flight.add_done_callback(self._clear_in_flight)
+        return await asyncio.shield(self._in_flight)
+
+    def _clear_in_flight(self, _) -> None:
+        self._in_flight = None
+
+    async def _async_fetch(self) -> Any:
+        self._cancel_scheduled_refresh()
+        token = await self._fetch()
+        self._token = token
+        self._expires_at = dt_util.utcnow() + PIN_TOKEN_LIFETIME
+        self._unsub_refresh = async_call_later(
+            self.hass,
+            max(
+                PIN_TOKEN_LIFETIME - PIN_TOKEN_REFRESH_AHEAD, timedelta(0)
+            ).total_seconds(),
+            self._async_refresh_ahead,
+        )
+        _LOGGER.debug(f"pin token valid until {self._expires_at}")
+        return token
+
+    async def _async_refresh_ahead(self, _now) -> None:
+        self._unsub_refresh = None
+        if not self._used:
+            # nobody needed the last one, let it run out rather than poll the cloud
+            return
+        # cleared before the fetch so callers waiting on it still count as uses
+        self._used = False
+        try:
+            await self._refresh()
+        except Exception as error:
+            # the next caller fetches one itself
+            _LOGGER.debug(f"background pin token refresh failed:{error}")
+
+    @callback
+    def _cancel_scheduled_refresh(self) -> None:
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+import math
+
+from typing import Callable, NamedTuple
+from homeassistant.components.zone.const import ATTR_PASSIVE, ATTR_RADIUS
+from homeassistant.const import (
+    ATTR_FRIENDLY_NAME,
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+)
+from homeassistant.core import HomeAssistant, Event, callback
+from homeassistant.helpers.event import TrackStates, async_track_state_change_filtered
+from homeassistant.helpers.storage import Store
+
+from .util import haversine_meters
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+    PLACE_INDEX_CELL_DEGREES,
+    PLACE_INDEX_MAX_CELLS_PER_PLACE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+METERS_PER_DEGREE_LATITUDE: float = 111_320.0
+
+
+class Place(NamedTuple):
+    name: str
+    latitude: float
+    longitude: float
+    radius: float  # meters
+
+
+class PlaceIndex:
+    """
+    grid of places by the cells their circle overlaps, so a lookup only
+    measures the distance to the few places near the point; places too big
+    for the grid are checked one by one
+    """
+
+    def __init__(
+        self,
+        places: list[Place],
+        cell_degrees: float = PLACE_INDEX_CELL_DEGREES,
+    ):
+        self.cell_degrees: float = cell_degrees
+        self._cells: dict[tuple[int, int], list[Place]] = {}
+        self._oversized: list[Place] = []
+        for place in places:
+            self._insert(place)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return (
+            math.floor(latitude / self.cell_degrees),
+            math.floor(longitude / self.cell_degrees),
+        )
+
+    def _insert(self, place: Place) -> None:
+        latitude_span = place.radius / METERS_PER_DEGREE_LATITUDE
+        longitude_span = place.radius / (
+            METERS_PER_DEGREE_LATITUDE
+            * max(math.cos(math.radians(place.latitude)), 0.01)
+        )
+        south, west = self._cell(
+            place.latitude - latitude_span, place.longitude - longitude_span
+        )
+        north, east = self._cell(
+            place.latitude + latitude_span, place.longitude + longitude_span
+        )
+        if (north - south + 1) * (east - west + 1) > PLACE_INDEX_MAX_CELLS_PER_PLACE:
+            self._oversized.append(place)
+            return
+        for row in range(south, north + 1):
+            for column in range(west, east + 1):
+                self._cells.setdefault((row, column), []).append(place)
+
+    def find(self, latitude: float, longitude: float) -> Place | None:
+        """
+        the place whose center is closest among those containing the point,
+        the smaller one on a tie, same as home assistant picks a zone
+        """
+        best = None
+        best_key = None
+        candidates = self._cells.get(self._cell(latitude, longitude), [])
+        for place in (*candidates, *self._oversized):
+            distance = haversine_meters(
+                latitude, longitude, place.latitude, place.longitude
+            )
+            if distance > place.radius:
+                continue
+            key = (distance, place.radius)
+            if best_key is None or key < best_key:
+                best, best_key = place, key
+        return best
+
+
+class KnownPlaces:
+    """
+    home assistant zones, passive ones aside, plus the named places users
+    add through the add_named_place service; coordinates inside one of
+    them are named without asking a geocoder
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass: HomeAssistant = hass
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.named_places")
+        self._named_places: dict[str, Place] = {}
+        self._index: PlaceIndex | None = None
+        self._unsub_zone_listener: Callable | None = None
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if data is not None:
+            for place in data["places"]:
+                place = Place(**place)
+                self._named_places[place.name] = place
+        self._unsub_zone_listener = async_track_state_change_filtered(
+            self.hass,
+            TrackStates(False, set(), {"zone"}),
+            self._async_zone_changed,
+        ).async_remove
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_zone_listener is not None:
+            self._unsub_zone_listener()
+            self._unsub_zone_listener = None
+
+    @callback
+    def _async_zone_changed(self, event: Event) -> None:
+        self._index = None
+
+    @callback
+    def add_named_place(self, place: Place) -> None:
+        self._named_places[place.name] = place
+        self._index = None
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def remove_named_place(self, name: str) -> bool:
+        if self._named_places.pop(name, None) is None:
+            return False
+        self._index = None
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+        return True
+
+    def find(self, latitude: float, longitude: float) -> Place | None:
+        if self._index is None:
+            # rebuilt on the first lookup after a zone or named place changed
+            self._index = PlaceIndex([*self._zones(), *self._named_places.values()])
+        return self._index.find(latitude, longitude)
+
+    def _zones(self) -> list[Place]:
+        zones = []
+        for state in self.hass.states.async_all("zone"):
+            latitude = state.attributes.get(ATTR_LATITUDE)
+            longitude = state.attributes.get(ATTR_LONGITUDE)
+            radius = state.attributes.get(ATTR_RADIUS)
+            if latitude is None or longitude is None or radius is None:
+                continue
+            if state.attributes.get(ATTR_PASSIVE):
+                # passive zones only trigger automations, like home assistant's
+                # own zone matching they never name a location
+                continue
+            zones.append(
+                Place(
+                    name=state.attributes.get(ATTR_FRIENDLY_NAME, state.object_id),
+                    latitude=float(latitude),
+                    longitude=float(longitude),
+                    radius=float(radius),
+                )
+            )
+        return zones
+
+    @callback
+    def _data_to_save(self) -> dict:
+        return {"places": [place._asdict() for place in self._named_places.values()]}
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import logging
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import NamedTuple, TYPE_CHECKING
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ACTIVE_REFRESH_INTERVAL,
+    CHARGING_REFRESH_INTERVAL,
+    CHARGING_FORCE_SCAN_INTERVAL,
+    RECENT_ACTION_WINDOW,
+    RECENT_MOVEMENT_WINDOW,
+    DORMANT_AFTER,
+    DORMANT_INTERVAL_MULTIPLIER,
+)
+
+if TYPE_CHECKING:
+    from .vehicle import Vehicle
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollIntervals(NamedTuple):
+    refresh: timedelta
+    force_sync: timedelta
+
+
+class PollingPolicy(ABC):
+    @abstractmethod
+    def intervals(self, vehicle: Vehicle) -> PollIntervals:
+        pass
+
+
+class FixedPollingPolicy(PollingPolicy):
+    def intervals(self, vehicle: Vehicle) -> PollIntervals:
+        return PollIntervals(vehicle.update_interval, vehicle.force_scan_interval)
+
+
+class StateAdaptivePollingPolicy(PollingPolicy):
+    """
+    starts from the configured intervals, shortens them while the car is in
+    use and stretches them while it sits parked and locked
+    """
+
+    def intervals(self, vehicle: Vehicle) -> PollIntervals:
+        now = dt_util.utcnow()
+        refresh = vehicle.update_interval
+        force_sync = vehicle.force_scan_interval
+
+        if vehicle.climate_hvac_on:
+            refresh = min(refresh, ACTIVE_REFRESH_INTERVAL)
+            force_sync = (
+                vehicle.hvac_on_force_scan_interval
+                or vehicle.api_cloud.hvac_on_force_scan_interval
+                or force_sync
+            )
+        if vehicle.engine_on:
+            # a running car reports on its own, fresh cache is enough
+            refresh = min(refresh, ACTIVE_REFRESH_INTERVAL)
+        if _within(vehicle.last_user_action_at, RECENT_ACTION_WINDOW, now):
+            refresh = min(refresh, ACTIVE_REFRESH_INTERVAL)
+        if _within(vehicle.last_moved_at, RECENT_MOVEMENT_WINDOW, now):
+            refresh = min(refresh, ACTIVE_REFRESH_INTERVAL * 2)
+        if vehicle.ev_battery_charging:
+            refresh = min(refresh, CHARGING_REFRESH_INTERVAL)
+            force_sync = min(force_sync, CHARGING_FORCE_SCAN_INTERVAL)
+
+        if self._dormant(vehicle, now):
+            refresh = refresh * DORMANT_INTERVAL_MULTIPLIER
+            force_sync = force_sync * DORMANT_INTERVAL_MULTIPLIER
+        return PollIntervals(refresh, force_sync)
+
+    @staticmethod
+    def _dormant(vehicle: Vehicle, now: datetime) -> bool:
+        if not vehicle.doors_locked:
+            return False
+        if vehicle.engine_on or vehicle.climate_hvac_on:
+            return False
+        if vehicle.ev_plugged_in or vehicle.ev_battery_charging:
+            # a scheduled charge can start at any moment
+            return False
+        if _within(vehicle.last_user_action_at, DORMANT_AFTER, now):
+            return False
+        if _within(vehicle.last_moved_at, DORMANT_AFTER, now):
+            return False
+        return True
+
+
+def _within(moment: datetime | None, window: timedelta, now: datetime) -> bool:
+    return moment is not None and now - moment < window
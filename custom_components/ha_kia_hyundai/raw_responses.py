@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import logging
+import zlib
+
+from collections import deque
+from datetime import datetime
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    RAW_RESPONSE_BUFFER_MAX_BYTES,
+    RAW_RESPONSE_BUFFER_MAX_ENTRIES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RawResponseBuffer:
+    """
+    the last few api payloads of a vehicle, compressed and capped by count
+    and by compressed size; read back through diagnostics
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = RAW_RESPONSE_BUFFER_MAX_BYTES,
+        max_entries: int = RAW_RESPONSE_BUFFER_MAX_ENTRIES,
+    ):
+        self.max_bytes: int = max_bytes
+        self.max_entries: int = max_entries
+        self.captured: int = 0
+        self._entries: deque[tuple[datetime, bytes]] = deque()
+        self._size: int = 0
+
+    def append(self, responses: dict) -> None:
+        payload = zlib.compress(
+            json.dumps(responses, default=str, separators=(",", ":")).encode()
+        )
+        if len(payload) > self.max_bytes:
+            _LOGGER.debug(f"raw response of {len(payload)} bytes exceeds buffer")
+            return
+        self._entries.append((dt_util.utcnow(), payload))
+        self._size += len(payload)
+        self.captured += 1
+        while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popleft()
+            self._size -= len(evicted)
+
+    def entries(self) -> list[dict]:
+        return [
+            {
+                "captured_at": captured_at.isoformat(),
+                "responses": json.loads(zlib.decompress(payload)),
+            }
+            for captured_at, payload in self._entries
+        ]
+
+    def summary(self) -> dict:
+        return {
+            "retained": len(self._entries),
+            "captured": self.captured,
+            "compressed_bytes": self._size,
+            "last_captured_at": (
+                self._entries[-1][0].isoformat() if self._entries else None
+            ),
+        }
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from .callbacks import CallbacksMixin
+from .const import REQUEST_BUDGET_RESERVE_FRACTION, BUDGET_DUE_ALLOWANCE
+
+_LOGGER = logging.getLogger(__name__)
+
+SECONDS_PER_DAY: int = 24 * 60 * 60
+
+
+class RequestBudget(CallbacksMixin):
+    """
+    token bucket refilled evenly over a day; background calls never dig into
+    the reserve, user initiated calls may. without a daily limit every call
+    goes through
+    """
+
+    def __init__(self, daily_limit: int | None = None):
+        self.daily_limit: int | None = daily_limit
+        self.reserve: int = _reserve(daily_limit)
+        self._tokens: float = float(daily_limit or 0)
+        self._refilled_at: float = time.time()
+
+    def set_daily_limit(self, daily_limit: int | None) -> None:
+        if daily_limit == self.daily_limit:
+            return
+        if self.daily_limit is None:
+            self._tokens = float(daily_limit)
+        elif daily_limit is not None:
+            self._refill()
+            self._tokens = min(self._tokens, float(daily_limit))
+        self._refilled_at = time.time()
+        self.daily_limit = daily_limit
+        self.reserve = _reserve(daily_limit)
+        self.publish_updates()
+
+    @property
+    def remaining(self) -> float | None:
+        if self.daily_limit is None:
+            return None
+        self._refill()
+        return self._tokens
+
+    def try_consume(self, cost: float, priority: float) -> bool:
+        """
+        priority is how overdue the call is, 1.0 meaning exactly due; a due
+        call goes through while the bucket is nearly full, the emptier it
+        gets the more overdue a background call has to be
+        """
+        if self.daily_limit is None:
+            return True
+        self._refill()
+        spendable = self._tokens - self.reserve
+        if spendable < cost:
+            _LOGGER.debug(f"budget exhausted, remaining:{self._tokens}")
+            return False
+        scarcity = 1 - spendable / (self.daily_limit - self.reserve)
+        if priority + BUDGET_DUE_ALLOWANCE < 1 + scarcity:
+            _LOGGER.debug(
+                f"budget skipping call, priority:{priority}; scarcity:{scarcity}"
+            )
+            return False
+        self._spend(cost)
+        return True
+
+    def consume(self, cost: float) -> None:
+        if self.daily_limit is None:
+            return
+        self._refill()
+        if self._tokens < cost:
+            _LOGGER.warning(f"user request exceeds remaining budget:{self._tokens}")
+        self._spend(cost)
+
+    def as_dict(self) -> dict:
+        if self.daily_limit is None:
+            return {}
+        self._refill()
+        return {"tokens": self._tokens, "refilled_at": self._refilled_at}
+
+    def restore(self, data: dict) -> None:
+        if self.daily_limit is None or "tokens" not in data:
+            return
+        self._tokens = min(float(data["tokens"]), float(self.daily_limit))
+        self._refilled_at = data["refilled_at"]
+        self._refill()
+
+    def _spend(self, cost: float) -> None:
+        self._tokens = max(self._tokens - cost, 0.0)
+        self.publish_updates()
+
+    def _refill(self) -> None:
+        now = time.time()
+        elapsed = max(now - self._refilled_at, 0.0)
+        self._tokens = min(
+            self._tokens + elapsed * self.daily_limit / SECONDS_PER_DAY,
+            float(self.daily_limit),
+        )
+        self._refilled_at = now
+
+
+def _reserve(daily_limit: int | None) -> int:
+    if daily_limit is None:
+        return 0
+    return round(daily_limit * REQUEST_BUDGET_RESERVE_FRACTION)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import zlib
+
+from datetime import datetime, timedelta
+from typing import Callable
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .vehicle import Vehicle
+from .const import (
+    MIN_POLL_SPACING,
+    POLL_RETRY_BACKOFF,
+    POLL_JITTER_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """
+    one timer for the whole integration, armed for the earliest vehicle whose
+    refresh or force sync is due
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass: HomeAssistant = hass
+        self._vehicles: dict[str, Vehicle] = {}
+        self._due: dict[str, datetime] = {}
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._sequence = itertools.count()
+        self._polling: set[str] = set()
+        self._unsub_timer: Callable | None = None
+        self._timer_due: datetime | None = None
+        # polls in a row that didn't update the vehicle, and the update they saw
+        self._failures: dict[str, tuple[int, datetime | None]] = {}
+        self._shut_down: bool = False
+
+    def add_vehicle(self, vehicle: Vehicle) -> Callable[[], None]:
+        identifier = vehicle.identifier
+        self._shut_down = False
+        self._vehicles[identifier] = vehicle
+        unsub_coordinator = vehicle.coordinator.async_add_listener(
+            lambda: self.reschedule(vehicle)
+        )
+        self.reschedule(vehicle)
+
+        @callback
+        def remove_vehicle() -> None:
+            unsub_coordinator()
+            self._vehicles.pop(identifier, None)
+            self._due.pop(identifier, None)
+            self._failures.pop(identifier, None)
+            self._arm_timer()
+
+        return remove_vehicle
+
+    @callback
+    def reschedule(self, vehicle: Vehicle) -> None:
+        identifier = vehicle.identifier
+        if (
+            self._shut_down
+            or identifier not in self._vehicles
+            or identifier in self._polling
+        ):
+            return
+        earliest = dt_util.utcnow() + MIN_POLL_SPACING
+        due = max(vehicle.next_poll_due() + self._jitter(identifier), earliest)
+        backoff = self._backoff(vehicle)
+        if backoff is not None:
+            due = max(due, dt_util.utcnow() + backoff)
+        if self._due.get(identifier) == due:
+            return
+        self._due[identifier] = due
+        heapq.heappush(self._heap, (due, next(self._sequence), identifier))
+        self._arm_timer()
+
+    @callback
+    def shutdown(self, *_) -> None:
+        self._shut_down = True
+        self._cancel_timer()
+
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self._timer_due = None
+
+    def _backoff(self, vehicle: Vehicle) -> timedelta | None:
+        """
+        a failed or refused poll leaves the vehicle overdue; rather than
+        trying again every minute, wait twice as long after each one, up to
+        the vehicle's regular refresh interval
+        """
+        failures, last_updated = self._failures.get(vehicle.identifier, (0, None))
+        if failures == 0:
+            return None
+        if vehicle.last_updated_from_cloud != last_updated:
+            # another vehicle's cycle updated this one meanwhile
+            del self._failures[vehicle.identifier]
+            return None
+        return min(
+            POLL_RETRY_BACKOFF * 2 ** (failures - 1),
+            vehicle.polling_policy.intervals(vehicle).refresh,
+        )
+
+    @staticmethod
+    def _jitter(identifier: str) -> timedelta:
+        # stable across restarts so a fleet keeps its spread
+        return timedelta(
+            seconds=zlib.crc32(identifier.encode()) % (POLL_JITTER_SECONDS + 1)
+        )
+
+    def _discard_stale_entries(self) -> None:
+        while self._heap:
+            due, _, identifier = self._heap[0]
+            if self._due.get(identifier) == due:
+                return
+            heapq.heappop(self._heap)
+
+    def _arm_timer(self) -> None:
+        self._discard_stale_entries()
+        if not self._heap:
+            self._cancel_timer()
+            return
+        due = self._heap[0][0]
+        if due == self._timer_due:
+            return
+        self._cancel_timer()
+        self._timer_due = due
+        self._unsub_timer = async_track_point_in_utc_time(
+            self.hass, self._async_wake, due
+        )
+
+    async def _async_wake(self, now: datetime) -> None:
+        self._unsub_timer = None
+        self._timer_due = None
+        self._discard_stale_entries()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, identifier = heapq.heappop(self._heap)
+            del self._due[identifier]
+            self.hass.async_create_task(self._async_poll(self._vehicles[identifier]))
+            self._discard_stale_entries()
+        self._arm_timer()
+
+    async def _async_poll(self, vehicle: Vehicle) -> None:
+        self._polling.add(vehicle.identifier)
+        last_updated = vehicle.last_updated_from_cloud
+        try:
+            await vehicle.update(interval=True)
+        except Exception as ex:
+            _LOGGER.error(f"Exception in interval update : %s", str(ex))
+        finally:
+            if vehicle.last_updated_from_cloud == last_updated:
+                failures = self._failures.get(vehicle.identifier, (0, None))[0]
+                self._failures[vehicle.identifier] = (failures + 1, last_updated)
+            else:
+                self._failures.pop(vehicle.identifier, None)
+            self._polling.discard(vehicle.identifier)
+            self.reschedule(vehicle)
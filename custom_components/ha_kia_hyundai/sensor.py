@@ -61,7 +61,7 @@ async def async_setup_entry(
     usage_sensors = []
 
     for description, key in usage_counters:
-        sensors.append(
+        usage_sensors.append(
             ApiUsageSensor(
                 vehicle,
                 description,
@@ -70,6 +70,7 @@ async def async_setup_entry(
         )
 
     async_add_entities(usage_sensors, True)
+    async_add_entities([ApiBudgetSensor(vehicle)], True)
 
 
 class InstrumentSensor(BaseEntity):
@@ -90,6 +91,9 @@ class InstrumentSensor(BaseEntity):
         self._attr_name = f"{vehicle.name} {description}"
 
         self._key = key
+        # sync age moves with the clock, it writes on every update
+        if key != "sync_age":
+            self._tracked_fields = (key, key.replace("_value", "_unit"))
 
     @property
     def state(self):
@@ -138,6 +142,7 @@ class ApiUsageSensor(DeviceInfoMixin, Entity):
         self._attr_unique_id = f"{DOMAIN}-{vehicle.identifier}-{key}"
         self._attr_name = f"{vehicle.name} {description}"
         self._counter_date = dt_util.as_local(dt_util.utcnow())
+        self.restore(vehicle.usage_counter_data(key))
         setattr(vehicle, key, self)
 
     def mark_used(self):
@@ -151,11 +156,67 @@ class ApiUsageSensor(DeviceInfoMixin, Entity):
             self.failed_error = None
         self._attr_state += 1
         self.async_write_ha_state()
+        self._vehicle.async_schedule_save()
 
     def mark_failed(self, error):
         self.failed_today = True
         self.failed_error = error
+        self._vehicle.async_schedule_save()
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self._attr_state,
+            "counter_date": self._counter_date.isoformat(),
+            "failed_today": self.failed_today,
+            # the error itself doesn't survive a restart, its message does
+            "failed_error": (
+                str(self.failed_error) if self.failed_error is not None else None
+            ),
+        }
+
+    def restore(self, data: dict) -> None:
+        if "count" not in data:
+            return
+        counter_date = dt_util.parse_datetime(data["counter_date"])
+        if dt_util.start_of_local_day(counter_date) != dt_util.start_of_local_day(
+            self._counter_date
+        ):
+            return
+        self._counter_date = counter_date
+        self._attr_state = data["count"]
+        self.failed_today = data["failed_today"]
+        self.failed_error = data.get("failed_error")
 
     @property
     def state_attributes(self):
         return {"failed_today": self.failed_today}
+
+
+class ApiBudgetSensor(DeviceInfoMixin, Entity):
+    _attr_should_poll: bool = False
+    _attr_icon = "mdi:api"
+
+    def __init__(self, vehicle: Vehicle):
+        self._vehicle = vehicle
+        self._attr_unique_id = f"{DOMAIN}-{vehicle.identifier}-request-budget"
+        self._attr_name = f"{vehicle.name} Request Budget Remaining"
+
+    async def async_added_to_hass(self) -> None:
+        self._vehicle.api_cloud.budget.register_callback(self.async_write_ha_state)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._vehicle.api_cloud.budget.remove_callback(self.async_write_ha_state)
+
+    @property
+    def state(self):
+        remaining = self._vehicle.api_cloud.budget.remaining
+        if remaining is None:
+            return None
+        return int(remaining)
+
+    @property
+    def state_attributes(self):
+        return {
+            "daily_limit": self._vehicle.api_cloud.budget.daily_limit,
+            "reserve": self._vehicle.api_cloud.budget.reserve,
+        }
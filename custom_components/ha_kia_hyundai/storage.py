@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api_cloud import ApiCloud
+from .vehicle import Vehicle
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IntegrationStorage:
+    """
+    bookkeeping that has to survive a restart, written debounced through one
+    Store for the whole integration
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass: HomeAssistant = hass
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.state")
+        self._data: dict = {"vehicles": {}, "accounts": {}}
+        self._vehicles: dict[str, Vehicle] = {}
+        self._api_clouds: dict[str, ApiCloud] = {}
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if data is not None:
+            self._data.update(data)
+
+    def vehicle_data(self, identifier: str) -> dict:
+        return self._data["vehicles"].get(identifier, {})
+
+    @callback
+    def track_vehicle(self, vehicle: Vehicle) -> None:
+        self._vehicles[vehicle.identifier] = vehicle
+        vehicle.storage = self
+        vehicle.restore_bookkeeping(self.vehicle_data(vehicle.identifier))
+
+        api_cloud = vehicle.api_cloud
+        account_key = _account_key(api_cloud)
+        if account_key not in self._api_clouds:
+            self._api_clouds[account_key] = api_cloud
+            api_cloud.budget.restore(self._data["accounts"].get(account_key, {}))
+            api_cloud.budget.register_callback(self.async_schedule_save)
+
+    @callback
+    def untrack_vehicle(self, vehicle: Vehicle) -> None:
+        self._collect()
+        self._vehicles.pop(vehicle.identifier, None)
+        vehicle.storage = None
+        account_key = _account_key(vehicle.api_cloud)
+        if not any(
+            tracked.api_cloud is vehicle.api_cloud
+            for tracked in self._vehicles.values()
+        ):
+            api_cloud = self._api_clouds.pop(account_key, None)
+            if api_cloud is not None:
+                api_cloud.budget.remove_callback(self.async_schedule_save)
+        self.async_schedule_save()
+
+    @callback
+    def remove_vehicle(self, identifier: str) -> None:
+        self._vehicles.pop(identifier, None)
+        self._data["vehicles"].pop(identifier, None)
+        self.async_schedule_save()
+
+    @callback
+    def remove_account(self, region: str, brand: str, username: str) -> None:
+        account_key = _account_key_for(region, brand, username)
+        if account_key in self._api_clouds:
+            # still in use by a loaded vehicle
+            return
+        self._data["accounts"].pop(account_key, None)
+        self.async_schedule_save()
+
+    @callback
+    def async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _collect(self) -> None:
+        for identifier, vehicle in self._vehicles.items():
+            self._data["vehicles"][identifier] = vehicle.bookkeeping_as_dict()
+        for account_key, api_cloud in self._api_clouds.items():
+            self._data["accounts"][account_key] = api_cloud.budget.as_dict()
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._collect()
+        return self._data
+
+
+def _account_key(api_cloud: ApiCloud) -> str:
+    return _account_key_for(api_cloud.region, api_cloud.brand, api_cloud.username)
+
+
+def _account_key_for(region: str, brand: str, username: str) -> str:
+    return f"{region}-{brand}-{username}"
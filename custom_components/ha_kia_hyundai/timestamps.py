@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone, tzinfo
+from typing import Callable
+
+
+def decode_compact(value: str, timezone_of_str: tzinfo = timezone.utc) -> datetime:
+    """
+    YYYYMMDDhhmmss, anything after the seconds is ignored
+    """
+    return datetime(
+        int(value[0:4]),
+        int(value[4:6]),
+        int(value[6:8]),
+        int(value[8:10]),
+        int(value[10:12]),
+        int(value[12:14]),
+        tzinfo=timezone_of_str,
+    )
+
+
+def decode_iso(value: str) -> datetime:
+    """
+    ISO 8601 as US Hyundai sends it; no offset means UTC, fractional seconds
+    are dropped like the other regions' sync dates
+    """
+    if value.endswith("Z"):
+        # fromisoformat only learned about Z in python 3.11
+        value = value[:-1]
+    try:
+        decoded = datetime.fromisoformat(value)
+    except ValueError:
+        # fractional seconds fromisoformat can't read, the rest still can be
+        return decode_compact(value.replace("-", "").replace("T", "").replace(":", ""))
+    if decoded.tzinfo is None:
+        return decoded.replace(microsecond=0, tzinfo=timezone.utc)
+    return decoded.replace(microsecond=0)
+
+
+class TimestampMemo:
+    """
+    last raw string and what it decoded to; the sync date of a vehicle
+    rarely moves between two polls
+    """
+
+    __slots__ = ("raw", "decoded")
+
+    def __init__(self):
+        self.raw: str | None = None
+        self.decoded: datetime | None = None
+
+    def decode(self, raw: str, decoder: Callable[[str], datetime]) -> datetime:
+        if raw != self.raw:
+            self.decoded = decoder(raw)
+            self.raw = raw
+        return self.decoded
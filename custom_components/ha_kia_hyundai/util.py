@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import re
-from datetime import datetime, tzinfo
+import math
+
 from homeassistant.const import (
     LENGTH_MILES,
     LENGTH_KILOMETERS,
@@ -10,24 +10,6 @@ from homeassistant.const import (
 )
 
 
-def convert_last_updated_str_to_datetime(
-    last_updated_str: str, timezone_of_str: tzinfo
-):
-    m = re.match(
-        r"(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})",
-        last_updated_str,
-    )
-    return datetime(
-        year=int(m.group(1)),
-        month=int(m.group(2)),
-        day=int(m.group(3)),
-        hour=int(m.group(4)),
-        minute=int(m.group(5)),
-        second=int(m.group(6)),
-        tzinfo=timezone_of_str,
-    )
-
-
 def convert_api_unit_to_ha_unit_of_distance(
     api_unit: int,
 ) -> LENGTH_MILES | LENGTH_KILOMETERS | None:
@@ -60,3 +42,18 @@ def safely_get_json_value(json, key, callable_to_cast=None):
     if callable_to_cast is not None and value is not None:
         value = callable_to_cast(value)
     return value
+
+
+def haversine_meters(
+    latitude_1: float, longitude_1: float, latitude_2: float, longitude_2: float
+) -> float:
+    latitude_1, longitude_1, latitude_2, longitude_2 = map(
+        math.radians, (latitude_1, longitude_1, latitude_2, longitude_2)
+    )
+    a = (
+        math.sin((latitude_2 - latitude_1) / 2) ** 2
+        + math.cos(latitude_1)
+        * math.cos(latitude_2)
+        * math.sin((longitude_2 - longitude_1) / 2) ** 2
+    )
+    return 2 * 6_371_000 * math.asin(math.sqrt(a))
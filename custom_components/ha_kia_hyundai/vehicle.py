@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from typing import Any
+from homeassistant.core import callback
 from homeassistant.util import dt as dt_util
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.const import (
@@ -11,21 +15,68 @@ from homeassistant.const import (
     TEMP_FAHRENHEIT,
 )
 import asyncio
-from geopy.adapters import AioHTTPAdapter
-from geopy.geocoders import Nominatim
-from geopy.location import Location
-from geopy.exc import GeocoderServiceError
 
+from .timestamps import TimestampMemo
+from .motion import MotionDetector
+from .callbacks import CallbacksMixin
+from .command_queue import CommandQueue
+from .raw_responses import RawResponseBuffer
+from .vehicle_state import (
+    StateLayout,
+    StateSnapshot,
+    VehicleState,
+    FieldChange,
+    building_state,
+    begin_building,
+    end_building,
+)
+from .polling_policy import PollingPolicy, StateAdaptivePollingPolicy
 from .const import (
     VEHICLE_LOCK_ACTION,
     REQUEST_TO_SYNC_COOLDOWN,
     INITIAL_STATUS_DELAY_AFTER_COMMAND,
+    REQUEST_SYNC_BUDGET_COST,
+    ACTION_BUDGET_COST,
+    COMMAND_STATE_TRUST_WINDOW,
+    OPTIMISTIC_STATE_TTL,
+    SNAPSHOT_HISTORY_SIZE,
+    EVENT_VEHICLE_CHANGED,
     INSTRUMENTS,
     BINARY_INSTRUMENTS,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# identity and bookkeeping, not part of the telemetry in a snapshot
+SNAPSHOT_EXCLUDED_KEYS = [
+    "identifier",
+    "vin",
+    "key",
+    "model",
+    "name",
+    "last_synced_to_cloud",
+    "last_updated_from_cloud",
+    "last_sync_requested",
+]
+
+# ev instruments that read empty until the car first reports them
+EV_INSTRUMENT_KEYS_SUPPORTED_WHEN_EMPTY = frozenset(
+    [
+        "ev_battery_level",
+        "ev_max_dc_charge_level",
+        "ev_max_ac_charge_level",
+    ]
+)
+
+# telemetry parsed from the api, published as versioned StateSnapshots
+TELEMETRY = StateLayout()
+
+USAGE_COUNTER_KEYS = [
+    "calls_today_for_actions",
+    "calls_today_for_update",
+    "calls_today_for_request_sync",
+]
+
 
 class Vehicle:
     identifier: str
@@ -35,155 +86,397 @@ class Vehicle:
     name: str = None
 
     # in API based time zone ...
-    last_synced_to_cloud: datetime = None
+    last_synced_to_cloud: datetime = TELEMETRY.field()
     last_updated_from_cloud: datetime = None
     last_sync_requested: datetime = None
 
-    fuel_range_value: float = None
-    fuel_range_unit: LENGTH_KILOMETERS | LENGTH_MILES = None
-    total_range_value: float = None
-    total_range_unit: LENGTH_KILOMETERS | LENGTH_MILES = None
-    odometer_value: float = None
-    odometer_unit: LENGTH_KILOMETERS | LENGTH_MILES = None
-    battery_level: int = None
-    engine_on: bool = None
-    low_fuel_light_on: bool = None
-    doors_locked: bool = None
-    door_front_left_open: bool = None
-    door_front_right_open: bool = None
-    door_back_left_open: bool = None
-    door_back_right_open: bool = None
-    door_trunk_open: bool = None
-    door_hood_open: bool = None
-    sleep_mode_on: bool = None
-    climate_hvac_on: bool = None
-    climate_defrost_on: bool = None
-    climate_temperature_value: float = None
-    climate_temperature_unit: TEMP_CELSIUS | TEMP_FAHRENHEIT = None
-    climate_heated_steering_wheel_on: bool = None
-    climate_heated_side_mirror_on: bool = None
-    climate_heated_rear_window_on: bool = None
-    climate_heated_seat_front_right_on: bool = None
-    climate_heated_seat_front_left_on: bool = None
-    climate_heated_seat_rear_right_on: bool = None
-    climate_heated_seat_rear_left_on: bool = None
-    ev_plugged_in: bool = None
-    ev_battery_charging: bool = None
-    ev_battery_level: int = None
-    ev_charge_current_remaining_duration: int = None
-    ev_charge_fast_duration: int = None
-    ev_charge_portable_duration: int = None
-    ev_charge_station_duration: int = None
-    ev_remaining_range_value: int = None
-    ev_remaining_range_unit: LENGTH_KILOMETERS | LENGTH_MILES = None
-    ev_max_dc_charge_level: int = None
-    ev_max_ac_charge_level: int = None
-    ev_max_range_ac_charge_value: float = None
-    ev_max_range_ac_charge_unit: LENGTH_KILOMETERS | LENGTH_MILES = None
-    ev_max_range_dc_charge_value: float = None
-    ev_max_range_dc_charge_unit: LENGTH_KILOMETERS | LENGTH_MILES = None
-    tire_all_on: bool = None
-    tire_front_left_on: bool = None
-    tire_front_right_on: bool = None
-    tire_rear_left_on: bool = None
-    tire_rear_right_on: bool = None
-    last_service_value: float = None
-    last_service_unit: LENGTH_KILOMETERS | LENGTH_MILES = None
-    next_service_value: float = None
-    next_service_unit: LENGTH_KILOMETERS | LENGTH_MILES = None
-    next_service_mile_value: float = None
-    next_service_mile_unit: LENGTH_KILOMETERS | LENGTH_MILES = None
-
-    latitude: float = None
-    longitude: float = None
-    location_name: str = None
+    fuel_range_value: float = TELEMETRY.field()
+    fuel_range_unit: LENGTH_KILOMETERS | LENGTH_MILES = TELEMETRY.field()
+    total_range_value: float = TELEMETRY.field()
+    total_range_unit: LENGTH_KILOMETERS | LENGTH_MILES = TELEMETRY.field()
+    odometer_value: float = TELEMETRY.field()
+    odometer_unit: LENGTH_KILOMETERS | LENGTH_MILES = TELEMETRY.field()
+    battery_level: int = TELEMETRY.field()
+    engine_on: bool = TELEMETRY.field()
+    low_fuel_light_on: bool = TELEMETRY.field()
+    doors_locked: bool = TELEMETRY.field()
+    door_front_left_open: bool = TELEMETRY.field()
+    door_front_right_open: bool = TELEMETRY.field()
+    door_back_left_open: bool = TELEMETRY.field()
+    door_back_right_open: bool = TELEMETRY.field()
+    door_trunk_open: bool = TELEMETRY.field()
+    door_hood_open: bool = TELEMETRY.field()
+    sleep_mode_on: bool = TELEMETRY.field()
+    climate_hvac_on: bool = TELEMETRY.field()
+    climate_defrost_on: bool = TELEMETRY.field()
+    climate_temperature_value: float = TELEMETRY.field()
+    climate_temperature_unit: TEMP_CELSIUS | TEMP_FAHRENHEIT = TELEMETRY.field()
+    climate_heated_steering_wheel_on: bool = TELEMETRY.field()
+    climate_heated_side_mirror_on: bool = TELEMETRY.field()
+    climate_heated_rear_window_on: bool = TELEMETRY.field()
+    climate_heated_seat_front_right_on: bool = TELEMETRY.field()
+    climate_heated_seat_front_left_on: bool = TELEMETRY.field()
+    climate_heated_seat_rear_right_on: bool = TELEMETRY.field()
+    climate_heated_seat_rear_left_on: bool = TELEMETRY.field()
+    ev_plugged_in: bool = TELEMETRY.field()
+    ev_battery_charging: bool = TELEMETRY.field()
+    ev_battery_level: int = TELEMETRY.field()
+    ev_charge_current_remaining_duration: int = TELEMETRY.field()
+    ev_charge_fast_duration: int = TELEMETRY.field()
+    ev_charge_portable_duration: int = TELEMETRY.field()
+    ev_charge_station_duration: int = TELEMETRY.field()
+    ev_remaining_range_value: int = TELEMETRY.field()
+    ev_remaining_range_unit: LENGTH_KILOMETERS | LENGTH_MILES = TELEMETRY.field()
+    ev_max_dc_charge_level: int = TELEMETRY.field()
+    ev_max_ac_charge_level: int = TELEMETRY.field()
+    ev_max_range_ac_charge_value: float = TELEMETRY.field()
+    ev_max_range_ac_charge_unit: LENGTH_KILOMETERS | LENGTH_MILES = TELEMETRY.field()
+    ev_max_range_dc_charge_value: float = TELEMETRY.field()
+    ev_max_range_dc_charge_unit: LENGTH_KILOMETERS | LENGTH_MILES = TELEMETRY.field()
+    tire_all_on: bool = TELEMETRY.field()
+    tire_front_left_on: bool = TELEMETRY.field()
+    tire_front_right_on: bool = TELEMETRY.field()
+    tire_rear_left_on: bool = TELEMETRY.field()
+    tire_rear_right_on: bool = TELEMETRY.field()
+    last_service_value: float = TELEMETRY.field()
+    last_service_unit: LENGTH_KILOMETERS | LENGTH_MILES = TELEMETRY.field()
+    next_service_value: float = TELEMETRY.field()
+    next_service_unit: LENGTH_KILOMETERS | LENGTH_MILES = TELEMETRY.field()
+    next_service_mile_value: float = TELEMETRY.field()
+    next_service_mile_unit: LENGTH_KILOMETERS | LENGTH_MILES = TELEMETRY.field()
+
+    latitude: float = TELEMETRY.field()
+    longitude: float = TELEMETRY.field()
+    location_name: str = TELEMETRY.field()
+
+    # scan settings, from the config entry options of this vehicle
+    update_interval: timedelta = None
+    force_scan_interval: timedelta = None
+    no_force_scan_hour_start: int = None
+    no_force_scan_hour_finish: int = None
+    hvac_on_force_scan_interval: timedelta = None
+
+    # activity, drives the polling policy
+    last_moved_at: datetime = None
+    last_user_action_at: datetime = None
+
+    # US Hyundai location rate limit cooldown
+    last_loc_timestamp: datetime = None
 
     # usage counters
     calls_today_for_actions = None
     calls_today_for_update = None
     calls_today_for_request_sync = None
 
-    # debug
+    # persisted bookkeeping
+    storage = None
+    geocoder = None
+    _restored_usage_counters: dict = {}
+    _restored_snapshot: dict = None
+    restored_from_snapshot: bool = False
+
+    # change detection, fields that differ from the previous parsed status
+    status_fingerprint: int = None
+    changed_fields: frozenset[str] = frozenset()
+    _field_values: dict = {}
+    change_set: dict[str, FieldChange] = {}
+    _reported_snapshot: StateSnapshot | None = None
+
+    # debug, the payloads of the running update; kept past it only when
+    # retention is turned on
     raw_responses = None
+    raw_response_buffer: RawResponseBuffer | None = None
+    # fetch status after every command instead of trusting its expected effect
+    confirm_commands: bool = False
 
     def __init__(self, api_cloud, identifier: str, api_unsupported_keys):
+        self.snapshot: StateSnapshot = TELEMETRY.empty_snapshot()
+        self.previous_snapshots: deque[StateSnapshot] = deque(
+            maxlen=SNAPSHOT_HISTORY_SIZE
+        )
         self.api_cloud = api_cloud
         self.identifier = identifier
-        self.api_unsupported_keys = api_unsupported_keys
-
-        async def async_update_data():
-            if self.calls_today_for_update is not None:
-                self.calls_today_for_update.mark_used()
-            await self.api_cloud.update(vehicle=self)
-            local_timezone = dt_util.UTC
-            event_time_local = dt_util.utcnow().astimezone(local_timezone)
-            self.last_updated_from_cloud = event_time_local
+        self.api_unsupported_keys: frozenset[str] = frozenset(api_unsupported_keys)
+        self.polling_policy: PollingPolicy = StateAdaptivePollingPolicy()
+        self.sync_date_memo: TimestampMemo = TimestampMemo()
+        self.motion: MotionDetector = MotionDetector()
+        # location names resolved in the background, outside any refresh
+        self.location_updates: CallbacksMixin = CallbacksMixin()
+        # expected effects of completed commands until the car reports after them
+        self.optimistic_state: dict[str, tuple[Any, datetime]] = {}
+        self.commands: CommandQueue = CommandQueue(
+            api_cloud.hass, name=f"Vehicle {identifier}"
+        )
 
         self.coordinator: DataUpdateCoordinator = DataUpdateCoordinator(
             api_cloud.hass,
             _LOGGER,
             name=f"Vehicle {identifier}",
-            update_method=async_update_data,
         )
 
     async def update(self, interval: bool = False):
-        api_timezone = dt_util.UTC
-        event_time_api = dt_util.utcnow().astimezone(api_timezone)
-        event_time_local = dt_util.as_local(dt_util.utcnow())
-        if self.last_updated_from_cloud is None:
-            interval = False
-        else:
-            age_of_last_update_from_cloud = (
-                datetime.now(api_timezone) - self.last_updated_from_cloud
-            )
-        if (
-            not interval
-            or age_of_last_update_from_cloud > self.api_cloud.update_interval
-        ):
-            await self.coordinator.async_refresh()
+        if not interval or self.next_refresh_due() <= dt_util.utcnow():
+            await self.api_cloud.refresh(requested_by=None if interval else self)
         else:
             _LOGGER.debug(f"interval update skipping")
 
-        force_scan_interval: timedelta = self.api_cloud.force_scan_interval
-        if self.climate_hvac_on:
+        if self.last_synced_to_cloud is None:
+            return
+        next_sync_due = self.next_sync_due(cooldown=interval)
+        if next_sync_due is not None and next_sync_due <= dt_util.utcnow():
             _LOGGER.debug(
-                f"HVAC on, changing force_scan_interval to api_cloud duration of minutes"
+                f"requesting a sync based on scan interval; last synced:{self.last_synced_to_cloud}; last sync requested:{self.last_sync_requested}"
             )
-            force_scan_interval = self.api_cloud.hvac_on_force_scan_interval
-        if (
-            self.api_cloud.no_force_scan_hour_start
-            > event_time_local.hour
-            >= self.api_cloud.no_force_scan_hour_finish
-        ):
-            age_of_last_sync = datetime.now(api_timezone) - self.last_synced_to_cloud
-            if age_of_last_sync > force_scan_interval:
-                if self.last_sync_requested is not None and interval:
-                    age_of_last_request_to_sync = (
-                        datetime.now(api_timezone) - self.last_sync_requested
-                    )
-                    if age_of_last_request_to_sync < REQUEST_TO_SYNC_COOLDOWN:
-                        _LOGGER.debug(
-                            f"sync request skipping, interval sync request failed to be fulfilled by Vehicle, REQUEST_TO_SYNC_COOLDOWN:{REQUEST_TO_SYNC_COOLDOWN}; age_of_last_request_to_sync:{age_of_last_request_to_sync}"
-                        )
-                        return
-                _LOGGER.debug(
-                    f"requesting a sync based on scan interval; age_of_last_sync:{age_of_last_sync}; last synced:{self.last_synced_to_cloud}; now:{event_time_api}"
-                )
-                await asyncio.sleep(INITIAL_STATUS_DELAY_AFTER_COMMAND)
-                await self.request_sync()
-            else:
-                _LOGGER.debug(
-                    f"sync request skipping, a sync within force scan interval: age_of_last_sync:{age_of_last_sync}, force_scan_interval: {force_scan_interval}"
-                )
+            await asyncio.sleep(INITIAL_STATUS_DELAY_AFTER_COMMAND)
+            await self.request_sync(user_initiated=not interval)
         else:
             _LOGGER.debug(
-                f"sync request skipping, no scan settings, setting start:{self.api_cloud.no_force_scan_hour_start}, finish:{self.api_cloud.no_force_scan_hour_finish}; now:{event_time_local.hour}"
+                f"sync request skipping, next sync due:{next_sync_due}; setting start:{self.no_force_scan_hour_start}, finish:{self.no_force_scan_hour_finish}"
+            )
+
+    def next_poll_due(self) -> datetime:
+        next_poll_due = self.next_refresh_due()
+        next_sync_due = self.next_sync_due()
+        if next_sync_due is not None and next_sync_due < next_poll_due:
+            next_poll_due = next_sync_due
+        return next_poll_due
+
+    def next_refresh_due(self) -> datetime:
+        if self.last_updated_from_cloud is None:
+            return dt_util.utcnow()
+        return (
+            self.last_updated_from_cloud + self.polling_policy.intervals(self).refresh
+        )
+
+    def next_sync_due(self, cooldown: bool = True) -> datetime | None:
+        if self.last_synced_to_cloud is None:
+            return None
+        next_sync_due = (
+            self.last_synced_to_cloud + self.polling_policy.intervals(self).force_sync
+        )
+        if cooldown and self.last_sync_requested is not None:
+            next_sync_due = max(
+                next_sync_due, self.last_sync_requested + REQUEST_TO_SYNC_COOLDOWN
+            )
+        return self._first_time_force_scan_allowed(max(next_sync_due, dt_util.utcnow()))
+
+    def mark_updated_from_cloud(self, previous_position: tuple) -> None:
+        self.last_updated_from_cloud = dt_util.utcnow()
+        if self.raw_response_buffer is not None and self.raw_responses is not None:
+            self.raw_response_buffer.append(self.raw_responses)
+        self.raw_responses = None
+        self._detect_changes(everything=self.restored_from_snapshot)
+        self.restored_from_snapshot = False
+        if None not in previous_position and previous_position != self.position():
+            self.last_moved_at = self.last_updated_from_cloud
+        self._report_changes()
+        self.async_schedule_save()
+
+    def _report_changes(self) -> None:
+        """
+        one event per update carrying every telemetry field that changed,
+        keyed by field so a listener looks up just the ones it cares about
+        """
+        if self._reported_snapshot is None:
+            # first parse, nothing known to compare with
+            self.change_set = {}
+        else:
+            self.change_set = self.snapshot.changes(self._reported_snapshot)
+        self._reported_snapshot = self.snapshot
+        if not self.change_set:
+            return
+        self.api_cloud.hass.bus.async_fire(
+            EVENT_VEHICLE_CHANGED,
+            {
+                "vehicle_identifier": self.identifier,
+                "vehicle_name": self.name,
+                "synced_at": _datetime_as_str(self.last_synced_to_cloud),
+                "changes": {
+                    field: change.as_event_data()
+                    for field, change in self.change_set.items()
+                },
+            },
+        )
+
+    @contextmanager
+    def updating_snapshot(self):
+        """
+        telemetry written inside the block is published as one new snapshot
+        when it exits cleanly, and dropped when it raises
+        """
+        state = building_state(self)
+        if state is not None:
+            yield state
+            return
+        state = self.snapshot.builder(owner=self)
+        token = begin_building(state)
+        try:
+            yield state
+        finally:
+            end_building(token)
+        self.previous_snapshots.append(self.snapshot)
+        self.snapshot = state.build(published=self.snapshot)
+
+    def snapshot_version(self, version: int) -> StateSnapshot | None:
+        if version == self.snapshot.version:
+            return self.snapshot
+        for snapshot in self.previous_snapshots:
+            if snapshot.version == version:
+                return snapshot
+        return None
+
+    def changes_since(self, version: int) -> frozenset[str] | None:
+        """
+        telemetry fields that changed after the given version, None once that
+        version dropped out of the history
+        """
+        older = self.snapshot_version(version)
+        if older is None:
+            return None
+        return self.snapshot.changed_fields(older)
+
+    def _current_state(self) -> StateSnapshot | VehicleState:
+        return building_state(self) or self.snapshot
+
+    def _detect_changes(self, everything: bool = False) -> None:
+        field_values = self._tracked_field_values()
+        fingerprint = hash(tuple(field_values.values()))
+        if everything:
+            self.changed_fields = frozenset(field_values)
+        elif fingerprint == self.status_fingerprint:
+            self.changed_fields = frozenset()
+        else:
+            self.changed_fields = frozenset(
+                key
+                for key, value in field_values.items()
+                if key not in self._field_values or self._field_values[key] != value
+            )
+        _LOGGER.debug(f"{self.identifier} changed fields:{sorted(self.changed_fields)}")
+        self.status_fingerprint = fingerprint
+        self._field_values = field_values
+
+    def _tracked_field_values(self) -> dict:
+        field_values = self.__repr__()
+        # moves on every update, says nothing about the car
+        del field_values["last_updated_from_cloud"]
+        if self.raw_response_buffer is not None:
+            field_values["raw_responses"] = self.raw_response_buffer.captured
+        return field_values
+
+    def fields_changed(self, keys) -> bool:
+        return not self.changed_fields.isdisjoint(keys)
+
+    def position(self) -> tuple:
+        return self.odometer_value, self.latitude, self.longitude
+
+    def bookkeeping_as_dict(self) -> dict:
+        usage_counters = dict(self._restored_usage_counters)
+        for key in USAGE_COUNTER_KEYS:
+            usage_counter = getattr(self, key)
+            if usage_counter is not None:
+                usage_counters[key] = usage_counter.as_dict()
+        snapshot = self._restored_snapshot
+        if self.last_updated_from_cloud is not None:
+            snapshot = self.snapshot_as_dict()
+        return {
+            "last_sync_requested": _datetime_as_str(self.last_sync_requested),
+            "last_synced_to_cloud": _datetime_as_str(self.last_synced_to_cloud),
+            "last_loc_timestamp": _datetime_as_str(self.last_loc_timestamp),
+            "usage_counters": usage_counters,
+            "snapshot": snapshot,
+        }
+
+    def restore_bookkeeping(self, data: dict) -> None:
+        self.last_sync_requested = _str_as_datetime(data.get("last_sync_requested"))
+        self.last_synced_to_cloud = _str_as_datetime(data.get("last_synced_to_cloud"))
+        self.last_loc_timestamp = _str_as_datetime(data.get("last_loc_timestamp"))
+        self._restored_usage_counters = data.get("usage_counters", {})
+
+    def snapshot_as_dict(self) -> dict:
+        state = {
+            key: value
+            for key, value in self.__repr__().items()
+            if key not in SNAPSHOT_EXCLUDED_KEYS
+        }
+        return {
+            "vin": self.vin,
+            "key": self.key,
+            "model": self.model,
+            "name": self.name,
+            "api_unsupported_keys": sorted(self.api_unsupported_keys),
+            "binary_instrument_keys": [
+                instrument[1] for instrument in self.supported_binary_instruments()
+            ],
+            "instrument_keys": [
+                instrument[1] for instrument in self.supported_instruments()
+            ],
+            "state": state,
+        }
+
+    def restore_snapshot(self, snapshot: dict) -> None:
+        self.vin = snapshot["vin"]
+        self.key = snapshot["key"]
+        self.model = snapshot["model"]
+        self.name = snapshot["name"]
+        with self.updating_snapshot():
+            for key, value in snapshot["state"].items():
+                setattr(self, key, value)
+        self._reported_snapshot = self.snapshot
+        self._restored_snapshot = snapshot
+        if self.latitude is not None and self.longitude is not None:
+            self.motion.anchor(
+                self.latitude, self.longitude, self.odometer_value, dt_util.utcnow()
             )
+        self.restored_from_snapshot = True
 
-    async def request_sync(self):
+    def usage_counter_data(self, key: str) -> dict:
+        return self._restored_usage_counters.get(key, {})
+
+    def async_schedule_save(self) -> None:
+        if self.storage is not None:
+            self.storage.async_schedule_save()
+
+    def refresh_staleness(self) -> float:
+        if self.last_updated_from_cloud is None:
+            return float("inf")
+        age = dt_util.utcnow() - self.last_updated_from_cloud
+        return age / self.polling_policy.intervals(self).refresh
+
+    def sync_staleness(self) -> float:
+        if self.last_synced_to_cloud is None:
+            return float("inf")
+        age = dt_util.utcnow() - self.last_synced_to_cloud
+        return age / self.polling_policy.intervals(self).force_sync
+
+    def _first_time_force_scan_allowed(self, earliest: datetime) -> datetime | None:
+        earliest_local = dt_util.as_local(earliest)
+        if (
+            self.no_force_scan_hour_start
+            > earliest_local.hour
+            >= self.no_force_scan_hour_finish
+        ):
+            return earliest
+        if self.no_force_scan_hour_start <= self.no_force_scan_hour_finish:
+            return None
+        allowed_local = earliest_local.replace(
+            hour=self.no_force_scan_hour_finish, minute=0, second=0, microsecond=0
+        )
+        if earliest_local.hour >= self.no_force_scan_hour_start:
+            allowed_local += timedelta(days=1)
+        return dt_util.as_utc(allowed_local)
+
+    async def request_sync(self, user_initiated: bool = True):
+        if user_initiated:
+            self.api_cloud.budget.consume(cost=REQUEST_SYNC_BUDGET_COST)
+        elif not self.api_cloud.budget.try_consume(
+            cost=REQUEST_SYNC_BUDGET_COST, priority=self.sync_staleness()
+        ):
+            _LOGGER.debug(f"sync request skipping, request budget too low")
+            return
         api_timezone = dt_util.UTC
         event_time_api = dt_util.utcnow().astimezone(api_timezone)
         self.last_sync_requested = event_time_api
+        self.async_schedule_save()
         previous_last_synced_to_cloud = self.last_synced_to_cloud
         if (
             self.calls_today_for_request_sync is not None
@@ -203,9 +496,14 @@ class Vehicle:
             raise error
 
     async def lock_action(self, action: VEHICLE_LOCK_ACTION):
-        await self.api_cloud.lock(vehicle=self, action=action)
-        if self.calls_today_for_actions is not None:
-            self.calls_today_for_actions.mark_used()
+        locked = action == VEHICLE_LOCK_ACTION.LOCK
+        await self._run_command(
+            f"Lock {action.value}",
+            lambda: self.api_cloud.lock(vehicle=self, action=action),
+            group="lock",
+            satisfied=lambda: self._state_shows(doors_locked=locked),
+            effects={"doors_locked": locked},
+        )
 
     async def start_climate(self, set_temp, defrost, climate, heating, duration):
         if set_temp is None:
@@ -218,44 +516,152 @@ class Vehicle:
             heating = False
         if duration is None:
             duration = 5
-        await self.api_cloud.start_climate(
-            vehicle=self,
-            set_temp=set_temp,
-            defrost=defrost,
-            climate=climate,
-            heating=heating,
-            duration=duration,
+        await self._run_command(
+            "Start Climate",
+            lambda: self.api_cloud.start_climate(
+                vehicle=self,
+                set_temp=set_temp,
+                defrost=defrost,
+                climate=climate,
+                heating=heating,
+                duration=duration,
+            ),
+            group="climate",
+            arguments=(set_temp, defrost, climate, heating, duration),
+            effects={"climate_hvac_on": True, "climate_defrost_on": defrost},
         )
-        if self.calls_today_for_actions is not None:
-            self.calls_today_for_actions.mark_used()
 
     async def stop_climate(self):
-        await self.api_cloud.stop_climate(vehicle=self)
-        if self.calls_today_for_actions is not None:
-            self.calls_today_for_actions.mark_used()
+        await self._run_command(
+            "Stop Climate",
+            lambda: self.api_cloud.stop_climate(vehicle=self),
+            group="climate",
+            satisfied=lambda: self._state_shows(climate_hvac_on=False),
+            effects={"climate_hvac_on": False, "climate_defrost_on": False},
+        )
 
     async def start_charge(self):
-        await self.api_cloud.start_charge(vehicle=self)
-        if self.calls_today_for_actions is not None:
-            self.calls_today_for_actions.mark_used()
+        await self._run_command(
+            "Start Charge",
+            lambda: self.api_cloud.start_charge(vehicle=self),
+            group="charge",
+            satisfied=lambda: self._state_shows(ev_battery_charging=True),
+            effects={"ev_battery_charging": True},
+        )
 
     async def stop_charge(self):
-        await self.api_cloud.stop_charge(vehicle=self)
-        if self.calls_today_for_actions is not None:
-            self.calls_today_for_actions.mark_used()
+        await self._run_command(
+            "Stop Charge",
+            lambda: self.api_cloud.stop_charge(vehicle=self),
+            group="charge",
+            satisfied=lambda: self._state_shows(ev_battery_charging=False),
+            effects={"ev_battery_charging": False},
+        )
 
     async def set_charge_limits(self, ac_limit: int, dc_limit: int):
         if ac_limit is None:
             ac_limit = 90
         if dc_limit is None:
             dc_limit = 90
-        await self.api_cloud.set_charge_limits(
-            vehicle=self, ac_limit=ac_limit, dc_limit=dc_limit
+        await self._run_command(
+            "Set Charge Limits",
+            lambda: self.api_cloud.set_charge_limits(
+                vehicle=self, ac_limit=ac_limit, dc_limit=dc_limit
+            ),
+            group="charge_limits",
+            arguments=(ac_limit, dc_limit),
+            satisfied=lambda: self._state_shows(
+                ev_max_ac_charge_level=ac_limit, ev_max_dc_charge_level=dc_limit
+            ),
+            effects={
+                "ev_max_ac_charge_level": ac_limit,
+                "ev_max_dc_charge_level": dc_limit,
+            },
+        )
+
+    async def _run_command(
+        self,
+        name: str,
+        run,
+        group: str,
+        arguments: tuple = (),
+        satisfied=None,
+        effects: dict | None = None,
+    ) -> None:
+        self.last_user_action_at = dt_util.utcnow()
+
+        async def counted_run():
+            # only commands that reach the cloud count against the budget
+            self.api_cloud.budget.consume(cost=ACTION_BUDGET_COST)
+            await run()
+            if self.calls_today_for_actions is not None:
+                self.calls_today_for_actions.mark_used()
+            if effects and self.commands.current.confirmed:
+                self.apply_optimistic_state(effects)
+
+        await self.commands.run(
+            name,
+            counted_run,
+            group=group,
+            arguments=arguments,
+            satisfied=satisfied,
+        )
+
+    def apply_optimistic_state(self, effects: dict) -> None:
+        """
+        shows what a completed command did right away instead of fetching the
+        status to learn it
+        """
+        applied_at = dt_util.utcnow()
+        with self.updating_snapshot():
+            for key, value in effects.items():
+                setattr(self, key, value)
+                self.optimistic_state[key] = (value, applied_at)
+        self._detect_changes()
+        self.coordinator.async_set_updated_data(self)
+
+    def reconcile_optimistic_state(self) -> None:
+        """
+        called at the end of an update; a status the car synced before the
+        command completed can't show it yet, so the expected effect stays on
+        top until the car reports after it or it expires
+        """
+        if not self.optimistic_state:
+            return
+        now = dt_util.utcnow()
+        for key, (value, applied_at) in list(self.optimistic_state.items()):
+            if (
+                self.last_synced_to_cloud is not None
+                and self.last_synced_to_cloud > applied_at
+            ) or now - applied_at > OPTIMISTIC_STATE_TTL:
+                del self.optimistic_state[key]
+            else:
+                setattr(self, key, value)
+
+    def _state_shows(self, **expected) -> bool:
+        """
+        whether the latest snapshot already shows the outcome of a command;
+        only trusted while the car synced recently, and only for what the
+        cloud reported rather than what an earlier command is expected to do
+        """
+        if (
+            self.last_synced_to_cloud is None
+            or dt_util.utcnow() - self.last_synced_to_cloud > COMMAND_STATE_TRUST_WINDOW
+        ):
+            return False
+        return all(
+            key not in self.optimistic_state and getattr(self, key) == value
+            for key, value in expected.items()
         )
-        if self.calls_today_for_actions is not None:
-            self.calls_today_for_actions.mark_used()
 
     def supported_binary_instruments(self):
+        if self.restored_from_snapshot:
+            return [
+                binary_instrument
+                for binary_instrument in BINARY_INSTRUMENTS
+                if binary_instrument[1]
+                in self._restored_snapshot["binary_instrument_keys"]
+            ]
         supported_binary_instruments = []
         empty_keys = self.empty_keys()
         for binary_instrument in BINARY_INSTRUMENTS:
@@ -266,6 +672,12 @@ class Vehicle:
         return supported_binary_instruments
 
     def supported_instruments(self):
+        if self.restored_from_snapshot:
+            return [
+                instrument
+                for instrument in INSTRUMENTS
+                if instrument[1] in self._restored_snapshot["instrument_keys"]
+            ]
         supported_instruments = []
         empty_keys = self.empty_keys()
         for instrument in INSTRUMENTS:
@@ -274,32 +686,55 @@ class Vehicle:
                 if instrument_key not in empty_keys:
                     supported_instruments.append(instrument)
                 elif (
-                    instrument_key
-                    in [
-                        "ev_battery_level",
-                        "ev_max_dc_charge_level",
-                        "ev_max_ac_charge_level",
-                    ]
+                    instrument_key in EV_INSTRUMENT_KEYS_SUPPORTED_WHEN_EMPTY
                     and self.ev_plugged_in is not None
                 ):
                     supported_instruments.append(instrument)
         return supported_instruments
 
-    def empty_keys(self):
-        return [key for key, value in self.__repr__().items() if value is None]
-
-    async def update_location_name(self):
-        async with Nominatim(
-            user_agent="ha_kia_hyundai",
-            adapter_factory=AioHTTPAdapter,
-        ) as geolocator:
-            try:
-                location: Location = await geolocator.reverse(
-                    query=(self.latitude, self.longitude)
-                )
-                self.location_name = location.address
-            except GeocoderServiceError as error:
-                _LOGGER.warning(f"Location name lookup failed:{error}")
+    def empty_keys(self) -> frozenset[str]:
+        return self._current_state().none_fields()
+
+    def location_fix_due(self) -> bool:
+        return self.motion.needs_fix(
+            self.odometer_value,
+            dt_util.utcnow(),
+            max_age=self.polling_policy.intervals(self).refresh,
+        )
+
+    def update_position(
+        self, previous_latitude: float | None, previous_longitude: float | None
+    ) -> None:
+        """
+        called once the latest fix is mapped; a fix within gps noise of where
+        the car is parked is put back to that spot so nothing downstream sees
+        it move, a real move gets a new location name from the geocoder's
+        background worker
+        """
+        if self.latitude is None or self.longitude is None:
+            return
+        moved = self.motion.observe(
+            self.latitude, self.longitude, self.odometer_value, dt_util.utcnow()
+        )
+        if (
+            not moved
+            and previous_latitude is not None
+            and previous_longitude is not None
+        ):
+            self.latitude = previous_latitude
+            self.longitude = previous_longitude
+        if (moved or self.location_name is None) and self.geocoder is not None:
+            self.geocoder.enqueue(self)
+
+    @callback
+    def set_location_name(
+        self, latitude: float, longitude: float, location_name: str
+    ) -> None:
+        if (latitude, longitude) != (self.latitude, self.longitude):
+            # the car moved on while this was resolving, its own lookup is queued
+            return
+        self.location_name = location_name
+        self.location_updates.publish_updates()
 
     def __repr__(self):
         return {
@@ -308,67 +743,22 @@ class Vehicle:
             "key": self.key,
             "model": self.model,
             "name": self.name,
-            "last_synced_to_cloud": self.last_synced_to_cloud,
             "last_updated_from_cloud": self.last_updated_from_cloud,
             "last_sync_requested": self.last_sync_requested,
-            "fuel_range_value": self.fuel_range_value,
-            "fuel_range_unit": self.fuel_range_unit,
-            "total_range_value": self.total_range_value,
-            "total_range_unit": self.total_range_unit,
-            "odometer_value": self.odometer_value,
-            "odometer_unit": self.odometer_unit,
-            "battery_level": self.battery_level,
-            "engine_on": self.engine_on,
-            "low_fuel_light_on": self.low_fuel_light_on,
-            "doors_locked": self.doors_locked,
-            "door_front_left_open": self.door_front_left_open,
-            "door_front_right_open": self.door_front_right_open,
-            "door_back_left_open": self.door_back_left_open,
-            "door_back_right_open": self.door_back_right_open,
-            "door_trunk_open": self.door_trunk_open,
-            "door_hood_open": self.door_hood_open,
-            "sleep_mode_on": self.sleep_mode_on,
-            "climate_hvac_on": self.climate_hvac_on,
-            "climate_defrost_on": self.climate_defrost_on,
-            "climate_temperature_value": self.climate_temperature_value,
-            "climate_temperature_unit": self.climate_temperature_unit,
-            "climate_heated_steering_wheel_on": self.climate_heated_steering_wheel_on,
-            "climate_heated_side_mirror_on": self.climate_heated_side_mirror_on,
-            "climate_heated_rear_window_on": self.climate_heated_rear_window_on,
-            "climate_heated_seat_front_right_on": self.climate_heated_seat_front_right_on,
-            "climate_heated_seat_front_left_on": self.climate_heated_seat_front_left_on,
-            "climate_heated_seat_rear_right_on": self.climate_heated_seat_rear_right_on,
-            "climate_heated_seat_rear_left_on": self.climate_heated_seat_rear_left_on,
-            "ev_plugged_in": self.ev_plugged_in,
-            "ev_battery_charging": self.ev_battery_charging,
-            "ev_battery_level": self.ev_battery_level,
-            "ev_charge_current_remaining_duration": self.ev_charge_current_remaining_duration,
-            "ev_charge_fast_duration": self.ev_charge_fast_duration,
-            "ev_charge_portable_duration": self.ev_charge_portable_duration,
-            "ev_charge_station_duration": self.ev_charge_station_duration,
-            "ev_remaining_range_value": self.ev_remaining_range_value,
-            "ev_remaining_range_unit": self.ev_remaining_range_unit,
-            "ev_max_dc_charge_level": self.ev_max_dc_charge_level,
-            "ev_max_ac_charge_level": self.ev_max_ac_charge_level,
-            "ev_max_range_ac_charge_value": self.ev_max_range_ac_charge_value,
-            "ev_max_range_ac_charge_unit": self.ev_max_range_ac_charge_unit,
-            "ev_max_range_dc_charge_value": self.ev_max_range_dc_charge_value,
-            "ev_max_range_dc_charge_unit": self.ev_max_range_dc_charge_unit,
-            "tire_all_on": self.tire_all_on,
-            "tire_front_left_on": self.tire_front_left_on,
-            "tire_front_right_on": self.tire_front_right_on,
-            "tire_rear_left_on": self.tire_rear_left_on,
-            "tire_rear_right_on": self.tire_rear_right_on,
-            "last_service_value": self.last_service_value,
-            "last_service_unit": self.last_service_unit,
-            "next_service_value": self.next_service_value,
-            "next_service_unit": self.next_service_unit,
-            "next_service_mile_value": self.next_service_mile_value,
-            "next_service_mile_unit": self.next_service_mile_unit,
-            "latitude": self.latitude,
-            "longitude": self.longitude,
-            "location_name": self.location_name,
+            **self._current_state().as_dict(),
         }
 
     def __str__(self):
         return f"{self.__repr__()}"
+
+
+def _datetime_as_str(value: datetime | None) -> str | None:
+    if value is None:
+        return None
+    return value.isoformat()
+
+
+def _str_as_datetime(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    return dt_util.parse_datetime(value)
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from homeassistant.util import dt as dt_util
+
+# the state being built by the update running in the current task, so that
+# update reads its own writes while everyone else reads the published snapshot
+_building: ContextVar[VehicleState | None] = ContextVar(
+    "ha_kia_hyundai_building_state", default=None
+)
+
+
+class FieldChange(NamedTuple):
+    field: str
+    old: Any
+    new: Any
+    synced_at: datetime | None
+
+    def as_event_data(self) -> dict:
+        return {
+            "old": _event_value(self.old),
+            "new": _event_value(self.new),
+            "synced_at": _event_value(self.synced_at),
+        }
+
+
+def _event_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class StateLayout:
+    """
+    field names of a state record in declaration order, filled in as the
+    StateField descriptors of the owning class are created
+    """
+
+    def __init__(self):
+        self.fields: list[str] = []
+        self.index: dict[str, int] = {}
+
+    def field(self) -> StateField:
+        return StateField(self)
+
+    def register(self, name: str) -> int:
+        self.index[name] = len(self.fields)
+        self.fields.append(name)
+        return self.index[name]
+
+    def empty_snapshot(self) -> StateSnapshot:
+        return StateSnapshot(
+            layout=self,
+            version=0,
+            values=(None,) * len(self.fields),
+            none_mask=(1 << len(self.fields)) - 1,
+        )
+
+
+class _StateReader:
+    __slots__ = ()
+
+    def is_none(self, name: str) -> bool:
+        index = self.layout.index.get(name)
+        return index is not None and bool(self.none_mask >> index & 1)
+
+    def none_fields(self) -> frozenset[str]:
+        fields = self.layout.fields
+        none_fields = []
+        mask = self.none_mask
+        while mask:
+            lowest = mask & -mask
+            none_fields.append(fields[lowest.bit_length() - 1])
+            mask ^= lowest
+        return frozenset(none_fields)
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(zip(self.layout.fields, self.values))
+
+
+class StateSnapshot(_StateReader):
+    """
+    published telemetry of a vehicle; never changes, every update publishes
+    a new one with the next version
+    """
+
+    __slots__ = ("layout", "version", "values", "none_mask", "created_at")
+
+    def __init__(
+        self,
+        layout: StateLayout,
+        version: int,
+        values: tuple,
+        none_mask: int,
+    ):
+        object.__setattr__(self, "layout", layout)
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "values", values)
+        object.__setattr__(self, "none_mask", none_mask)
+        object.__setattr__(self, "created_at", dt_util.utcnow())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("state snapshots are immutable")
+
+    def builder(self, owner) -> VehicleState:
+        return VehicleState(self, owner)
+
+    def changed_fields(self, older: StateSnapshot) -> frozenset[str]:
+        fields = self.layout.fields
+        return frozenset(
+            fields[index]
+            for index, (value, older_value) in enumerate(zip(self.values, older.values))
+            if value is not older_value and value != older_value
+        )
+
+    def changes(self, older: StateSnapshot) -> dict[str, FieldChange]:
+        synced_at = self.values[self.layout.index["last_synced_to_cloud"]]
+        fields = self.layout.fields
+        return {
+            fields[index]: FieldChange(fields[index], older_value, value, synced_at)
+            for index, (value, older_value) in enumerate(zip(self.values, older.values))
+            if value is not older_value and value != older_value
+        }
+
+
+class VehicleState(_StateReader):
+    """
+    mutable copy of a snapshot an update writes into before publishing it
+    """
+
+    __slots__ = ("layout", "base", "owner", "values", "none_mask", "written")
+
+    def __init__(self, base: StateSnapshot, owner):
+        self.layout: StateLayout = base.layout
+        self.base: StateSnapshot = base
+        self.owner = owner
+        self.values: list[Any] = list(base.values)
+        self.none_mask: int = base.none_mask
+        self.written: int = 0
+
+    def set(self, index: int, value: Any) -> None:
+        self.values[index] = value
+        self.written |= 1 << index
+        if value is None:
+            self.none_mask |= 1 << index
+        else:
+            self.none_mask &= ~(1 << index)
+
+    def build(self, published: StateSnapshot | None = None) -> StateSnapshot:
+        """
+        published is the owner's snapshot at the time of publishing; fields
+        this state never wrote take its values, so a write published by
+        someone else while this one was being built isn't lost
+        """
+        base = self.base
+        if published is not None and published is not base:
+            for index, value in enumerate(published.values):
+                if not self.written >> index & 1:
+                    self.values[index] = value
+            self.none_mask = (published.none_mask & ~self.written) | (
+                self.none_mask & self.written
+            )
+            base = published
+        return StateSnapshot(
+            layout=self.layout,
+            version=base.version + 1,
+            values=tuple(self.values),
+            none_mask=self.none_mask,
+        )
+
+
+def building_state(owner) -> VehicleState | None:
+    state = _building.get()
+    if state is not None and state.owner is owner:
+        return state
+    return None
+
+
+def begin_building(state: VehicleState):
+    return _building.set(state)
+
+
+def end_building(token) -> None:
+    _building.reset(token)
+
+
+class StateField:
+    """
+    vehicle attribute read from the vehicle's published snapshot, or from
+    the state its running update is building
+    """
+
+    __slots__ = ("layout", "index")
+
+    def __init__(self, layout: StateLayout):
+        self.layout: StateLayout = layout
+        self.index: int | None = None
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.index = self.layout.register(name)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        state = building_state(instance)
+        if state is None:
+            return instance.snapshot.values[self.index]
+        return state.values[self.index]
+
+    def __set__(self, instance, value) -> None:
+        state = building_state(instance)
+        if state is None:
+            # a lone write outside an update publishes right away
+            with instance.updating_snapshot() as state:
+                state.set(self.index, value)
+        else:
+            state.set(self.index, value)
@@ -0,0 +1 @@
+"""tests for the kia uvo / hyundai bluelink integration"""
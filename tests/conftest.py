@@ -0,0 +1,10 @@
+import json
+from pathlib import Path
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name: str) -> dict:
+    return json.loads((FIXTURES / name).read_text())
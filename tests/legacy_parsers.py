@@ -0,0 +1,656 @@
+"""
+the hand written status parsing the mapping tables replaced, kept as the
+reference the tables are checked against; only the network calls and the
+location lookups that followed the parsing are left out
+"""
+
+import re
+from datetime import datetime
+
+from homeassistant.const import (
+    LENGTH_MILES,
+    TEMP_CELSIUS,
+    TEMP_FAHRENHEIT,
+)
+from homeassistant.util import dt as dt_util
+
+from custom_components.ha_kia_hyundai.const import CA_TEMP_RANGE, USA_TEMP_RANGE
+from custom_components.ha_kia_hyundai.util import (
+    convert_api_unit_to_ha_unit_of_distance,
+    safely_get_json_value,
+)
+
+
+def convert_last_updated_str_to_datetime(last_updated_str, timezone_of_str):
+    m = re.match(
+        r"(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})",
+        last_updated_str,
+    )
+    return datetime(
+        year=int(m.group(1)),
+        month=int(m.group(2)),
+        day=int(m.group(3)),
+        hour=int(m.group(4)),
+        minute=int(m.group(5)),
+        second=int(m.group(6)),
+        tzinfo=timezone_of_str,
+    )
+
+
+def parse_us_kia(vehicle, api_vehicle_status: dict) -> None:
+    vehicle_status = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleInfoList.0.lastVehicleInfo.vehicleStatusRpt.vehicleStatus",
+    )
+    target_soc = safely_get_json_value(vehicle_status, "evStatus.targetSOC")
+    if target_soc is not None:
+        target_soc.sort(key=lambda x: x["plugType"])
+    vehicle.last_synced_to_cloud = convert_last_updated_str_to_datetime(
+        last_updated_str=vehicle_status["syncDate"]["utc"],
+        timezone_of_str=dt_util.UTC,
+    )
+    vehicle.odometer_value = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleInfoList.0.vehicleConfig.vehicleDetail.vehicle.mileage",
+        float,
+    )
+    vehicle.odometer_unit = LENGTH_MILES
+
+    maintenance_array = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleInfoList.0.vehicleConfig.maintenance.maintenanceSchedule",
+    )
+    if maintenance_array is not None:
+        maintenance_array.append(vehicle.odometer_value)
+        maintenance_array.sort()
+        current_mileage_index = maintenance_array.index(vehicle.odometer_value)
+        if current_mileage_index > 0:
+            vehicle.last_service_value = maintenance_array[current_mileage_index - 1]
+            vehicle.last_service_unit = LENGTH_MILES
+        else:
+            vehicle.last_service_value = 0
+            vehicle.last_service_unit = LENGTH_MILES
+
+        if current_mileage_index != -1:
+            vehicle.next_service_value = maintenance_array[current_mileage_index + 1]
+            vehicle.next_service_unit = LENGTH_MILES
+        else:
+            vehicle.next_service_value = 0
+            vehicle.next_service_unit = LENGTH_MILES
+
+    vehicle.next_service_mile_value = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleInfoList.0.vehicleConfig.maintenance.nextServiceMile",
+        float,
+    )
+    vehicle.next_service_mile_unit = LENGTH_MILES
+
+    vehicle.battery_level = safely_get_json_value(
+        vehicle_status, "batteryStatus.stateOfCharge", int
+    )
+    vehicle.engine_on = safely_get_json_value(vehicle_status, "engine", bool)
+    vehicle.low_fuel_light_on = safely_get_json_value(
+        vehicle_status, "lowFuelLight", bool
+    )
+    vehicle.doors_locked = safely_get_json_value(vehicle_status, "doorLock", bool)
+    vehicle.door_front_left_open = safely_get_json_value(
+        vehicle_status, "doorStatus.frontLeft", bool
+    )
+    vehicle.door_front_right_open = safely_get_json_value(
+        vehicle_status, "doorStatus.frontRight", bool
+    )
+    vehicle.door_back_left_open = safely_get_json_value(
+        vehicle_status, "doorStatus.backLeft", bool
+    )
+    vehicle.door_back_right_open = safely_get_json_value(
+        vehicle_status, "doorStatus.backRight", bool
+    )
+    vehicle.door_trunk_open = safely_get_json_value(
+        vehicle_status, "doorStatus.trunk", bool
+    )
+    vehicle.door_hood_open = safely_get_json_value(
+        vehicle_status, "doorStatus.hood", bool
+    )
+    vehicle.sleep_mode_on = safely_get_json_value(vehicle_status, "sleepMode", bool)
+    vehicle.climate_hvac_on = safely_get_json_value(
+        vehicle_status, "climate.airCtrl", bool
+    )
+    vehicle.climate_defrost_on = safely_get_json_value(
+        vehicle_status, "climate.defrost", bool
+    )
+
+    vehicle.climate_temperature_value = safely_get_json_value(
+        vehicle_status, "climate.airTemp.value"
+    )
+    if vehicle.climate_temperature_value == "0xLOW":
+        vehicle.climate_temperature_value = USA_TEMP_RANGE[0]
+    elif vehicle.climate_temperature_value == "0xHIGH":
+        vehicle.climate_temperature_value = USA_TEMP_RANGE[-1]
+    vehicle.climate_temperature_unit = TEMP_FAHRENHEIT
+
+    vehicle.climate_heated_steering_wheel_on = safely_get_json_value(
+        vehicle_status, "climate.heatingAccessory.steeringWheel", bool
+    )
+    vehicle.climate_heated_side_mirror_on = safely_get_json_value(
+        vehicle_status, "climate.heatingAccessory.sideMirror", bool
+    )
+    vehicle.climate_heated_rear_window_on = safely_get_json_value(
+        vehicle_status, "climate.heatingAccessory.rearWindow", bool
+    )
+    vehicle.ev_plugged_in = safely_get_json_value(
+        vehicle_status, "evStatus.batteryPlugin", bool
+    )
+    vehicle.ev_battery_charging = safely_get_json_value(
+        vehicle_status, "evStatus.batteryCharge", bool
+    )
+    ev_battery_level = safely_get_json_value(
+        vehicle_status, "evStatus.batteryStatus", int
+    )
+    if ev_battery_level != 0:
+        vehicle.ev_battery_level = ev_battery_level
+    vehicle.ev_charge_current_remaining_duration = safely_get_json_value(
+        vehicle_status, "evStatus.remainChargeTime.0.timeInterval.value", int
+    )
+    vehicle.ev_remaining_range_value = safely_get_json_value(
+        vehicle_status,
+        "evStatus.drvDistance.0.rangeByFuel.evModeRange.value",
+        int,
+    )
+    vehicle.ev_remaining_range_unit = LENGTH_MILES
+    vehicle.total_range_value = safely_get_json_value(
+        vehicle_status,
+        "evStatus.drvDistance.0.rangeByFuel.totalAvailableRange.value",
+        int,
+    )
+    vehicle.total_range_unit = LENGTH_MILES
+    hybrid_fuel_range_value = safely_get_json_value(
+        vehicle_status,
+        "evStatus.drvDistance.0.rangeByFuel.gasModeRange.value",
+        float,
+    )
+    no_ev_fuel_range_value = safely_get_json_value(
+        vehicle_status, "distanceToEmpty.value"
+    )
+    if hybrid_fuel_range_value is not None:
+        vehicle.fuel_range_value = hybrid_fuel_range_value
+    else:
+        vehicle.fuel_range_value = no_ev_fuel_range_value
+        vehicle.total_range_value = no_ev_fuel_range_value
+    vehicle.fuel_range_unit = LENGTH_MILES
+
+    ev_max_dc_charge_level = safely_get_json_value(
+        vehicle_status, "evStatus.targetSOC.0.targetSOClevel", int
+    )
+    if ev_max_dc_charge_level is not None and ev_max_dc_charge_level <= 100:
+        vehicle.ev_max_dc_charge_level = ev_max_dc_charge_level
+    ev_max_ac_charge_level = safely_get_json_value(
+        vehicle_status, "evStatus.targetSOC.1.targetSOClevel", int
+    )
+    if ev_max_ac_charge_level is not None and ev_max_ac_charge_level <= 100:
+        vehicle.ev_max_ac_charge_level = ev_max_ac_charge_level
+
+    vehicle.tire_all_on = safely_get_json_value(
+        vehicle_status, "tirePressure.all", bool
+    )
+
+    vehicle.latitude = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleInfoList.0.lastVehicleInfo.location.coord.lat",
+        float,
+    )
+    vehicle.longitude = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleInfoList.0.lastVehicleInfo.location.coord.lon",
+        float,
+    )
+
+
+def parse_ca(vehicle, api_vehicle_status: dict, api_vehicle_next_service: dict):
+    vehicle.last_synced_to_cloud = convert_last_updated_str_to_datetime(
+        last_updated_str=api_vehicle_status["status"]["lastStatusDate"],
+        timezone_of_str=dt_util.UTC,
+    )
+
+    target_soc = safely_get_json_value(api_vehicle_status, "status.evStatus.targetSOC")
+    if target_soc is not None:
+        target_soc.sort(key=lambda x: x["plugType"])
+
+    vehicle.doors_locked = safely_get_json_value(
+        api_vehicle_status, "status.doorLock", bool
+    )
+    vehicle.door_hood_open = safely_get_json_value(
+        api_vehicle_status, "status.hoodOpen", bool
+    )
+    vehicle.door_trunk_open = safely_get_json_value(
+        api_vehicle_status, "status.trunkOpen", bool
+    )
+    vehicle.door_front_left_open = safely_get_json_value(
+        api_vehicle_status, "status.doorOpen.frontLeft", bool
+    )
+    vehicle.door_front_right_open = safely_get_json_value(
+        api_vehicle_status, "status.doorOpen.frontRight", bool
+    )
+    vehicle.door_back_left_open = safely_get_json_value(
+        api_vehicle_status, "status.doorOpen.backLeft", bool
+    )
+    vehicle.door_back_right_open = safely_get_json_value(
+        api_vehicle_status, "status.doorOpen.backRight", bool
+    )
+    vehicle.engine_on = safely_get_json_value(api_vehicle_status, "status.engine", bool)
+    vehicle.tire_all_on = safely_get_json_value(
+        api_vehicle_status, "status.tirePressureLamp.tirePressureLampAll", bool
+    )
+    vehicle.tire_front_left_on = safely_get_json_value(
+        api_vehicle_status, "status.tirePressureLamp.tirePressureLampFL", bool
+    )
+    vehicle.tire_front_right_on = safely_get_json_value(
+        api_vehicle_status, "status.tirePressureLamp.tirePressureLampFR", bool
+    )
+    vehicle.tire_rear_left_on = safely_get_json_value(
+        api_vehicle_status, "status.tirePressureLamp.tirePressureLampRL", bool
+    )
+    vehicle.tire_rear_right_on = safely_get_json_value(
+        api_vehicle_status, "status.tirePressureLamp.tirePressureLampRR", bool
+    )
+    vehicle.climate_hvac_on = safely_get_json_value(
+        api_vehicle_status, "status.airCtrlOn", bool
+    )
+    vehicle.climate_defrost_on = safely_get_json_value(
+        api_vehicle_status, "status.defrost", bool
+    )
+    vehicle.climate_heated_rear_window_on = safely_get_json_value(
+        api_vehicle_status, "status.sideBackWindowHeat", bool
+    )
+    vehicle.climate_heated_side_mirror_on = safely_get_json_value(
+        api_vehicle_status, "status.sideMirrorHeat", bool
+    )
+    vehicle.climate_heated_steering_wheel_on = safely_get_json_value(
+        api_vehicle_status, "status.steerWheelHeat", bool
+    )
+    vehicle.climate_heated_seat_front_right_on = safely_get_json_value(
+        api_vehicle_status, "status.seatHeaterVentState.frSeatHeatState", bool
+    )
+    vehicle.climate_heated_seat_front_left_on = safely_get_json_value(
+        api_vehicle_status, "status.seatHeaterVentState.flSeatHeatState", bool
+    )
+    vehicle.climate_heated_seat_rear_right_on = safely_get_json_value(
+        api_vehicle_status, "status.seatHeaterVentState.rrSeatHeatState", bool
+    )
+    vehicle.climate_heated_seat_rear_left_on = safely_get_json_value(
+        api_vehicle_status, "status.seatHeaterVentState.rlSeatHeatState", bool
+    )
+    vehicle.low_fuel_light_on = safely_get_json_value(
+        api_vehicle_status, "status.lowFuelLight", bool
+    )
+    vehicle.ev_battery_charging = safely_get_json_value(
+        api_vehicle_status, "status.evStatus.batteryCharge", bool
+    )
+    vehicle.ev_plugged_in = safely_get_json_value(
+        api_vehicle_status, "status.evStatus.batteryPlugin", bool
+    )
+
+    ev_battery_level = safely_get_json_value(
+        api_vehicle_status, "status.evStatus.batteryStatus", int
+    )
+    if ev_battery_level != 0:
+        vehicle.ev_battery_level = ev_battery_level
+    vehicle.ev_remaining_range_value = safely_get_json_value(
+        api_vehicle_status,
+        "status.evStatus.drvDistance.0.rangeByFuel.evModeRange.value",
+        float,
+    )
+    vehicle.ev_remaining_range_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_status,
+            "status.evStatus.drvDistance.0.rangeByFuel.evModeRange.unit",
+            int,
+        )
+    )
+    vehicle.total_range_value = safely_get_json_value(
+        api_vehicle_status,
+        "status.evStatus.drvDistance.0.rangeByFuel.totalAvailableRange.value",
+        float,
+    )
+    vehicle.total_range_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_status,
+            "status.evStatus.drvDistance.0.rangeByFuel.totalAvailableRange.unit",
+            int,
+        )
+    )
+    vehicle.ev_charge_current_remaining_duration = safely_get_json_value(
+        api_vehicle_status, "status.evStatus.remainTime2.atc.value", int
+    )
+    vehicle.ev_charge_fast_duration = safely_get_json_value(
+        api_vehicle_status, "status.evStatus.remainTime2.etc1.value", int
+    )
+    vehicle.ev_charge_portable_duration = safely_get_json_value(
+        api_vehicle_status, "status.evStatus.remainTime2.etc2.value", int
+    )
+    vehicle.ev_charge_station_duration = safely_get_json_value(
+        api_vehicle_status, "status.evStatus.remainTime2.etc3.value", int
+    )
+    ev_max_dc_charge_level = safely_get_json_value(
+        api_vehicle_status, "status.evStatus.targetSOC.0.targetSOClevel", int
+    )
+    if ev_max_dc_charge_level is not None and ev_max_dc_charge_level <= 100:
+        vehicle.ev_max_dc_charge_level = ev_max_dc_charge_level
+    ev_max_ac_charge_level = safely_get_json_value(
+        api_vehicle_status, "status.evStatus.targetSOC.1.targetSOClevel", int
+    )
+    if ev_max_ac_charge_level is not None and ev_max_ac_charge_level <= 100:
+        vehicle.ev_max_ac_charge_level = ev_max_ac_charge_level
+    vehicle.ev_max_range_dc_charge_value = safely_get_json_value(
+        api_vehicle_status,
+        "status.evStatus.targetSOC.0.dte.rangeByFuel.totalAvailableRange.value",
+        float,
+    )
+    vehicle.ev_max_range_dc_charge_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_status,
+            "status.evStatus.targetSOC.0.dte.rangeByFuel.totalAvailableRange.unit",
+            int,
+        )
+    )
+    vehicle.ev_max_range_ac_charge_value = safely_get_json_value(
+        api_vehicle_status,
+        "status.evStatus.targetSOC.1.dte.rangeByFuel.totalAvailableRange.value",
+        float,
+    )
+    vehicle.ev_max_range_ac_charge_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_status,
+            "status.evStatus.targetSOC.1.dte.rangeByFuel.totalAvailableRange.unit",
+            int,
+        )
+    )
+    vehicle.battery_level = safely_get_json_value(
+        api_vehicle_status, "status.battery.batSoc", int
+    )
+
+    temp_value = safely_get_json_value(api_vehicle_status, "status.airTemp.value")
+    if temp_value is not None:
+        temp_value = temp_value.replace("H", "")
+        vehicle.climate_temperature_value = CA_TEMP_RANGE[int(temp_value, 16)]
+    vehicle.climate_temperature_unit = TEMP_CELSIUS
+
+    non_ev_fuel_distance = safely_get_json_value(
+        api_vehicle_status, "status.dte.value", float
+    )
+    if non_ev_fuel_distance is not None:
+        vehicle.fuel_range_value = safely_get_json_value(
+            api_vehicle_status, "status.dte.value", float
+        )
+        vehicle.fuel_range_unit = convert_api_unit_to_ha_unit_of_distance(
+            safely_get_json_value(api_vehicle_status, "status.dte.unit", int)
+        )
+    else:
+        vehicle.fuel_range_value = safely_get_json_value(
+            api_vehicle_status,
+            "status.evStatus.drvDistance.0.rangeByFuel.gasModeRange.value",
+            float,
+        )
+        vehicle.fuel_range_unit = convert_api_unit_to_ha_unit_of_distance(
+            safely_get_json_value(
+                api_vehicle_status,
+                "status.evStatus.drvDistance.0.rangeByFuel.gasModeRange.unit",
+                int,
+            )
+        )
+
+    vehicle.odometer_value = safely_get_json_value(
+        api_vehicle_next_service, "maintenanceInfo.currentOdometer", float
+    )
+    vehicle.odometer_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_next_service, "maintenanceInfo.currentOdometerUnit", int
+        )
+    )
+
+    vehicle.next_service_value = safely_get_json_value(
+        api_vehicle_next_service, "maintenanceInfo.imatServiceOdometer", float
+    )
+    vehicle.next_service_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_next_service, "maintenanceInfo.imatServiceOdometerUnit", int
+        )
+    )
+
+    vehicle.last_service_value = safely_get_json_value(
+        api_vehicle_next_service, "maintenanceInfo.msopServiceOdometer", float
+    )
+    vehicle.last_service_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_next_service, "maintenanceInfo.msopServiceOdometerUnit", int
+        )
+    )
+
+
+def parse_us_hyundai(vehicle, api_vehicle_status: dict) -> None:
+    # the odometer came from the vehicle list, a separate response
+    vehicle.last_synced_to_cloud = convert_last_updated_str_to_datetime(
+        last_updated_str=api_vehicle_status["vehicleStatus"]["dateTime"]
+        .replace("-", "")
+        .replace("T", "")
+        .replace(":", "")
+        .replace("Z", ""),
+        timezone_of_str=dt_util.UTC,
+    )
+    vehicle.odometer_unit = LENGTH_MILES
+
+    vehicle.tire_all_on = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.tirePressureLamp.tirePressureWarningLampAll",
+        bool,
+    )
+    vehicle.tire_front_right_on = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.tirePressureLamp.tirePressureWarningLampFrontRight",
+        bool,
+    )
+    vehicle.tire_front_left_on = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.tirePressureLamp.tirePressureWarningLampFrontLeft",
+        bool,
+    )
+    vehicle.tire_rear_right_on = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.tirePressureLamp.tirePressureWarningLampRearRight",
+        bool,
+    )
+    vehicle.tire_rear_left_on = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.tirePressureLamp.tirePressureWarningLampRearLeft",
+        bool,
+    )
+    vehicle.doors_locked = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.doorLockStatus", bool
+    )
+
+    target_soc = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.targetSOC"
+    )
+    if target_soc is not None:
+        target_soc.sort(key=lambda x: x["plugType"])
+
+    vehicle.door_hood_open = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.hoodOpen", bool
+    )
+    vehicle.door_trunk_open = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.trunkOpen", bool
+    )
+    vehicle.door_front_left_open = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.doorOpen.frontLeft", bool
+    )
+    vehicle.door_front_right_open = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.doorOpen.frontRight", bool
+    )
+    vehicle.door_back_left_open = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.doorOpen.backLeft", bool
+    )
+    vehicle.door_back_right_open = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.doorOpen.backRight", bool
+    )
+    vehicle.engine_on = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.engine", bool
+    )
+    vehicle.climate_hvac_on = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.airCtrlOn", bool
+    )
+    vehicle.climate_defrost_on = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.defrost", bool
+    )
+    vehicle.climate_heated_rear_window_on = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.sideBackWindowHeat", bool
+    )
+    vehicle.climate_heated_side_mirror_on = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.sideMirrorHeat", bool
+    )
+    vehicle.climate_heated_steering_wheel_on = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.steerWheelHeat", bool
+    )
+    vehicle.climate_heated_seat_front_right_on = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.seatHeaterVentState.frSeatHeatState",
+        bool,
+    )
+    vehicle.climate_heated_seat_front_left_on = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.seatHeaterVentState.flSeatHeatState",
+        bool,
+    )
+    vehicle.climate_heated_seat_rear_right_on = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.seatHeaterVentState.rrSeatHeatState",
+        bool,
+    )
+    vehicle.climate_heated_seat_rear_left_on = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.seatHeaterVentState.rlSeatHeatState",
+        bool,
+    )
+    vehicle.low_fuel_light_on = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.lowFuelLight", bool
+    )
+    vehicle.ev_battery_charging = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.batteryCharge", bool
+    )
+    vehicle.ev_plugged_in = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.batteryPlugin", bool
+    )
+
+    ev_battery_level = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.batteryStatus", int
+    )
+    if ev_battery_level != 0:
+        vehicle.ev_battery_level = ev_battery_level
+    vehicle.ev_remaining_range_value = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.evModeRange.value",
+        float,
+    )
+    vehicle.ev_remaining_range_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_status,
+            "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.evModeRange.unit",
+            int,
+        )
+    )
+    vehicle.total_range_value = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.totalAvailableRange.value",
+        float,
+    )
+    vehicle.total_range_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_status,
+            "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.totalAvailableRange.unit",
+            int,
+        )
+    )
+    vehicle.ev_charge_current_remaining_duration = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.remainTime2.atc.value", int
+    )
+    vehicle.ev_charge_fast_duration = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.remainTime2.etc1.value", int
+    )
+    vehicle.ev_charge_portable_duration = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.remainTime2.etc2.value", int
+    )
+    vehicle.ev_charge_station_duration = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.remainTime2.etc3.value", int
+    )
+    ev_max_dc_charge_level = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.targetSOC.0.targetSOClevel", int
+    )
+    if ev_max_dc_charge_level is not None and ev_max_dc_charge_level <= 100:
+        vehicle.ev_max_dc_charge_level = ev_max_dc_charge_level
+    ev_max_ac_charge_level = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.evStatus.targetSOC.1.targetSOClevel", int
+    )
+    if ev_max_ac_charge_level is not None and ev_max_ac_charge_level <= 100:
+        vehicle.ev_max_ac_charge_level = ev_max_ac_charge_level
+    vehicle.ev_max_range_dc_charge_value = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.evStatus.targetSOC.0.dte.rangeByFuel.totalAvailableRange.value",
+        float,
+    )
+    vehicle.ev_max_range_dc_charge_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_status,
+            "vehicleStatus.evStatus.targetSOC.0.dte.rangeByFuel.totalAvailableRange.unit",
+            int,
+        )
+    )
+    vehicle.ev_max_range_ac_charge_value = safely_get_json_value(
+        api_vehicle_status,
+        "vehicleStatus.evStatus.targetSOC.1.dte.rangeByFuel.totalAvailableRange.value",
+        float,
+    )
+    vehicle.ev_max_range_ac_charge_unit = convert_api_unit_to_ha_unit_of_distance(
+        safely_get_json_value(
+            api_vehicle_status,
+            "vehicleStatus.evStatus.targetSOC.1.dte.rangeByFuel.totalAvailableRange.unit",
+            int,
+        )
+    )
+    vehicle.battery_level = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.battery.batSoc", int
+    )
+
+    temp_value = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.airTemp.value"
+    )
+    if temp_value is not None:
+        if temp_value == "LO":
+            vehicle.climate_temperature_value = USA_TEMP_RANGE[0]
+        elif temp_value == "HI":
+            vehicle.climate_temperature_value = USA_TEMP_RANGE[-1]
+        else:
+            temp_value = temp_value.replace("H", "")
+            vehicle.climate_temperature_value = USA_TEMP_RANGE[int(temp_value, 16)]
+    vehicle.climate_temperature_unit = TEMP_FAHRENHEIT
+
+    non_ev_fuel_distance = safely_get_json_value(
+        api_vehicle_status, "vehicleStatus.dte.value", float
+    )
+    if non_ev_fuel_distance is not None:
+        vehicle.fuel_range_value = safely_get_json_value(
+            api_vehicle_status, "vehicleStatus.dte.value", float
+        )
+        vehicle.fuel_range_unit = convert_api_unit_to_ha_unit_of_distance(
+            safely_get_json_value(api_vehicle_status, "vehicleStatus.dte.unit", int)
+        )
+    else:
+        vehicle.fuel_range_value = safely_get_json_value(
+            api_vehicle_status,
+            "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.gasModeRange.value",
+            float,
+        )
+        vehicle.fuel_range_unit = convert_api_unit_to_ha_unit_of_distance(
+            safely_get_json_value(
+                api_vehicle_status,
+                "vehicleStatus.evStatus.drvDistance.0.rangeByFuel.gasModeRange.unit",
+                int,
+            )
+        )
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from custom_components.ha_kia_hyundai.command_queue import (
+    CommandQueue,
+    CommandSuperseded,
+)
+
+
+def recorder(calls: list, name: str, started: asyncio.Event | None = None):
+    release = asyncio.Event()
+
+    async def run():
+        calls.append(name)
+        if started is not None:
+            started.set()
+            await release.wait()
+
+    return run, release
+
+
+async def test_commands_run_one_at_a_time_in_order(hass):
+    queue = CommandQueue(hass, "car")
+    calls = []
+    started = asyncio.Event()
+    first, release = recorder(calls, "lock", started)
+    second, _ = recorder(calls, "start climate")
+
+    lock = asyncio.create_task(queue.run("lock", first))
+    await started.wait()
+    climate = asyncio.create_task(queue.run("start climate", second))
+    await asyncio.sleep(0)
+    assert calls == ["lock"]
+    assert queue.pending_names() == ["start climate"]
+
+    release.set()
+    await asyncio.gather(lock, climate)
+    assert calls == ["lock", "start climate"]
+    assert queue.depth == 0
+
+
+async def test_duplicate_command_joins_the_waiting_one(hass):
+    queue = CommandQueue(hass, "car")
+    calls = []
+    started = asyncio.Event()
+    blocker, release = recorder(calls, "sync", started)
+    lock, _ = recorder(calls, "lock")
+
+    sync = asyncio.create_task(queue.run("sync", blocker))
+    await started.wait()
+    first = asyncio.create_task(queue.run("lock", lock))
+    second = asyncio.create_task(queue.run("lock", lock))
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(sync, first, second)
+    assert calls == ["sync", "lock"]
+
+
+async def test_running_command_is_joined(hass):
+    queue = CommandQueue(hass, "car")
+    calls = []
+    started = asyncio.Event()
+    lock, release = recorder(calls, "lock", started)
+
+    first = asyncio.create_task(queue.run("lock", lock))
+    await started.wait()
+    second = asyncio.create_task(queue.run("lock", lock))
+    await asyncio.sleep(0)
+    assert queue.pending_names() == []
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert calls == ["lock"]
+
+
+async def test_newer_command_of_the_group_supersedes_the_waiting_one(hass):
+    queue = CommandQueue(hass, "car")
+    calls = []
+    started = asyncio.Event()
+    blocker, release = recorder(calls, "sync", started)
+    lock, _ = recorder(calls, "lock")
+    unlock, _ = recorder(calls, "unlock")
+
+    sync = asyncio.create_task(queue.run("sync", blocker))
+    await started.wait()
+    superseded = asyncio.create_task(queue.run("lock", lock, group="lock"))
+    await asyncio.sleep(0)
+    newer = asyncio.create_task(queue.run("unlock", unlock, group="lock"))
+
+    with pytest.raises(CommandSuperseded):
+        await superseded
+    release.set()
+    await asyncio.gather(sync, newer)
+    assert calls == ["sync", "unlock"]
+
+
+async def test_satisfied_command_is_skipped(hass):
+    queue = CommandQueue(hass, "car")
+    calls = []
+    lock, _ = recorder(calls, "lock")
+
+    await queue.run("lock", lock, satisfied=lambda: True)
+    assert calls == []
+
+
+async def test_command_error_reaches_the_caller_and_the_queue_goes_on(hass):
+    queue = CommandQueue(hass, "car")
+    calls = []
+    lock, _ = recorder(calls, "lock")
+
+    async def failing():
+        raise RuntimeError("rejected")
+
+    with pytest.raises(RuntimeError, match="rejected"):
+        await queue.run("unlock", failing)
+    await queue.run("lock", lock)
+    assert calls == ["lock"]
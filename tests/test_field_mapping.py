@@ -0,0 +1,106 @@
+import copy
+
+import pytest
+
+from custom_components.ha_kia_hyundai.api_cloud_ca import CA_STATUS_MAPPING
+from custom_components.ha_kia_hyundai.api_cloud_us_hyundai import (
+    US_HYUNDAI_STATUS_MAPPING,
+)
+from custom_components.ha_kia_hyundai.api_cloud_us_kia import US_KIA_STATUS_MAPPING
+from custom_components.ha_kia_hyundai.timestamps import TimestampMemo
+
+from .conftest import load_fixture
+from .legacy_parsers import parse_ca, parse_us_hyundai, parse_us_kia
+
+
+class StandIn:
+    """vehicle fields only, unset ones read as None like on a fresh vehicle"""
+
+    def __init__(self, **fields):
+        self.sync_date_memo = TimestampMemo()
+        self.__dict__.update(fields)
+
+    def __getattr__(self, name):
+        return None
+
+    def fields(self) -> dict:
+        return {
+            key: value for key, value in vars(self).items() if key != "sync_date_memo"
+        }
+
+
+PREVIOUS_STATES = {
+    "fresh": {},
+    "polled before": {
+        "ev_battery_level": 42,
+        "climate_temperature_value": 68,
+        "ev_max_ac_charge_level": 70,
+        "ev_max_dc_charge_level": 90,
+        "odometer_value": 1000.0,
+    },
+}
+
+
+def _us_kia(fixture):
+    response = load_fixture(fixture)
+    return (
+        lambda vehicle, r: parse_us_kia(vehicle, r),
+        US_KIA_STATUS_MAPPING.apply,
+        response,
+    )
+
+
+def _ca(fixture):
+    response = {
+        "status": load_fixture(f"{fixture}_status.json"),
+        "next_service": load_fixture(f"{fixture}_next_service.json"),
+    }
+    return (
+        lambda vehicle, r: parse_ca(vehicle, r["status"], r["next_service"]),
+        CA_STATUS_MAPPING.apply,
+        response,
+    )
+
+
+def _us_hyundai(fixture):
+    response = load_fixture(fixture)
+    return (
+        lambda vehicle, r: parse_us_hyundai(vehicle, r),
+        US_HYUNDAI_STATUS_MAPPING.apply,
+        response,
+    )
+
+
+CASES = {
+    "us kia ev": lambda: _us_kia("us_kia_ev.json"),
+    "us kia ice": lambda: _us_kia("us_kia_ice.json"),
+    "ca ev": lambda: _ca("ca_ev"),
+    "ca ice": lambda: _ca("ca_ice"),
+    "us hyundai ev": lambda: _us_hyundai("us_hyundai_ev.json"),
+    "us hyundai ice": lambda: _us_hyundai("us_hyundai_ice.json"),
+}
+
+
+@pytest.mark.parametrize("previous", PREVIOUS_STATES.values(), ids=PREVIOUS_STATES)
+@pytest.mark.parametrize("case", CASES.values(), ids=CASES)
+def test_mapping_table_matches_legacy_parser(case, previous):
+    legacy_parse, apply_table, response = case()
+    legacy = StandIn(**previous)
+    table = StandIn(**previous)
+
+    legacy_parse(legacy, copy.deepcopy(response))
+    apply_table(table, copy.deepcopy(response))
+
+    assert table.fields() == legacy.fields()
+
+
+@pytest.mark.parametrize("case", CASES.values(), ids=CASES)
+def test_mapping_table_is_stable_across_polls(case):
+    _, apply_table, response = case()
+    vehicle = StandIn()
+
+    apply_table(vehicle, copy.deepcopy(response))
+    first = vehicle.fields()
+    apply_table(vehicle, copy.deepcopy(response))
+
+    assert vehicle.fields() == first
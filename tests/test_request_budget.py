@@ -0,0 +1,87 @@
+import pytest
+
+from custom_components.ha_kia_hyundai import request_budget
+from custom_components.ha_kia_hyundai.request_budget import (
+    SECONDS_PER_DAY,
+    RequestBudget,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1_000_000.0
+
+        def time(self):
+            return self.now
+
+    clock = Clock()
+    monkeypatch.setattr(request_budget.time, "time", clock.time)
+    return clock
+
+
+def test_unlimited_budget_lets_everything_through(clock):
+    budget = RequestBudget()
+
+    assert budget.try_consume(1, priority=0)
+    budget.consume(1000)
+    assert budget.remaining is None
+    assert budget.as_dict() == {}
+    budget.restore({"tokens": 0, "refilled_at": clock.now})
+    assert budget.try_consume(1, priority=0)
+
+
+def test_due_call_goes_through_on_full_bucket(clock):
+    budget = RequestBudget(100)
+
+    assert budget.try_consume(1, priority=1.0)
+    assert budget.remaining == 99
+
+
+def test_scarce_bucket_only_takes_overdue_background_calls(clock):
+    budget = RequestBudget(100)
+    budget.consume(50)
+
+    assert not budget.try_consume(1, priority=1.0)
+    assert budget.remaining == 50
+    assert budget.try_consume(1, priority=2.0)
+
+
+def test_background_calls_leave_the_reserve_to_the_user(clock):
+    budget = RequestBudget(100)
+    budget.consume(100 - budget.reserve)
+
+    assert not budget.try_consume(1, priority=100.0)
+    budget.consume(1)
+    assert budget.remaining == budget.reserve - 1
+
+
+def test_bucket_refills_evenly_over_a_day(clock):
+    budget = RequestBudget(100)
+    budget.consume(100)
+
+    clock.now += SECONDS_PER_DAY / 4
+    assert budget.remaining == pytest.approx(25)
+    clock.now += SECONDS_PER_DAY
+    assert budget.remaining == 100
+
+
+def test_restore_catches_up_on_refill_and_caps_at_limit(clock):
+    budget = RequestBudget(100)
+
+    budget.restore({"tokens": 40, "refilled_at": clock.now - SECONDS_PER_DAY / 2})
+    assert budget.remaining == pytest.approx(90)
+    budget.restore({"tokens": 500, "refilled_at": clock.now})
+    assert budget.remaining == 100
+
+
+def test_setting_a_limit_starts_with_a_full_bucket(clock):
+    budget = RequestBudget()
+
+    budget.set_daily_limit(100)
+    assert budget.remaining == 100
+    assert budget.reserve == 10
+    budget.set_daily_limit(20)
+    assert budget.remaining == 20
+    budget.set_daily_limit(None)
+    assert budget.try_consume(1000, priority=0)
@@ -0,0 +1,115 @@
+import logging
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from custom_components.ha_kia_hyundai.const import POLL_RETRY_BACKOFF
+from custom_components.ha_kia_hyundai.scheduler import PollScheduler
+
+REFRESH = timedelta(minutes=30)
+
+
+class FakeVehicle:
+    """the parts of a vehicle the scheduler looks at"""
+
+    def __init__(self, hass, identifier: str, succeeds: bool = True):
+        self.identifier = identifier
+        self.succeeds = succeeds
+        self.polls = 0
+        self.last_updated_from_cloud = None
+        self.due = dt_util.utcnow()
+        self.coordinator = DataUpdateCoordinator(
+            hass, logging.getLogger(__name__), name=identifier
+        )
+        self.polling_policy = SimpleNamespace(
+            intervals=lambda vehicle: SimpleNamespace(refresh=REFRESH)
+        )
+
+    def next_poll_due(self):
+        return self.due
+
+    async def update(self, interval: bool = False):
+        self.polls += 1
+        if self.succeeds:
+            self.last_updated_from_cloud = dt_util.utcnow()
+            self.due = dt_util.utcnow() + REFRESH
+
+
+@pytest.fixture
+def scheduler(hass):
+    scheduler = PollScheduler(hass)
+    yield scheduler
+    scheduler.shutdown()
+
+
+async def advance(hass, freezer, delta: timedelta):
+    freezer.tick(delta)
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+async def test_due_vehicle_is_polled_once(hass, freezer, scheduler):
+    vehicle = FakeVehicle(hass, "car")
+    scheduler.add_vehicle(vehicle)
+
+    await advance(hass, freezer, timedelta(minutes=3))
+    assert vehicle.polls == 1
+    await advance(hass, freezer, timedelta(minutes=10))
+    assert vehicle.polls == 1
+    await advance(hass, freezer, REFRESH)
+    assert vehicle.polls == 2
+
+
+async def test_failed_poll_backs_off(hass, freezer, scheduler):
+    vehicle = FakeVehicle(hass, "car", succeeds=False)
+    scheduler.add_vehicle(vehicle)
+
+    await advance(hass, freezer, timedelta(minutes=3))
+    assert vehicle.polls == 1
+    await advance(hass, freezer, POLL_RETRY_BACKOFF - timedelta(seconds=10))
+    assert vehicle.polls == 1
+    await advance(hass, freezer, timedelta(seconds=20))
+    assert vehicle.polls == 2
+    # the second failure in a row waits twice as long
+    await advance(hass, freezer, POLL_RETRY_BACKOFF + timedelta(seconds=10))
+    assert vehicle.polls == 2
+    await advance(hass, freezer, POLL_RETRY_BACKOFF)
+    assert vehicle.polls == 3
+
+
+async def test_coordinator_update_reschedules(hass, freezer, scheduler):
+    vehicle = FakeVehicle(hass, "car")
+    vehicle.due = dt_util.utcnow() + REFRESH
+    scheduler.add_vehicle(vehicle)
+
+    # a user refresh pulled the next poll forward
+    vehicle.due = dt_util.utcnow()
+    vehicle.coordinator.async_set_updated_data(None)
+    await advance(hass, freezer, timedelta(minutes=3))
+    assert vehicle.polls == 1
+
+
+async def test_removed_vehicle_is_not_polled(hass, freezer, scheduler):
+    polled = FakeVehicle(hass, "first car")
+    removed = FakeVehicle(hass, "second car")
+    scheduler.add_vehicle(polled)
+    remove = scheduler.add_vehicle(removed)
+
+    remove()
+    await advance(hass, freezer, timedelta(minutes=3))
+    assert polled.polls == 1
+    assert removed.polls == 0
+
+
+async def test_shutdown_stops_polling(hass, freezer, scheduler):
+    vehicle = FakeVehicle(hass, "car")
+    scheduler.add_vehicle(vehicle)
+
+    scheduler.shutdown()
+    await advance(hass, freezer, timedelta(minutes=3))
+    assert vehicle.polls == 0